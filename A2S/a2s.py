@@ -0,0 +1,216 @@
+"""
+Shared Source/GoldSrc A2S query client for the log relays and QueryGateway.
+
+Relays add ../A2S to sys.path (or copy this file next to them) and run an
+A2SPoller, which keeps the last A2S_INFO/A2S_PLAYER result in memory:
+
+    poller = A2SPoller("127.0.0.1", 27015)
+    poller.start()
+    poller.status_line()   # "3/16 players on crossfire" from the cache
+    poller.wake()          # re-poll soon, e.g. after a join/leave line
+
+Neither call waits on the network, so a relay's log loop can use them for
+every message. The parsers work on whole reply packets, so async callers
+(QueryGateway) can do their own I/O and reuse them.
+
+Also a one-shot query tool:
+
+    python a2s.py 127.0.0.1 27015
+"""
+import argparse
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+HEADER = b"\xff\xff\xff\xff"
+INFO_REQUEST = HEADER + b"TSource Engine Query\x00"
+PLAYER_REQUEST = HEADER + b"U"
+
+CHALLENGE = 0x41      # S2C_CHALLENGE
+INFO_SOURCE = 0x49    # Source / current GoldSrc A2S_INFO reply
+INFO_GOLDSRC = 0x6D   # obsolete GoldSrc A2S_INFO reply
+PLAYER_REPLY = 0x44
+
+
+# ----------------------------
+# Packets
+# ----------------------------
+
+def read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    """Read a NUL-terminated string, returning (text, next_pos)."""
+    end = data.find(b"\x00", pos)
+    if end < 0:
+        raise ValueError("Unterminated string in A2S reply")
+    return data[pos:end].decode("utf-8", errors="replace"), end + 1
+
+
+def challenge_retry(request: bytes, reply: bytes) -> Optional[bytes]:
+    """If `reply` is an S2C_CHALLENGE to `request`, the request to send again; else None."""
+    if len(reply) < 9 or reply[4] != CHALLENGE:
+        return None
+    base = PLAYER_REQUEST if request.startswith(PLAYER_REQUEST) else INFO_REQUEST
+    return base + reply[5:9]
+
+
+def parse_info(data: bytes) -> Dict[str, Any]:
+    """
+    Parse an A2S_INFO reply (header included). "players" counts humans only;
+    bots are reported separately.
+    """
+    if len(data) < 6 or data[:4] != HEADER:
+        raise ValueError("Split or malformed A2S reply")
+    kind = data[4]
+    if kind == INFO_SOURCE:
+        name, pos = read_string(data, 6)
+        map_name, pos = read_string(data, pos)
+        folder, pos = read_string(data, pos)
+        game, pos = read_string(data, pos)
+        players, max_players, bots = data[pos + 2], data[pos + 3], data[pos + 4]
+        version, _pos = read_string(data, pos + 9)
+    elif kind == INFO_GOLDSRC:
+        _address, pos = read_string(data, 5)
+        name, pos = read_string(data, pos)
+        map_name, pos = read_string(data, pos)
+        folder, pos = read_string(data, pos)
+        game, pos = read_string(data, pos)
+        players, max_players = data[pos], data[pos + 1]
+        bots, version = 0, ""
+    else:
+        raise ValueError(f"Unexpected A2S_INFO reply type {kind:#x}")
+    return {
+        "name": name,
+        "map": map_name,
+        "folder": folder,
+        "game": game,
+        "version": version,
+        "players": max(0, players - bots),
+        "max_players": max_players,
+        "bots": bots,
+    }
+
+
+def parse_players(data: bytes) -> List[str]:
+    """Parse an A2S_PLAYER reply (header included) into the non-empty player names."""
+    if len(data) < 6 or data[:4] != HEADER or data[4] != PLAYER_REPLY:
+        raise ValueError("Not an A2S_PLAYER reply")
+    names = []
+    pos = 6
+    for _ in range(data[5]):
+        name, pos = read_string(data, pos + 1)  # skip index byte
+        pos += 8  # score (int32) + duration (float32)
+        if name:
+            names.append(name)
+    return names
+
+
+# ----------------------------
+# Blocking client
+# ----------------------------
+
+def request(sock: socket.socket, payload: bytes) -> bytes:
+    """Send an A2S request on a connected socket, answering one S2C_CHALLENGE round if asked."""
+    sock.send(payload)
+    reply = sock.recv(4096)
+    retry = challenge_retry(payload, reply)
+    if retry is not None:
+        sock.send(retry)
+        reply = sock.recv(4096)
+    if reply[:4] != HEADER:
+        raise ValueError("Split or malformed A2S reply")
+    return reply
+
+
+def query(host: str, port: int, timeout_sec: float = 2.0) -> Dict[str, Any]:
+    """
+    A2S_INFO plus A2S_PLAYER in one go. Returns parse_info()'s dict with
+    "player_names" and "updated" (time.time()) added. Raises OSError or
+    ValueError if A2S_INFO fails; a failed A2S_PLAYER just leaves the names empty.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout_sec)
+        sock.connect((host, port))
+        status = parse_info(request(sock, INFO_REQUEST))
+        try:
+            status["player_names"] = parse_players(request(sock, PLAYER_REQUEST + HEADER))
+        except (OSError, ValueError, IndexError):
+            status["player_names"] = []  # Some servers disable A2S_PLAYER; counts are still good
+    status["updated"] = time.time()
+    return status
+
+
+def format_status_line(status: Dict[str, Any]) -> str:
+    return f"{status['players']}/{status['max_players']} players on {status['map']}"
+
+
+class A2SPoller:
+    """
+    Polls one server every `poll_seconds` on a background thread. wake()
+    asks for an early poll without waiting for it; that poll starts after
+    `settle_seconds` so the server has registered the player who just joined
+    or left.
+    """
+
+    def __init__(self, host: str, port: int, poll_seconds: float = 15, timeout_sec: float = 2.0,
+                 settle_seconds: float = 0.5):
+        self.host = host
+        self.port = port
+        self.poll_seconds = poll_seconds
+        self.timeout_sec = timeout_sec
+        self.settle_seconds = settle_seconds
+
+        self._cache: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self._poll_loop, daemon=True).start()
+
+    def _poll_loop(self) -> None:
+        while True:
+            try:
+                status = query(self.host, self.port, self.timeout_sec)
+                with self._lock:
+                    self._cache = status
+            except (OSError, ValueError, IndexError) as e:
+                print(f"A2S query failed: {e}")
+
+            if self._wakeup.wait(self.poll_seconds):
+                time.sleep(self.settle_seconds)
+                self._wakeup.clear()  # events during the settle time share this poll
+
+    def wake(self) -> None:
+        """Poll again soon (after `settle_seconds`) instead of waiting out `poll_seconds`."""
+        self._wakeup.set()
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """A copy of the cached status, or None if missing or stale."""
+        with self._lock:
+            if self._cache is None or time.time() - self._cache["updated"] > self.poll_seconds * 3:
+                return None
+            return dict(self._cache)
+
+    def status_line(self) -> Optional[str]:
+        """'N/M players on map' from the cache (never blocks on the network)."""
+        status = self.snapshot()
+        return format_status_line(status) if status is not None else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query a server over A2S.")
+    parser.add_argument("host")
+    parser.add_argument("port", type=int, nargs="?", default=27015)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    status = query(args.host, args.port, args.timeout)
+    print(f"{status['name']} [{status['game']} {status['version']}]".rstrip())
+    print(format_status_line(status) + (f" (+{status['bots']} bots)" if status["bots"] else ""))
+    for name in status["player_names"]:
+        print(f"  {name}")
+    print(f"[query] {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import time
 import re
+import os
+import sys
 import requests
 from datetime import datetime
 
@@ -7,11 +9,30 @@ from datetime import datetime
 DISCORD_WEBHOOK_URL = "your webhook url here"
 LOG_FILE_PATH = r"C:\Users\Administrator\.config\piqueserver\logs\log.txt"  # Adjust if needed
 
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "aos"
+
 # Regex patterns
 JOIN_PATTERN = re.compile(r"\[piqueserver\.player#info\] ([^\s]+) \(IP ([\d\.]+), ID \d+\) entered the game!")
 CHAT_PATTERN = re.compile(r"\[piqueserver\.player#info\] <([^>]+)> (.+)")
 DISCONNECT_PATTERN = re.compile(r"\[piqueserver\.player#info\] ([^\s]+) disconnected!")
 
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 # Send message to Discord
 def send_to_discord(message, color=0xCCCCCC):
     payload = {
@@ -40,16 +61,21 @@ def monitor_log():
 
                     if match := JOIN_PATTERN.search(line):
                         name, ip = match.groups()
+                        record_event("join", name)
                         send_to_discord(f"**{name}** connected from IP **{ip}**", color=0x00FF00)
                     elif match := CHAT_PATTERN.search(line):
                         name, msg = match.groups()
+                        record_event("chat", name, msg)
                         send_to_discord(f"**{name}:** {msg}", color=0xFFFF00)
                     elif match := DISCONNECT_PATTERN.search(line):
                         name = match.group(1)
+                        record_event("leave", name)
                         send_to_discord(f"**{name}** disconnected", color=0xFF0000)
         except Exception as e:
             print(f"[ERROR] {e}")
         time.sleep(5)
 
 if __name__ == "__main__":
+    if EVENT_STORE_DB:
+        open_event_store()
     monitor_log()
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import os, time, json, re
+import os, sys, time, json, re
 from urllib import request, error
 
 # ====== CONFIG ======
@@ -19,6 +19,11 @@ PRINT_DIAG         = True
 
 SCRIPT_DIR  = os.path.dirname(os.path.abspath(__file__))
 IGNORE_FILE = os.path.join(SCRIPT_DIR, "ignored_names.txt")
+
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB     = None
+EVENT_STORE_SERVER = "armagetron"
 # =====================
 
 # Regexes (case-insensitive) — capture ID where available
@@ -45,6 +50,8 @@ _detected_encoding = None  # "utf-8" or "utf-16-le"
 # Track current user ids -> names (best-effort)
 uid_to_name = {}
 
+_event_store = None
+
 def _post_discord(content: str):
     payload = {"content": content[:1900]}
     data = json.dumps(payload).encode("utf-8")
@@ -68,6 +75,17 @@ def _post_discord(content: str):
     except Exception as ex:
         print(f"[relay] Error posting to Discord: {ex}")
 
+def _open_event_store():
+    global _event_store
+    sys.path.append(os.path.join(SCRIPT_DIR, "..", "EventStore"))
+    from eventstore import EventStore
+    _event_store = EventStore(EVENT_STORE_DB)
+    print(f"[relay] Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def _record_event(event_type: str, player: str = None, detail: str = None):
+    if _event_store is not None:
+        _event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def _sanitize_name(s: str) -> str:
     return s.strip().replace("@", "@\u200b")
 
@@ -154,6 +172,7 @@ def _handle_line(line: str):
             if PRINT_MATCHES: print(f"[relay] (ignored join) {name}")
             return
         if PRINT_MATCHES: print(f"[relay] JOIN  -> [{uid}] {name}")
+        _record_event("join", name)
         _post_discord(f"[{SERVER_NAME}] + {_sanitize_name(name)} entered the game")
         return
     elif "entered the game" in line.lower() and PRINT_DIAG:
@@ -168,6 +187,7 @@ def _handle_line(line: str):
             if PRINT_MATCHES: print(f"[relay] (ignored leave) {name}")
             return
         if PRINT_MATCHES: print(f"[relay] LEAVE -> [{uid}] {name}")
+        _record_event("leave", name)
         _post_discord(f"[{SERVER_NAME}] - {_sanitize_name(name)} left the game")
         return
 
@@ -178,6 +198,7 @@ def _handle_line(line: str):
         name = uid_to_name.pop(victim_id, f"User {victim_id}")
         if not _is_ignored(name):
             if PRINT_MATCHES: print(f"[relay] LEAVE -> [{victim_id}] {name} (by logout/kill)")
+            _record_event("leave", name)
             _post_discord(f"[{SERVER_NAME}] - {_sanitize_name(name)} left the game")
         else:
             if PRINT_MATCHES: print(f"[relay] (ignored leave) [{victim_id}] {name}")
@@ -195,6 +216,7 @@ def _handle_line(line: str):
             if PRINT_MATCHES: print(f"[relay] (ignored chat) {raw_name}: {msg}")
             return
         if PRINT_MATCHES: print(f"[relay] CHAT  -> [{uid}] {raw_name}: {msg}")
+        _record_event("chat", raw_name.strip(), msg)
         _post_discord(f"[{SERVER_NAME}] {_sanitize_name(raw_name)}: {_sanitize_msg(msg)}")
         return
     elif line.startswith("[") and ":" in line and PRINT_DIAG:
@@ -263,6 +285,8 @@ def _tail_follow(path: str):
 if __name__ == "__main__":
     print(f"[relay] Watching: {LOG_PATH}")
     _load_ignore()
+    if EVENT_STORE_DB:
+        _open_event_store()
     if STARTUP_TEST_POST:
         _post_discord(f"[{SERVER_NAME}] relay online (startup test)")
     _tail_follow(LOG_PATH)
@@ -14,6 +14,10 @@ DISCORD_WEBHOOK_URL = "redacted"
 # Track last seen post
 last_seen_uri = None
 
+# Poll interval, and how long to wait after a 429 that carries no reset header
+POLL_INTERVAL = 30
+RATE_LIMIT_DEFAULT_WAIT = 60
+
 def create_session():
     url = "https://bsky.social/xrpc/com.atproto.server.createSession"
     response = requests.post(url, json={"identifier": USERNAME, "password": APP_PASSWORD})
@@ -37,6 +41,22 @@ def send_to_discord(post):
     response = requests.post(DISCORD_WEBHOOK_URL, json=payload)
     response.raise_for_status()
 
+def rate_limit_wait(response):
+    """Seconds until a 429 clears: ratelimit-reset (epoch) or Retry-After, else a default."""
+    reset = response.headers.get("ratelimit-reset")
+    if reset:
+        try:
+            return max(1.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(1.0, float(retry_after))
+        except ValueError:
+            pass
+    return RATE_LIMIT_DEFAULT_WAIT
+
 def create_session_with_expiry():
     url = "https://bsky.social/xrpc/com.atproto.server.createSession"
     response = requests.post(url, json={"identifier": USERNAME, "password": APP_PASSWORD})
@@ -62,12 +82,13 @@ def main():
                 jwt_expires_at = time.time() + session["expires_in"]
                 print("[OK] Authenticated to Bluesky.")
 
+            feed = fetch_latest_posts(jwt)
             if last_seen_uri is None:
-                initial_feed = fetch_latest_posts(jwt)
-                if initial_feed:
-                    last_seen_uri = initial_feed[0]["post"]["uri"]
+                # Warm-up: remember the newest post without posting it
+                last_seen_uri = feed[0]["post"]["uri"] if feed else ""
+                time.sleep(POLL_INTERVAL)
+                continue
 
-            feed = fetch_latest_posts(jwt)
             new_posts = []
             for post in feed:
                 uri = post["post"]["uri"]
@@ -79,12 +100,13 @@ def main():
                     send_to_discord(post)
                     last_seen_uri = post["post"]["uri"]
 
-            time.sleep(30)
+            time.sleep(POLL_INTERVAL)
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
-                print("[!] Rate limited. Backing off for 5 minutes.")
-                time.sleep(300)
+                wait = rate_limit_wait(e.response)
+                print(f"[!] Rate limited. Backing off for {wait:.0f}s.")
+                time.sleep(wait)
             else:
                 print(f"[!] HTTP error: {e}")
                 time.sleep(60)
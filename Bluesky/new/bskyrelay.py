@@ -2,6 +2,18 @@ import requests
 import time
 import threading
 import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+import json
+import base64
+from requests.adapters import HTTPAdapter
+
+try:
+    import websockets  # only needed for FEED_SOURCE = "jetstream"
+except ImportError:
+    websockets = None
 
 # Configuration
 USERNAME = "your@email.com"
@@ -9,6 +21,52 @@ APP_PASSWORD = "your_app_password"
 ACCOUNTS_FILE = "accounts.txt"
 POLL_INTERVAL = 30  # seconds
 SEEN_DIR = "seen"
+XRPC_BASE = "https://bsky.social/xrpc"
+REFRESH_MARGIN = 5 * 60  # refresh the access token this long before its exp claim
+HTTP_TIMEOUT = 20
+
+# All accounts are polled from one asyncio loop. HTTP calls run on a fixed pool
+# of worker threads (and the same number of keep-alive connections), however
+# many accounts there are, and poll start times are spread across POLL_INTERVAL.
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_SECOND = 8.0  # global budget for Bluesky API calls (bsky.social allows 3000 per 5 min)
+RATE_LIMIT_DEFAULT_WAIT = 60  # seconds, when a 429 carries no reset header
+
+# Where new posts come from:
+#   "author"   - one getAuthorFeed call per account per POLL_INTERVAL
+#   "list"     - one getListFeed call for LIST_URI, a curated list whose members
+#                are the watched DIDs; posts are routed to webhooks by author
+#   "timeline" - one getTimeline call for the logged-in account, which should
+#                follow every watched DID; anything else on it is ignored
+#   "jetstream" - no polling: stream app.bsky.feed.post commits from a Jetstream
+#                websocket and relay watched accounts' posts as they arrive
+#                (needs `pip install websockets`; original posts and replies
+#                only, reposts are a different collection)
+# "list" and "timeline" cost one request per interval however many accounts
+# there are (more only when a burst of posts spans several pages).
+FEED_SOURCE = "author"
+LIST_URI = "at://did:plc:example/app.bsky.graph.list/rkey"
+FEED_PAGE_LIMIT = 50   # max posts per getListFeed/getTimeline page
+FEED_MAX_PAGES = 5     # stop paging back after this many pages in one poll
+FEED_RECENT_URIS = 500  # relayed URIs remembered to catch same-timestamp duplicates
+FEED_STATE_FILE = os.path.join(SEEN_DIR, "_feed_state.json")
+
+# Jetstream. The cursor (microseconds since epoch of the last event handled) is
+# saved so a restart resumes where it stopped, within Jetstream's replay window.
+# Point JETSTREAM_URL at jetstream_replay.py to run against a recorded stream.
+JETSTREAM_URL = "wss://jetstream2.us-east.bsky.network/subscribe"
+JETSTREAM_CURSOR_FILE = os.path.join(SEEN_DIR, "_jetstream_cursor.txt")
+JETSTREAM_CURSOR_SAVE_SECONDS = 5
+JETSTREAM_MAX_WANTED_DIDS = 10000  # server-side filter limit; above it every post is streamed and filtered here
+# wantedDids go in the connect URL while it stays under this length; larger
+# sets are sent as an options_update, with requireHello=true so nothing is
+# streamed unfiltered before it arrives
+JETSTREAM_MAX_URL_LENGTH = 8000
+JETSTREAM_RECONNECT_MAX = 60  # seconds, reconnect backoff cap
+# A post whose webhook fails with a transient error (connection error, 5xx,
+# 429) is retried with backoff up to this many attempts before it is skipped;
+# other 4xx responses (deleted or invalid webhook, rejected post) skip it at once
+JETSTREAM_RELAY_ATTEMPTS = 6
 
 # Ensure the 'seen' directory exists
 os.makedirs(SEEN_DIR, exist_ok=True)
@@ -16,12 +74,114 @@ os.makedirs(SEEN_DIR, exist_ok=True)
 # Cache for DID-to-handle mapping
 handle_cache = {}
 
-def resolve_did_to_handle(did):
+def jwt_expiry(token):
+    """Read the exp claim from a JWT (no signature check; we only need to know when to refresh)."""
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+
+class BlueskySession:
+    """
+    One login shared by every poll worker thread. Callers ask for the token on each
+    request, so a refresh is seen everywhere at once. Refreshing goes through
+    com.atproto.server.refreshSession, with a fresh createSession only if the
+    refresh token itself has been rejected.
+    """
+
+    def __init__(self, identifier, password, pool_size=MAX_CONCURRENT_REQUESTS):
+        self.identifier = identifier
+        self.password = password
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._access_jwt = None
+        self._refresh_jwt = None
+        self._refresh_at = 0.0
+
+    def _store(self, data):
+        self._access_jwt = data["accessJwt"]
+        self._refresh_jwt = data["refreshJwt"]
+        now = time.time()
+        try:
+            expires_at = jwt_expiry(self._access_jwt)
+        except Exception:
+            expires_at = now + 3600  # unreadable token; refresh hourly
+        # Short-lived tokens get refreshed halfway through rather than on every call
+        self._refresh_at = expires_at - min(REFRESH_MARGIN, (expires_at - now) / 2)
+
+    def _login(self):
+        response = self.http.post(
+            f"{XRPC_BASE}/com.atproto.server.createSession",
+            json={"identifier": self.identifier, "password": self.password},
+            timeout=HTTP_TIMEOUT,
+        )
+        response.raise_for_status()
+        self._store(response.json())
+        print("[*] Logged in to Bluesky.")
+
+    def _refresh(self):
+        response = self.http.post(
+            f"{XRPC_BASE}/com.atproto.server.refreshSession",
+            headers={"Authorization": f"Bearer {self._refresh_jwt}"},
+            timeout=HTTP_TIMEOUT,
+        )
+        if token_rejected(response):
+            print("[*] Refresh token rejected; logging in again.")
+            self._login()
+            return
+        response.raise_for_status()
+        self._store(response.json())
+        print("[*] Session refreshed.")
+
+    def access_token(self):
+        with self._lock:
+            if self._access_jwt is None:
+                self._login()
+            elif time.time() >= self._refresh_at:
+                self._refresh()
+            return self._access_jwt
+
+    def invalidate(self, token):
+        """Called after a rejected token: refresh once, unless another thread already replaced `token`."""
+        with self._lock:
+            if token == self._access_jwt:
+                self._refresh()
+
+    def xrpc_get(self, method, params):
+        """Authenticated GET; an expired/rejected token is refreshed once and the call retried."""
+        for attempt in range(2):
+            token = self.access_token()
+            response = self.http.get(
+                f"{XRPC_BASE}/{method}",
+                headers={"Authorization": f"Bearer {token}"},
+                params=params,
+                timeout=HTTP_TIMEOUT,
+            )
+            if attempt == 0 and token_rejected(response):
+                self.invalidate(token)
+                continue
+            return response
+
+def token_rejected(response):
+    """PDSes answer 400 ExpiredToken/InvalidToken (or plain 401) for a stale access JWT."""
+    if response.status_code == 401:
+        return True
+    if response.status_code == 400:
+        try:
+            return response.json().get("error") in ("ExpiredToken", "InvalidToken")
+        except ValueError:
+            return False
+    return False
+
+def resolve_did_to_handle(bsky, did):
     if did in handle_cache:
         return handle_cache[did]
-    url = f"https://bsky.social/xrpc/com.atproto.identity.resolveDid?did={did}"
     try:
-        response = requests.get(url)
+        response = bsky.http.get(
+            f"{XRPC_BASE}/com.atproto.identity.resolveDid", params={"did": did}, timeout=HTTP_TIMEOUT
+        )
         response.raise_for_status()
         handle = response.json().get("handle", did)
         handle_cache[did] = handle
@@ -30,83 +190,388 @@ def resolve_did_to_handle(did):
         print(f"[!] Failed to resolve DID {did}: {e}")
         return did
 
-def create_session_with_expiry():
-    url = "https://bsky.social/xrpc/com.atproto.server.createSession"
-    response = requests.post(url, json={"identifier": USERNAME, "password": APP_PASSWORD})
-    response.raise_for_status()
-    data = response.json()
-    return {
-        "jwt": data["accessJwt"],
-        "expires_in": 3600 * 4  # Estimated expiry: 4 hours
-    }
-
-def fetch_latest_posts(jwt, did):
-    headers = {"Authorization": f"Bearer {jwt}"}
-    url = "https://bsky.social/xrpc/app.bsky.feed.getAuthorFeed"
-    params = {"actor": did, "limit": 5}
-    response = requests.get(url, headers=headers, params=params)
+def fetch_latest_posts(bsky, did):
+    response = bsky.xrpc_get("app.bsky.feed.getAuthorFeed", {"actor": did, "limit": 5})
     response.raise_for_status()
     return response.json()["feed"]
 
-def send_to_discord(post, webhook_url, did):
+def send_to_discord(bsky, post, webhook_url, did):
     content = post["post"]["record"].get("text", "[No text]")
     uri = post["post"]["uri"]
     permalink = f"https://bsky.app/profile/{did}/post/{uri.split('/')[-1]}"
-    handle = resolve_did_to_handle(did)
+    handle = resolve_did_to_handle(bsky, did)
     message = f"**New Bluesky Post by @{handle}:**\n{content}\n🔗 {permalink}"
     payload = {"content": message}
-    response = requests.post(webhook_url, json=payload)
+    response = bsky.http.post(webhook_url, json=payload, timeout=HTTP_TIMEOUT)
     response.raise_for_status()
 
-def monitor_account(jwt, did, webhook):
-    print(f"[+] Monitoring {did}")
-    seen_file = os.path.join(SEEN_DIR, f"{did.replace(':', '_')}.txt")
-    last_seen_uri = None
+class Account:
+    """Per-DID poll state: where to post and the newest post URI already relayed."""
+
+    def __init__(self, did, webhook):
+        self.did = did
+        self.webhook = webhook
+        self.seen_file = os.path.join(SEEN_DIR, f"{did.replace(':', '_')}.txt")
+        self.last_seen_uri = None
+        self.warmed_up = False
+        if os.path.exists(self.seen_file):
+            with open(self.seen_file, "r", encoding="utf-8") as f:
+                self.last_seen_uri = f.read().strip()
+            self.warmed_up = True
+
+    def mark_seen(self, uri):
+        self.last_seen_uri = uri
+        with open(self.seen_file, "w", encoding="utf-8") as f:
+            f.write(uri)
+
+def poll_account(bsky, account):
+    """One fetch for one account (runs on a worker thread). Returns how many posts were relayed."""
+    feed = fetch_latest_posts(bsky, account.did)
+
+    if not account.warmed_up:
+        # Warm-up: remember the newest post without posting it
+        account.warmed_up = True
+        if feed:
+            account.mark_seen(feed[0]["post"]["uri"])
+        return 0
+
+    new_posts = []
+    for post in feed:
+        if post["post"]["uri"] == account.last_seen_uri:
+            break
+        new_posts.append(post)
+
+    for post in reversed(new_posts):
+        send_to_discord(bsky, post, account.webhook, account.did)
+        account.mark_seen(post["post"]["uri"])
+    return len(new_posts)
+
+def feed_item_time(item):
+    """When the item entered the feed: the repost time for reposts, otherwise the post's indexedAt."""
+    reason = item.get("reason") or {}
+    return reason.get("indexedAt") or item["post"].get("indexedAt", "")
+
+def feed_item_did(item):
+    """The watched account an item belongs to: the reposter for reposts, otherwise the author."""
+    reason = item.get("reason") or {}
+    if reason.get("by"):
+        return reason["by"]["did"]
+    return item["post"]["author"]["did"]
+
+class FeedState:
+    """
+    High-water mark for the shared list/timeline feed: the newest feed time relayed
+    and the URIs relayed recently, persisted so a restart doesn't repost anything.
+    """
+
+    def __init__(self, path=FEED_STATE_FILE):
+        self.path = path
+        self.newest = None
+        self.recent = []
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.newest = data.get("newest")
+            self.recent = data.get("recent", [])
+        self._recent_set = set(self.recent)
+
+    @property
+    def warmed_up(self):
+        return self.newest is not None
+
+    def is_new(self, item):
+        return feed_item_time(item) >= self.newest and item["post"]["uri"] not in self._recent_set
+
+    def advance(self, item):
+        uri = item["post"]["uri"]
+        self.newest = max(self.newest or "", feed_item_time(item))
+        self.recent.append(uri)
+        self._recent_set.add(uri)
+        if len(self.recent) > FEED_RECENT_URIS:
+            self._recent_set.difference_update(self.recent[:-FEED_RECENT_URIS])
+            self.recent = self.recent[-FEED_RECENT_URIS:]
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"newest": self.newest, "recent": self.recent}, f)
+        os.replace(tmp, self.path)
 
-    # Load last seen URI from file if available
-    if os.path.exists(seen_file):
-        with open(seen_file, "r", encoding="utf-8") as f:
-            last_seen_uri = f.read().strip()
+def fetch_feed_page(bsky, cursor=None):
+    if FEED_SOURCE == "list":
+        method, params = "app.bsky.feed.getListFeed", {"list": LIST_URI, "limit": FEED_PAGE_LIMIT}
     else:
-        # Warm-up: Set last_seen_uri without posting
+        method, params = "app.bsky.feed.getTimeline", {"limit": FEED_PAGE_LIMIT}
+    if cursor:
+        params["cursor"] = cursor
+    response = bsky.xrpc_get(method, params)
+    response.raise_for_status()
+    data = response.json()
+    return data.get("feed", []), data.get("cursor")
+
+def poll_feed(bsky, state, accounts):
+    """
+    One poll of the shared feed (runs on a worker thread). Pages back until it
+    reaches posts already relayed, then sends the new ones oldest-first to the
+    webhook of the account they belong to. Returns how many posts were relayed.
+    """
+    items, cursor = fetch_feed_page(bsky)
+
+    if not state.warmed_up:
+        # Warm-up: remember where the feed is without posting anything
+        for item in reversed(items):
+            state.advance(item)
+        if state.warmed_up:
+            state.save()
+        return 0
+
+    new_items = [item for item in items if state.is_new(item)]
+    pages = 1
+    while cursor and items and pages < FEED_MAX_PAGES and feed_item_time(items[-1]) >= state.newest:
+        items, cursor = fetch_feed_page(bsky, cursor)
+        new_items += [item for item in items if state.is_new(item)]
+        pages += 1
+
+    relayed = 0
+    for item in reversed(new_items):
+        author = item["post"]["author"]
+        handle_cache.setdefault(author["did"], author.get("handle", author["did"]))
+        did = feed_item_did(item)
+        account = accounts.get(did)
+        if account is not None:
+            send_to_discord(bsky, item, account.webhook, did)
+            account.mark_seen(item["post"]["uri"])
+            relayed += 1
+        state.advance(item)
+    if new_items:
+        state.save()
+    return relayed
+
+class RequestBudget:
+    """Token bucket shared by every account loop; also holds everyone back after a 429."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+def rate_limit_wait(response):
+    """Seconds until a 429 clears: ratelimit-reset (epoch) or Retry-After, else a default."""
+    reset = response.headers.get("ratelimit-reset")
+    if reset:
         try:
-            feed = fetch_latest_posts(jwt, did)
-            if feed:
-                last_seen_uri = feed[0]["post"]["uri"]
-                with open(seen_file, "w", encoding="utf-8") as f:
-                    f.write(last_seen_uri)
-        except Exception as e:
-            print(f"[{did}] Error during warm-up: {e}")
+            return max(1.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(1.0, float(retry_after))
+        except ValueError:
+            pass
+    return RATE_LIMIT_DEFAULT_WAIT
 
+async def poll_loop(label, poll, budget, executor, start_offset):
+    """Call `poll` on the executor every POLL_INTERVAL, within the shared request budget."""
+    loop = asyncio.get_running_loop()
+    await asyncio.sleep(start_offset)
+    print(f"[+] Monitoring {label}")
     while True:
+        started = loop.time()
+        delay = POLL_INTERVAL
+        await budget.acquire()
         try:
-            feed = fetch_latest_posts(jwt, did)
-            new_posts = []
-            for post in feed:
-                uri = post["post"]["uri"]
-                if uri == last_seen_uri:
-                    break
-                new_posts.append(post)
-
-            if new_posts:
-                for post in reversed(new_posts):
-                    send_to_discord(post, webhook, did)
-                    last_seen_uri = post["post"]["uri"]
-                    with open(seen_file, "w", encoding="utf-8") as f:
-                        f.write(last_seen_uri)
-
-            time.sleep(POLL_INTERVAL)
-
+            await loop.run_in_executor(executor, poll)
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                print(f"[!] {did} rate limited. Sleeping 5 minutes.")
-                time.sleep(300)
+            response = e.response
+            if response is not None and response.status_code == 429 and response.url.startswith(XRPC_BASE):
+                wait = rate_limit_wait(response)
+                budget.pause(wait)
+                print(f"[!] Bluesky rate limit hit polling {label}; pausing all polls for {wait:.0f}s.")
             else:
-                print(f"[!] HTTP error for {did}: {e}")
-                time.sleep(60)
+                print(f"[!] HTTP error for {label}: {e}")
+                delay = 60
+        except Exception as e:
+            print(f"[!] General error for {label}: {e}")
+            delay = 60
+        await asyncio.sleep(max(0.0, started + delay - loop.time()))
+
+def stream_post_item(event):
+    """A Jetstream post-create event as the feed item shape send_to_discord() expects, else None."""
+    commit = event.get("commit") or {}
+    if (
+        event.get("kind") != "commit"
+        or commit.get("operation") != "create"
+        or commit.get("collection") != "app.bsky.feed.post"
+    ):
+        return None
+    uri = f"at://{event['did']}/app.bsky.feed.post/{commit['rkey']}"
+    return {"post": {"uri": uri, "record": commit.get("record") or {}}}
+
+def load_jetstream_cursor():
+    try:
+        with open(JETSTREAM_CURSOR_FILE, "r", encoding="utf-8") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def save_jetstream_cursor(cursor):
+    tmp = JETSTREAM_CURSOR_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(str(cursor))
+    os.replace(tmp, JETSTREAM_CURSOR_FILE)
+
+def relay_stream_post(bsky, account, item):
+    send_to_discord(bsky, item, account.webhook, account.did)
+    account.mark_seen(item["post"]["uri"])
+
+def jetstream_connect_url(dids, cursor):
+    """
+    The subscribe URL, and the options_update to send once connected (or None
+    when the URL already carries the whole filter).
+    """
+    params = [("wantedCollections", "app.bsky.feed.post")]
+    if cursor is not None:
+        params.append(("cursor", cursor))
+    if len(dids) > JETSTREAM_MAX_WANTED_DIDS:
+        return f"{JETSTREAM_URL}?{urlencode(params)}", None
+    url = f"{JETSTREAM_URL}?{urlencode(params + [('wantedDids', did) for did in sorted(dids)])}"
+    if len(url) <= JETSTREAM_MAX_URL_LENGTH:
+        return url, None
+    hello = {"type": "options_update", "payload": {
+        "wantedCollections": ["app.bsky.feed.post"], "wantedDids": sorted(dids),
+    }}
+    return f"{JETSTREAM_URL}?{urlencode(params + [('requireHello', 'true')])}", hello
+
+def relay_error_is_transient(error):
+    """Whether a failed relay is worth retrying: anything but a 4xx other than 429."""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return True
+
+async def relay_with_retries(bsky, account, item, executor):
+    """Relay one stream post, retrying transient failures. Returns False if the post was skipped."""
+    loop = asyncio.get_running_loop()
+    uri = item["post"]["uri"]
+    delay = 1
+    for attempt in range(1, JETSTREAM_RELAY_ATTEMPTS + 1):
+        try:
+            await loop.run_in_executor(executor, relay_stream_post, bsky, account, item)
+            return True
         except Exception as e:
-            print(f"[!] General error for {did}: {e}")
-            time.sleep(60)
+            if not relay_error_is_transient(e):
+                print(f"[!] Skipping {uri}: {e}")
+                return False
+            if attempt == JETSTREAM_RELAY_ATTEMPTS:
+                print(f"[!] Giving up on {uri} after {attempt} attempts: {e}")
+                return False
+            response = getattr(e, "response", None)
+            wait = rate_limit_wait(response) if response is not None and response.status_code == 429 else delay
+            print(f"[!] Failed to relay {uri}: {e}; retrying in {wait:.0f}s.")
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, JETSTREAM_RECONNECT_MAX)
+
+async def jetstream_loop(bsky, accounts, executor):
+    """
+    Relay posts from a Jetstream websocket. Events are filtered against the
+    watched DID set locally (and server-side when the set is small enough),
+    webhooks are sent in stream order, and the cursor is saved after every
+    relayed post and every JETSTREAM_CURSOR_SAVE_SECONDS otherwise. The
+    cursor doesn't move past a post while its relay is being retried, so a
+    restart or reconnect meanwhile resumes at that post rather than after it;
+    a post that fails for good (see relay_with_retries) is skipped.
+    """
+    if websockets is None:
+        raise SystemExit("[!] FEED_SOURCE = \"jetstream\" needs the websockets package (pip install websockets).")
+    loop = asyncio.get_running_loop()
+    dids = frozenset(accounts)
+    cursor = load_jetstream_cursor()
+    saved_cursor = cursor
+    backoff = 1
+
+    while True:
+        url, hello = jetstream_connect_url(dids, cursor)
+        try:
+            async with websockets.connect(url, max_size=None) as ws:
+                if hello is not None:
+                    await ws.send(json.dumps(hello))
+                print(f"[+] Streaming posts for {len(dids)} accounts from {JETSTREAM_URL}"
+                      + (f" (resuming at {cursor})" if cursor is not None else ""))
+                saved_at = loop.time()
+                async for raw in ws:
+                    try:
+                        event = json.loads(raw)
+                    except ValueError:
+                        print(f"[!] Skipping malformed Jetstream frame: {raw[:80]!r}")
+                        continue
+                    if not isinstance(event, dict):
+                        continue
+                    time_us = event.get("time_us")
+                    if time_us is None or (cursor is not None and time_us <= cursor):
+                        continue  # replayed before the resume point
+                    relayed = False
+                    if event.get("did") in dids:
+                        item = stream_post_item(event)
+                        if item is not None:
+                            relayed = await relay_with_retries(bsky, accounts[event["did"]], item, executor)
+                    cursor = time_us
+                    backoff = 1
+                    # Save right after a relayed post, so a restart can't post it twice
+                    if relayed or loop.time() - saved_at >= JETSTREAM_CURSOR_SAVE_SECONDS:
+                        save_jetstream_cursor(cursor)
+                        saved_cursor, saved_at = cursor, loop.time()
+                print("[!] Jetstream closed the connection.")
+        except (websockets.exceptions.WebSocketException, OSError) as e:
+            print(f"[!] Jetstream connection error: {e}")
+        finally:
+            if cursor is not None and cursor != saved_cursor:
+                save_jetstream_cursor(cursor)
+                saved_cursor = cursor
+        print(f"[*] Reconnecting to Jetstream in {backoff}s.")
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, JETSTREAM_RECONNECT_MAX)
+
+async def run_scheduler(bsky, accounts):
+    budget = RequestBudget(REQUESTS_PER_SECOND)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="bsky") as executor:
+        if FEED_SOURCE == "jetstream":
+            await jetstream_loop(bsky, {did: Account(did, webhook) for did, webhook in accounts.items()}, executor)
+            return
+
+        if FEED_SOURCE in ("list", "timeline"):
+            by_did = {did: Account(did, webhook) for did, webhook in accounts.items()}
+            label = f"{FEED_SOURCE} feed for {len(by_did)} accounts"
+            poll = functools.partial(poll_feed, bsky, FeedState(), by_did)
+            await poll_loop(label, poll, budget, executor, 0)
+            return
+
+        if len(accounts) / POLL_INTERVAL > REQUESTS_PER_SECOND:
+            effective = len(accounts) / REQUESTS_PER_SECOND
+            print(f"[!] {len(accounts)} accounts exceed the request budget; each will be polled about every {effective:.0f}s.")
+        step = POLL_INTERVAL / max(1, len(accounts))
+        await asyncio.gather(*(
+            poll_loop(did, functools.partial(poll_account, bsky, Account(did, webhook)), budget, executor, i * step)
+            for i, (did, webhook) in enumerate(accounts.items())
+        ))
 
 def load_accounts():
     accounts = {}
@@ -122,22 +587,11 @@ def load_accounts():
 
 def main():
     print("[*] Starting Bluesky relay bot...")
-    session = create_session_with_expiry()
-    jwt = session["jwt"]
-    jwt_expires_at = time.time() + session["expires_in"]
-
     accounts = load_accounts()
-    for did, webhook in accounts.items():
-        thread = threading.Thread(target=monitor_account, args=(jwt, did, webhook), daemon=True)
-        thread.start()
-
-    while True:
-        if time.time() > jwt_expires_at:
-            session = create_session_with_expiry()
-            jwt = session["jwt"]
-            jwt_expires_at = time.time() + session["expires_in"]
-            print("[*] Session refreshed.")
-        time.sleep(60)
+    bsky = BlueskySession(USERNAME, APP_PASSWORD)
+    if FEED_SOURCE != "jetstream":  # streaming needs no login; only the polling modes call the API
+        bsky.access_token()  # log in once up front; every poll shares (and refreshes) this session
+    asyncio.run(run_scheduler(bsky, accounts))
 
 if __name__ == "__main__":
     main()
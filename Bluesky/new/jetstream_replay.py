@@ -0,0 +1,165 @@
+"""
+Record a Jetstream websocket to a file and serve it back locally, so the relay's
+FEED_SOURCE = "jetstream" mode can be run and tested without the live network.
+
+    python jetstream_replay.py record stream.jsonl [--seconds 60] [--url wss://...]
+    python jetstream_replay.py serve stream.jsonl [--port 6008] [--speed 1] [--loop]
+
+Then set JETSTREAM_URL = "ws://127.0.0.1:6008/subscribe" in bskyrelay.py.
+
+A recording is one Jetstream event (JSON) per line. The server behaves like
+Jetstream for what the relay uses: `cursor` resumes from that time_us,
+`wantedCollections` / `wantedDids` (query string or an options_update message)
+filter what is sent, `requireHello=true` holds everything back until the first
+options_update arrives, and events are paced by their time_us gaps divided by
+--speed (0 sends as fast as possible).
+
+Needs the websockets package (13 or newer).
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+
+import websockets
+from websockets.asyncio.server import serve
+
+DEFAULT_URL = "wss://jetstream2.us-east.bsky.network/subscribe?wantedCollections=app.bsky.feed.post"
+
+
+# ----------------------------
+# Recording
+# ----------------------------
+
+async def record(url: str, path: str, seconds: float) -> None:
+    count = 0
+    deadline = time.monotonic() + seconds
+    with open(path, "a", encoding="utf-8") as out:
+        async with websockets.connect(url, max_size=None) as ws:
+            while time.monotonic() < deadline:
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), deadline - time.monotonic())
+                except asyncio.TimeoutError:
+                    break
+                out.write(raw.strip() + "\n")
+                count += 1
+    print(f"[record] {count} events written to {path}")
+
+
+# ----------------------------
+# Serving
+# ----------------------------
+
+def load_events(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    events.sort(key=lambda event: event.get("time_us", 0))
+    return events
+
+
+class Subscription:
+    """What one client asked for; updated in place by options_update messages."""
+
+    def __init__(self, query: dict):
+        self.collections: Optional[Set[str]] = set(query["wantedCollections"]) if "wantedCollections" in query else None
+        self.dids: Optional[Set[str]] = set(query["wantedDids"]) if "wantedDids" in query else None
+        self.cursor: Optional[int] = int(query["cursor"][0]) if "cursor" in query else None
+        self.hello = asyncio.Event()
+        if query.get("requireHello", ["false"])[0] != "true":
+            self.hello.set()
+
+    def update(self, payload: dict) -> None:
+        self.hello.set()
+        if "wantedCollections" in payload:
+            self.collections = set(payload["wantedCollections"]) or None
+        if "wantedDids" in payload:
+            self.dids = set(payload["wantedDids"]) or None
+
+    def wants(self, event: dict) -> bool:
+        if self.dids is not None and event.get("did") not in self.dids:
+            return False
+        if self.collections is not None:
+            collection = (event.get("commit") or {}).get("collection")
+            return collection is None or collection in self.collections  # identity/account events carry none
+        return True
+
+
+async def _read_options(ws, subscription: Subscription) -> None:
+    async for message in ws:
+        try:
+            data = json.loads(message)
+        except ValueError:
+            continue
+        if data.get("type") == "options_update":
+            subscription.update(data.get("payload") or {})
+
+
+async def _replay(ws, events: List[dict], subscription: Subscription, speed: float, loop_forever: bool) -> None:
+    await subscription.hello.wait()
+    while True:
+        previous_us = None
+        for event in events:
+            time_us = event.get("time_us", 0)
+            if subscription.cursor is not None and time_us < subscription.cursor:
+                continue
+            if speed > 0 and previous_us is not None:
+                await asyncio.sleep(max(0, time_us - previous_us) / 1e6 / speed)
+            previous_us = time_us
+            if subscription.wants(event):
+                await ws.send(json.dumps(event))
+            else:
+                await asyncio.sleep(0)  # let options_update messages in between events
+        if not loop_forever:
+            return
+        subscription.cursor = None
+
+
+def make_handler(events: List[dict], speed: float, loop_forever: bool):
+    async def handler(ws) -> None:
+        subscription = Subscription(parse_qs(urlsplit(ws.request.path).query))
+        print(f"[serve] client connected: {ws.request.path}")
+        reader = asyncio.create_task(_read_options(ws, subscription))
+        try:
+            await _replay(ws, events, subscription, speed, loop_forever)
+            await reader  # recording finished; stay connected like an idle stream
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+            print("[serve] client disconnected")
+    return handler
+
+
+async def serve_file(path: str, port: int, speed: float, loop_forever: bool) -> None:
+    events = load_events(path)
+    async with serve(make_handler(events, speed, loop_forever), "127.0.0.1", port, max_size=None):
+        print(f"[serve] {len(events)} events from {path} on ws://127.0.0.1:{port}/subscribe")
+        await asyncio.Future()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record or replay a Jetstream websocket.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="save live events to a file")
+    rec.add_argument("path")
+    rec.add_argument("--url", default=DEFAULT_URL)
+    rec.add_argument("--seconds", type=float, default=60)
+
+    srv = sub.add_parser("serve", help="replay a recording as a local Jetstream")
+    srv.add_argument("path")
+    srv.add_argument("--port", type=int, default=6008)
+    srv.add_argument("--speed", type=float, default=1.0, help="playback speed; 0 = no pacing")
+    srv.add_argument("--loop", action="store_true", help="start over when the recording ends")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        asyncio.run(record(args.url, args.path, args.seconds))
+    else:
+        asyncio.run(serve_file(args.path, args.port, args.speed, args.loop))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
 #!/usr/bin/env python3
 import datetime
 import logging
-import re
-import subprocess
+import os
+import select
+import socket
+import struct
+import sys
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+# Shared edit-in-place board (../StatusBoard/statusboard.py, or a copy next to this script)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StatusBoard"))
+from statusboard import StatusBoard  # noqa: E402
+
+# Shared adaptive scheduling (../PollScheduler/pollscheduler.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "PollScheduler"))
+from pollscheduler import FleetScheduler  # noqa: E402
+
 # ==============================
 # Configuration
 # ==============================
@@ -15,21 +26,72 @@ import requests
 # Discord webhook URL (put your real webhook here)
 WEBHOOK_URL = "https://discord.com/api/webhooks/your_webhook_id/your_token"
 
-# Chocolate Doom server to monitor
-SERVER_HOST = "example.doomserver.net"   # hostname or IP
-SERVER_PORT = 2342                       # UDP port
+# Chocolate Doom servers to monitor; all are queried at once from one socket.
+# Each entry:
+#   host     - hostname or IP
+#   port     - UDP port
+#   username - webhook display name for this server's messages
+#   display  - address text shown in the embed (defaults to host:port)
+CHOCDOOM_TARGETS = [
+    {
+        "host": "example.doomserver.net",
+        "port": 2342,
+        "username": "My Doom Server | Chocolate Doom",
+    },
+]
 
 # How often to run: every 15 minutes on the clock (:00, :15, :30, :45)
 CHECK_INTERVAL_MINUTES = 15
 
-# Webhook display name and address text
-WEBHOOK_USERNAME = "My Doom Server | Chocolate Doom"
-DISPLAY_ADDRESS = f"{SERVER_HOST}:{SERVER_PORT}"
-
-# Regex for the data line, e.g.:
-#   "   2 192.168.4.15          1/4 (doom2) (game running) MyServer"
-#   "   2 192.168.4.15          0/8 MyServer"
-QUERY_LINE_RE = re.compile(r"^\s*(\d+)\s+(\S+)\s+(\d+/\d+)\s+(.*)$")
+# Adaptive scheduling: instead of waiting for the next clock-aligned
+# interval, each server is scheduled on its own: polled every
+# FAST_POLL_SECONDS while players are on (or its player count just changed),
+# then backed off exponentially once it has been empty for
+# FAST_POLL_GRACE_SECONDS, up to MAX_POLL_SECONDS. Each delay gets
+# +/- POLL_JITTER_FRACTION of random jitter so many monitors don't align.
+# Needs STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED, otherwise every
+# fast poll would post a full embed.
+ADAPTIVE_SCHEDULE_ENABLED = False
+FAST_POLL_SECONDS = 20
+FAST_POLL_GRACE_SECONDS = 10 * 60
+MAX_POLL_SECONDS = 60 * 60
+POLL_JITTER_FRACTION = 0.1
+
+# Status board mode: keep one message per server and edit it in place only
+# when its content changes, instead of posting a new message every cycle.
+STATUS_BOARD_ENABLED = False
+STATUS_BOARD_STATE_FILE = "chocdoom_board.json"
+
+# Change detection mode: remember each server's last query result and only send a
+# webhook on meaningful transitions (players joined/left, game started or
+# ended, server went empty). Makes shorter check intervals practical.
+# Can be combined with the status board: the board shows the live state and
+# each change is also posted as its own message.
+CHANGE_DETECTION_ENABLED = False
+
+# Query timeout; the request is re-sent once halfway through if unanswered
+QUERY_TIMEOUT_SEC = 3.0
+
+# Chocolate Doom net protocol (net_defs.h): every packet starts with a
+# big-endian uint16 packet type.
+NET_PACKET_TYPE_QUERY = 13
+NET_PACKET_TYPE_QUERY_RESPONSE = 14
+
+# gamemission_t -> name, as printed by `chocolate-doom -query`
+GAME_MISSION_NAMES = {
+    0: "doom",
+    1: "doom2",
+    2: "tnt",
+    3: "plutonia",
+    4: "chex",
+    5: "hacx",
+    6: "heretic",
+    7: "hexen",
+    8: "strife",
+}
+
+# gamemode_t value meaning "unknown game"
+GAME_MODE_INDETERMINED = 4
 
 
 # ==============================
@@ -73,113 +135,152 @@ def seconds_until_next_quarter() -> float:
     return max(delta, 0.0)
 
 
-def query_chocdoom() -> Optional[Dict[str, Any]]:
-    """
-    Run `chocolate-doom -query SERVER_HOST -port SERVER_PORT` and parse the result.
+def target_key(target: Dict[str, Any]) -> str:
+    return f"{target['host']}:{target['port']}"
 
-    Returns a dict:
-        {
-            "pingMs": int,
-            "ip": str,
-            "players": int,
-            "maxPlayers": int,
-            "game": str or None,
-            "inProgress": bool,
-            "description": str,
-        }
-    or None if there is no usable output.
-    """
-    cmd = [
-        "chocolate-doom",
-        "-query",
-        SERVER_HOST,
-        "-port",
-        str(SERVER_PORT),
-    ]
 
-    try:
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-    except Exception as e:
-        logging.warning("Failed to run chocolate-doom: %s", e)
-        return None
-
-    if proc.returncode != 0:
-        logging.warning(
-            "chocolate-doom exited with code %d; stderr: %s",
-            proc.returncode,
-            (proc.stderr or "").strip(),
-        )
-        return None
+def _read_cstring(data: bytes, pos: int) -> Tuple[str, int]:
+    end = data.find(b"\x00", pos)
+    if end < 0:
+        raise ValueError("Unterminated string in query response")
+    return data[pos:end].decode("utf-8", errors="replace"), end + 1
 
-    ping_str = ip = players_str = rest = None
 
-    for line in proc.stdout.splitlines():
-        match = QUERY_LINE_RE.match(line)
-        if match:
-            ping_str, ip, players_str, rest = match.groups()
-            break
+def parse_query_response(data: bytes) -> Dict[str, Any]:
+    """
+    Parse a NET_PACKET_TYPE_QUERY_RESPONSE packet (see NET_WriteQueryData):
 
-    if ping_str is None:
-        logging.info("No data line found in chocolate-doom output.")
-        return None
+        uint16 type, string version, uint8 server_state, uint8 num_players,
+        uint8 max_players, uint8 gamemode, uint8 gamemission,
+        string description, [protocol list - ignored]
 
-    # Ping
-    try:
-        ping_ms = int(ping_str)
-    except ValueError:
-        ping_ms = -1
+    Strings are NUL-terminated. Returns the same dict shape as
+    query_chocdoom_many() items, minus "pingMs" and "ip".
+    """
+    if len(data) < 2:
+        raise ValueError("Query response too short")
 
-    # Players / max
-    try:
-        players_part, max_part = players_str.split("/", 1)
-        players = int(players_part)
-        max_players = int(max_part)
-    except Exception:
-        players = 0
-        max_players = 0
-
-    # Parse optional "(doom2)" etc at the front of rest
-    game = None
-    desc = rest
+    (packet_type,) = struct.unpack_from(">H", data, 0)
+    if packet_type != NET_PACKET_TYPE_QUERY_RESPONSE:
+        raise ValueError(f"Unexpected packet type {packet_type}")
 
-    if desc.startswith("("):
-        closing = desc.find(")")
-        if closing > 0:
-            game = desc[1:closing]
-            desc = desc[closing + 1 :].lstrip()
+    version, pos = _read_cstring(data, 2)
+    if pos + 5 > len(data):
+        raise ValueError("Query response truncated")
+    server_state, players, max_players, game_mode, game_mission = data[pos : pos + 5]
+    description, _pos = _read_cstring(data, pos + 5)
 
-    # Check for "(game running)" marker
-    in_progress = False
-    game_running_tag = "(game running)"
-    if game_running_tag in desc:
-        in_progress = True
-        desc = desc.replace(game_running_tag, "").strip()
+    game = None
+    if game_mode != GAME_MODE_INDETERMINED:
+        game = GAME_MISSION_NAMES.get(game_mission, f"mission {game_mission}")
 
     return {
-        "pingMs": ping_ms,
-        "ip": ip,
+        "version": version,
         "players": players,
         "maxPlayers": max_players,
         "game": game,
-        "inProgress": in_progress,
-        "description": desc.strip(),
+        "inProgress": server_state != 0,
+        "description": description.strip(),
     }
 
 
-def send_webhook(info: Dict[str, Any]) -> None:
-    """
-    Send a Discord webhook for the given server info.
-    Only call this when players > 0.
+def query_chocdoom_many(
+    targets: List[Tuple[str, int]],
+    timeout_sec: float = QUERY_TIMEOUT_SEC,
+) -> List[Optional[Dict[str, Any]]]:
     """
-    if not WEBHOOK_URL or "your_webhook_id" in WEBHOOK_URL:
-        logging.error("WEBHOOK_URL is not configured.")
-        return
+    Query several Chocolate Doom servers at once from a single UDP socket.
 
+    Sends NET_PACKET_TYPE_QUERY to every distinct resolved address, then
+    collects responses and matches them back by source address. Addresses
+    that haven't answered by half the timeout get the request once more.
+
+    Returns a list parallel to `targets`, so entries that resolve to the same
+    server (aliases, duplicates) each get their own copy of its reply. Each
+    item is None if that target didn't answer or didn't resolve, else:
+        {
+            "pingMs": int,
+            "ip": str,
+            "players": int,
+            "maxPlayers": int,
+            "game": str or None,
+            "inProgress": bool,
+            "description": str,
+            "version": str,
+        }
+    """
+    request = struct.pack(">H", NET_PACKET_TYPE_QUERY)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+
+    # Resolve up front; replies come back from the numeric address.
+    pending: Dict[Tuple[str, int], List[int]] = {}
+    for index, (host, port) in enumerate(targets):
+        try:
+            pending.setdefault((socket.gethostbyname(host), port), []).append(index)
+        except OSError as e:
+            logging.warning("DNS resolution failed for %s: %s", host, e)
+
+    if not pending:
+        return results
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        sent_at: Dict[Tuple[str, int], float] = {}
+
+        def send_all() -> None:
+            for addr in pending:
+                try:
+                    sock.sendto(request, addr)
+                    sent_at[addr] = time.monotonic()
+                except OSError as e:
+                    logging.warning("Failed to send query to %s:%d: %s", addr[0], addr[1], e)
+
+        send_all()
+        start = time.monotonic()
+        deadline = start + timeout_sec
+        resend_at = start + timeout_sec / 2
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if resend_at is not None and now >= resend_at:
+                send_all()
+                resend_at = None
+
+            wake = deadline if resend_at is None else resend_at
+            readable, _, _ = select.select([sock], [], [], max(0.0, wake - now))
+            if not readable:
+                continue
+
+            try:
+                data, addr = sock.recvfrom(4096)
+            except OSError:
+                continue
+
+            indices = pending.get(addr)
+            if indices is None:
+                continue
+
+            try:
+                info = parse_query_response(data)
+            except ValueError as e:
+                logging.debug("Bad query response from %s:%d: %s", addr[0], addr[1], e)
+                continue
+
+            info["pingMs"] = int((time.monotonic() - sent_at[addr]) * 1000)
+            info["ip"] = addr[0]
+            for index in indices:
+                results[index] = dict(info)
+            del pending[addr]
+
+    return results
+
+
+def build_embed(target: Dict[str, Any], info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the status embed for the given server info.
+    """
     players = info.get("players", 0)
     max_players = info.get("maxPlayers", 0)
     game = info.get("game") or "Unknown"
@@ -188,13 +289,13 @@ def send_webhook(info: Dict[str, Any]) -> None:
 
     status_text = "Game in progress" if in_progress else "Lobby"
 
-    embed = {
+    return {
         "title": "Chocolate Doom",
-        "color": 0x00FF00,
+        "color": 0x00FF00 if players > 0 else 0x808080,
         "fields": [
             {
                 "name": "Address",
-                "value": DISPLAY_ADDRESS,
+                "value": target.get("display") or target_key(target),
                 "inline": True,
             },
             {
@@ -220,10 +321,20 @@ def send_webhook(info: Dict[str, Any]) -> None:
         ],
     }
 
+
+def send_webhook(target: Dict[str, Any], info: Dict[str, Any]) -> None:
+    """
+    Send a Discord webhook for the given server info.
+    Only call this when players > 0.
+    """
+    if not WEBHOOK_URL or "your_webhook_id" in WEBHOOK_URL:
+        logging.error("WEBHOOK_URL is not configured.")
+        return
+
     payload = {
-        "username": WEBHOOK_USERNAME,
+        "username": target["username"],
         "content": "",
-        "embeds": [embed],
+        "embeds": [build_embed(target, info)],
     }
 
     try:
@@ -238,27 +349,143 @@ def send_webhook(info: Dict[str, Any]) -> None:
         logging.exception("Failed to send webhook: %s", e)
 
 
-def run_once() -> None:
+status_board: Optional[StatusBoard] = None
+
+
+def update_status_board(target: Dict[str, Any], info: Dict[str, Any]) -> None:
     """
-    One check: query server and send webhook if players > 0.
+    Create or edit the status board message for one server (see StatusBoard).
     """
-    logging.info("Querying Chocolate Doom server...")
-    info = query_chocdoom()
-    if not info:
-        logging.info("No info (server unreachable or no data).")
+    if not WEBHOOK_URL or "your_webhook_id" in WEBHOOK_URL:
+        logging.error("WEBHOOK_URL is not configured.")
         return
+    status_board.update(target_key(target), build_embed(target, info), username=target["username"])
+
 
-    logging.info(
-        "Got info: players=%d/%d, inProgress=%s",
-        info.get("players", 0),
-        info.get("maxPlayers", 0),
-        info.get("inProgress", False),
+last_snapshots: Dict[str, Dict[str, Any]] = {}
+
+
+def diff_snapshots(
+    old: Optional[Dict[str, Any]],
+    new: Dict[str, Any],
+) -> List[str]:
+    """
+    Return human-readable transitions between two query results.
+
+    The query only reports counts, so joins/leaves are reported as count
+    changes. The first result after startup only counts if players are on.
+    """
+    new_players = new.get("players", 0)
+    if old is None:
+        return ["Now monitoring"] if new_players > 0 else []
+
+    old_players = old.get("players", 0)
+    changes: List[str] = []
+
+    if new_players != old_players:
+        changes.append(f"Players: {old_players} -> {new_players}")
+
+    if new_players > 0 and old.get("game") != new.get("game"):
+        changes.append(f"Game changed: {old.get('game') or 'Unknown'} -> {new.get('game') or 'Unknown'}")
+
+    if new_players > 0 and old.get("inProgress") != new.get("inProgress"):
+        changes.append("Game started" if new.get("inProgress") else "Back in lobby")
+
+    if old_players > 0 and new_players == 0:
+        changes.append("Server is now empty")
+
+    return changes
+
+
+def send_changes(target: Dict[str, Any], info: Dict[str, Any]) -> None:
+    """
+    Diff against the server's last result and send a webhook only on transitions.
+    """
+    key = target_key(target)
+    snapshot = {
+        "players": info.get("players", 0),
+        "game": info.get("game"),
+        "inProgress": info.get("inProgress", False),
+    }
+    changes = diff_snapshots(last_snapshots.get(key), snapshot)
+    last_snapshots[key] = snapshot
+
+    if not changes:
+        logging.info("%s: no changes since last check, not sending webhook.", key)
+        return
+
+    if not WEBHOOK_URL or "your_webhook_id" in WEBHOOK_URL:
+        logging.error("WEBHOOK_URL is not configured.")
+        return
+
+    embed = build_embed(target, info)
+    embed["fields"].insert(
+        0,
+        {
+            "name": "Changes",
+            "value": "\n".join(changes),
+            "inline": False,
+        },
     )
 
-    if info.get("players", 0) > 0:
-        send_webhook(info)
-    else:
-        logging.info("No players, not sending webhook.")
+    payload = {
+        "username": target["username"],
+        "content": "",
+        "embeds": [embed],
+    }
+
+    try:
+        resp = requests.post(WEBHOOK_URL, json=payload, timeout=10)
+        if resp.status_code >= 400:
+            logging.error(
+                "Webhook error %s: %s",
+                resp.status_code,
+                resp.text[:500],
+            )
+    except Exception as e:
+        logging.exception("Failed to send webhook: %s", e)
+
+
+def run_once(only: Optional[List[str]] = None) -> Dict[str, Optional[int]]:
+    """
+    One check: query every server (or just the keys in `only`) and send
+    webhooks as configured. Returns {server key: player count}, with None for
+    a server that couldn't be queried.
+    """
+    targets = [t for t in CHOCDOOM_TARGETS if only is None or target_key(t) in only]
+    logging.info("Querying %d Chocolate Doom server(s)...", len(targets))
+    infos = query_chocdoom_many([(t["host"], t["port"]) for t in targets])
+
+    players_by_key: Dict[str, Optional[int]] = {}
+    for target, info in zip(targets, infos):
+        key = target_key(target)
+        players_by_key[key] = None
+        if not info:
+            logging.info("%s: no info (server unreachable or no data).", key)
+            continue
+
+        logging.info(
+            "%s: players=%d/%d, inProgress=%s",
+            key,
+            info.get("players", 0),
+            info.get("maxPlayers", 0),
+            info.get("inProgress", False),
+        )
+        players_by_key[key] = info.get("players", 0)
+
+        if STATUS_BOARD_ENABLED:
+            update_status_board(target, info)
+
+        if CHANGE_DETECTION_ENABLED:
+            send_changes(target, info)
+        elif STATUS_BOARD_ENABLED:
+            pass  # The board already shows this server
+        elif info.get("players", 0) > 0:
+            send_webhook(target, info)
+        else:
+            logging.info("%s: no players, not sending webhook.", key)
+
+    return players_by_key
 
 
 def main() -> None:
@@ -269,18 +496,49 @@ def main() -> None:
 
     logging.info("Starting Chocolate Doom status bot.")
 
-    # Force an immediate check on startup
-    run_once()
+    if not CHOCDOOM_TARGETS:
+        raise SystemExit("CHOCDOOM_TARGETS is empty; add at least one server to monitor.")
 
-    # Then run every quarter hour
-    while True:
-        sleep_seconds = seconds_until_next_quarter()
-        logging.info(
-            "Sleeping %.1f seconds until next quarter-hour check.",
-            sleep_seconds,
+    if ADAPTIVE_SCHEDULE_ENABLED and not (STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED):
+        raise SystemExit(
+            "ADAPTIVE_SCHEDULE_ENABLED needs STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED; "
+            "otherwise a full embed would be posted on every fast poll."
         )
-        time.sleep(sleep_seconds)
-        run_once()
+
+    global status_board
+    if STATUS_BOARD_ENABLED:
+        # Older versions kept a single {"message_id", "hash"} state for one
+        # server; adopt it as the first target's message.
+        status_board = StatusBoard(WEBHOOK_URL, STATUS_BOARD_STATE_FILE, legacy_key=target_key(CHOCDOOM_TARGETS[0]))
+
+    # Force an immediate check on startup
+    players_by_key = run_once()
+
+    if ADAPTIVE_SCHEDULE_ENABLED:
+        schedule = FleetScheduler(
+            [target_key(t) for t in CHOCDOOM_TARGETS],
+            fast_seconds=FAST_POLL_SECONDS,
+            grace_seconds=FAST_POLL_GRACE_SECONDS,
+            max_seconds=MAX_POLL_SECONDS,
+            jitter_fraction=POLL_JITTER_FRACTION,
+        )
+        while True:
+            for key, players in players_by_key.items():
+                schedule.record(key, players)
+            sleep_seconds = schedule.seconds_until_next()
+            logging.info("Sleeping %.1f seconds until next check.", sleep_seconds)
+            time.sleep(sleep_seconds)
+            players_by_key = run_once(schedule.due())
+    else:
+        # Run every quarter hour
+        while True:
+            sleep_seconds = seconds_until_next_quarter()
+            logging.info(
+                "Sleeping %.1f seconds until next quarter-hour check.",
+                sleep_seconds,
+            )
+            time.sleep(sleep_seconds)
+            run_once()
 
 
 if __name__ == "__main__":
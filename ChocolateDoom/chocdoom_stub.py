@@ -0,0 +1,71 @@
+"""
+Local UDP stub that answers Chocolate Doom NET_PACKET_TYPE_QUERY like a server.
+
+Useful for trying chocdoom_status.py without a running game server. Several
+ports can be served at once to exercise CHOCDOOM_TARGETS. The player count
+is read from a text file on every request (a single number; --players is
+used while the file is missing), so you can edit it while the status bot is
+running and watch change detection fire.
+
+Run:  python chocdoom_stub.py [--port 2342 2343] [--players-file stub_players.txt]
+"""
+import argparse
+import select
+import socket
+import struct
+from pathlib import Path
+
+NET_PACKET_TYPE_QUERY = 13
+NET_PACKET_TYPE_QUERY_RESPONSE = 14
+
+
+def load_players(path, default):
+    try:
+        return int(Path(path).read_text(encoding="utf-8").split()[0])
+    except (FileNotFoundError, IndexError, ValueError):
+        return default
+
+
+def build_reply(players, max_players, mission, description, in_progress):
+    # Layout of NET_WriteQueryData: version, server_state, num_players,
+    # max_players, gamemode, gamemission, description, protocol list.
+    return (
+        struct.pack(">H", NET_PACKET_TYPE_QUERY_RESPONSE)
+        + b"Chocolate Doom 3.1.0\x00"
+        + bytes([1 if in_progress else 0, players, max_players, 2, mission])
+        + description.encode("utf-8") + b"\x00"
+        + b"\x00"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, nargs="+", default=[2342])
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--players-file", default="stub_players.txt")
+    parser.add_argument("--max-players", type=int, default=4)
+    parser.add_argument("--mission", type=int, default=1, help="gamemission_t (1 = doom2)")
+    parser.add_argument("--lobby", action="store_true", help="report the game as not started")
+    args = parser.parse_args()
+
+    socks = []
+    for port in args.port:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((args.host, port))
+        socks.append(sock)
+    print(f"chocdoom stub on {args.host} ports {', '.join(map(str, args.port))}, players from {args.players_file}")
+
+    while True:
+        readable, _, _ = select.select(socks, [], [])
+        for sock in readable:
+            data, addr = sock.recvfrom(2048)
+            if data[:2] != struct.pack(">H", NET_PACKET_TYPE_QUERY):
+                continue
+            players = load_players(args.players_file, args.players)
+            description = f"Stub server on port {sock.getsockname()[1]}"
+            sock.sendto(build_reply(players, args.max_players, args.mission, description, not args.lobby), addr)
+
+
+if __name__ == "__main__":
+    main()
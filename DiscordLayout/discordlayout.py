@@ -0,0 +1,157 @@
+"""
+Packs text lines into as few Discord webhook messages as the limits allow.
+
+Scripts add ../DiscordLayout to sys.path (or copy this file next to them) and
+use it instead of truncating long lists:
+
+    content_messages(lines)                 -> ["...", "..."]  plain messages, <= 2000 chars each
+    layout_embeds(base_embed, sections)     -> [embed, embed]  one embed per message
+    send_sequence(webhook_url, payloads)    -> posts them in order, waiting out 429s
+
+Lines are never reordered and only split when a single line is longer than
+the limit, so greedy packing already gives the minimum number of messages.
+"""
+import copy
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+# ----------------------------
+# Discord limits
+# ----------------------------
+
+CONTENT_LIMIT = 2000
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FIELDS_PER_EMBED = 25
+EMBED_TOTAL_LIMIT = 6000  # title + description + fields + footer + author, and for all embeds in a message together
+
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+# ----------------------------
+# Packing
+# ----------------------------
+
+def text_length(text: str) -> int:
+    """Length as Discord counts it (UTF-16 code units), so emoji can't push a message over."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _split_line(line: str, limit: int) -> List[str]:
+    if text_length(line) <= limit:
+        return [line]
+    pieces, current, size = [], [], 0
+    for ch in line:
+        width = text_length(ch)
+        if size + width > limit:
+            pieces.append("".join(current))
+            current, size = [], 0
+        current.append(ch)
+        size += width
+    pieces.append("".join(current))
+    return pieces
+
+
+def pack_lines(lines: Iterable[str], limit: int) -> List[str]:
+    """Join lines with newlines into the fewest chunks of at most `limit` chars, keeping order."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        for piece in _split_line(line, limit):
+            added = text_length(piece) + (1 if current else 0)
+            if current and size + added > limit:
+                chunks.append("\n".join(current))
+                current, size, added = [], 0, text_length(piece)
+            current.append(piece)
+            size += added
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def content_messages(lines: Iterable[str]) -> List[str]:
+    """Plain message contents, each within CONTENT_LIMIT."""
+    return [chunk for chunk in pack_lines(lines, CONTENT_LIMIT) if chunk.strip()]
+
+
+def embed_size(embed: dict) -> int:
+    parts = [embed.get("title", ""), embed.get("description", ""), embed.get("footer", {}).get("text", ""),
+             embed.get("author", {}).get("name", "")]
+    parts += [text for f in embed.get("fields", []) for text in (f["name"], f["value"])]
+    return sum(text_length(text) for text in parts)
+
+
+def _fits(embed: dict, field: dict) -> bool:
+    return (
+        len(embed["fields"]) < FIELDS_PER_EMBED
+        and embed_size(embed) + text_length(field["name"]) + text_length(field["value"]) <= EMBED_TOTAL_LIMIT
+    )
+
+
+def layout_embeds(
+    base: dict,
+    sections: Sequence[Tuple[str, List[str]]],
+    max_messages: Optional[int] = None,
+) -> List[dict]:
+    """
+    Add each (field name, lines) section to `base` as one or more fields of at
+    most FIELD_VALUE_LIMIT chars ("Name", "Name (cont.)", ...). When an embed is
+    full, the rest goes to a continuation embed with the same color.
+
+    Returns one embed per message. With `max_messages`, anything past that
+    many is dropped and replaced by an "...and N more" field.
+    """
+    first = copy.deepcopy(base)
+    first.setdefault("fields", [])
+    embeds = [first]
+    line_counts: List[List[int]] = [[0] * len(first["fields"])]  # lines per field, for the overflow note
+
+    for name, lines in sections:
+        for i, chunk in enumerate(pack_lines(lines, FIELD_VALUE_LIMIT)):
+            field = {"name": (name if i == 0 else f"{name} (cont.)")[:FIELD_NAME_LIMIT], "value": chunk, "inline": False}
+            if not _fits(embeds[-1], field):
+                embeds.append({"color": base.get("color"), "fields": []} if "color" in base else {"fields": []})
+                line_counts.append([])
+            embeds[-1]["fields"].append(field)
+            line_counts[-1].append(chunk.count("\n") + 1)
+
+    if max_messages is None or len(embeds) <= max_messages:
+        return embeds
+
+    dropped = sum(sum(counts) for counts in line_counts[max_messages:])
+    embeds = embeds[:max_messages]
+    last, counts = embeds[-1], line_counts[max_messages - 1]
+    while True:
+        note = {"name": "\u200b", "value": f"...and {dropped} more", "inline": False}
+        if _fits(last, note) or not last["fields"]:
+            last["fields"].append(note)
+            return embeds
+        last["fields"].pop()
+        dropped += counts.pop()
+
+
+# ----------------------------
+# Sending
+# ----------------------------
+
+def send_sequence(webhook_url: str, payloads: List[dict], timeout: float = 10) -> Tuple[int, Optional[requests.Response]]:
+    """
+    POST payloads one at a time so they arrive in order, sleeping through 429s.
+    Returns (number accepted, failing response or None). Stops at the first failure.
+    """
+    for sent, payload in enumerate(payloads):
+        for _attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            resp = requests.post(webhook_url, json=payload, timeout=timeout)
+            if resp.status_code != 429:
+                break
+            try:
+                retry_after = float(resp.json().get("retry_after", 1.0))
+            except ValueError:
+                retry_after = float(resp.headers.get("Retry-After", 1.0))
+            time.sleep(retry_after)
+        if resp.status_code >= 400:
+            return sent, resp
+    return len(payloads), None
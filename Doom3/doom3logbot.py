@@ -1,5 +1,7 @@
 import time
 import re
+import os
+import sys
 import requests
 from pathlib import Path
 from datetime import datetime
@@ -9,6 +11,11 @@ import pytz
 LOG_FILE_PATH = r"YOUR_PATH_TO_DOOM3_HERE\d3xp\qconsole.log"
 DISCORD_WEBHOOK_URL = "YOUR_WEBHOOK_URL_HERE"
 
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "doom3"
+
 # Embed Colors
 COLOR_JOIN = 0x00FF00  # Green
 COLOR_DISCONNECT = 0xFF0000  # Red
@@ -29,6 +36,20 @@ DISCONNECT_PATTERN = re.compile(r"^(.+?) disconnected\.$")
 # Define PST timezone
 pst = pytz.timezone('US/Pacific')
 
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def is_invalid_player_name(player_name):
     """Check if the player name is in the invalid player names list."""
     for invalid_name in INVALID_PLAYER_NAMES:
@@ -86,6 +107,7 @@ def monitor_log(file_path):
                         username = match.group(1)
                         if is_invalid_player_name(username):
                             continue
+                        record_event("join", username)
                         send_to_discord(username, "joined the game.", COLOR_JOIN)
                     
                     # Match chat messages and skip invalid player names
@@ -94,6 +116,7 @@ def monitor_log(file_path):
                         if is_invalid_player_name(username):
                             continue
                         if message.strip():  # Ensure there is a message after the colon
+                            record_event("chat", username, message)
                             send_to_discord(username, message, COLOR_CHAT)
                         else:
                             print(f"Empty message detected for user: {username}")
@@ -103,6 +126,7 @@ def monitor_log(file_path):
                         username = match.group(1)
                         if is_invalid_player_name(username):
                             continue
+                        record_event("leave", username)
                         send_to_discord(username, "left the game.", COLOR_DISCONNECT)
 
             last_size = current_size
@@ -110,4 +134,6 @@ def monitor_log(file_path):
         time.sleep(1)
 
 if __name__ == "__main__":
+    if EVENT_STORE_DB:
+        open_event_store()
     monitor_log(LOG_FILE_PATH)
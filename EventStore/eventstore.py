@@ -0,0 +1,221 @@
+"""
+Shared SQLite event history for the log relays.
+
+Relays call EventStore.record() for every event they parse (join, leave,
+chat, ...). Records are buffered in memory and written by a background thread
+with one executemany() per flush, so the log loop never waits on disk. Every
+relay can point at the same file: WAL mode plus a busy timeout lets several
+relay processes write to it at once.
+
+Also a small query tool:
+
+    python eventstore.py events.db who tf2 2026-10-16 [2026-10-17]
+    python eventstore.py events.db player "Some Name" [--limit 50]
+    python eventstore.py events.db tail [server] [--limit 50]
+"""
+import argparse
+import atexit
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+# ----------------------------
+# Config
+# ----------------------------
+
+FLUSH_SECONDS = 2.0    # how often buffered events are written
+FLUSH_MAX_BATCH = 500  # flush early once this many events are buffered
+BUSY_TIMEOUT_MS = 5000  # other relays may hold the write lock briefly
+
+# While the database can't be written (disk full, file locked for longer than
+# the busy timeout) events stay buffered, up to this many; beyond that the
+# oldest ones are dropped so a relay's memory can't grow without bound.
+MAX_PENDING_EVENTS = 50000
+
+# Sessions longer than this are not looked for when working out who was
+# online at a given time; it keeps "who" queries to an index range scan.
+SESSION_LOOKBACK_SECONDS = 24 * 60 * 60
+
+
+# ----------------------------
+# SQLite store
+# ----------------------------
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    server TEXT NOT NULL,
+    type TEXT NOT NULL,
+    player TEXT,
+    detail TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_server_type_ts ON events(server, type, ts);
+CREATE INDEX IF NOT EXISTS idx_events_server_ts ON events(server, ts);
+CREATE INDEX IF NOT EXISTS idx_events_player_ts ON events(player, ts);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+"""
+
+INSERT_SQL = "INSERT INTO events(ts, server, type, player, detail) VALUES(?, ?, ?, ?, ?)"
+
+EventRow = Tuple[float, str, str, Optional[str], Optional[str]]
+
+
+class EventStore:
+    def __init__(self, path: str, flush_thread: bool = True):
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000.0, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.executescript(CREATE_SQL)
+        self.conn.commit()
+
+        self._pending: List[EventRow] = []
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+        if flush_thread:
+            threading.Thread(target=self._flush_loop, daemon=True).start()
+            atexit.register(self.flush)
+
+    def record(self, server: str, event_type: str, player: Optional[str] = None,
+               detail: Optional[str] = None, ts: Optional[float] = None) -> None:
+        """Buffer one event; never touches the database."""
+        row = (ts if ts is not None else time.time(), server, event_type, player, detail)
+        with self._pending_lock:
+            self._pending.append(row)
+            if len(self._pending) >= FLUSH_MAX_BATCH:
+                self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write all buffered events in one transaction. Returns how many were written."""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        with self._db_lock:
+            try:
+                with self.conn:
+                    self.conn.executemany(INSERT_SQL, batch)
+            except sqlite3.Error as exc:
+                with self._pending_lock:
+                    self._pending[:0] = batch
+                    dropped = len(self._pending) - MAX_PENDING_EVENTS
+                    if dropped > 0:
+                        del self._pending[:dropped]
+                    kept = len(self._pending)
+                print(f"[eventstore] flush failed, keeping {kept} events: {exc}")
+                if dropped > 0:
+                    print(f"[eventstore] buffer full, dropped the {dropped} oldest events")
+                return 0
+        return len(batch)
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wakeup.wait(FLUSH_SECONDS)
+            self._wakeup.clear()
+            self.flush()
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+
+    def online_at(self, server: str, ts: float) -> Set[str]:
+        """Players whose latest join/leave before `ts` was a join."""
+        with self._db_lock:
+            rows = self.conn.execute(
+                "SELECT player, type FROM ("
+                "  SELECT player, type, ROW_NUMBER() OVER (PARTITION BY player ORDER BY ts DESC, id DESC) AS n"
+                "  FROM events"
+                "  WHERE server = ? AND type IN ('join', 'leave') AND ts BETWEEN ? AND ? AND player IS NOT NULL"
+                ") WHERE n = 1",
+                (server, ts - SESSION_LOOKBACK_SECONDS, ts),
+            ).fetchall()
+        return {player for player, event_type in rows if event_type == "join"}
+
+    def players_between(self, server: str, start: float, end: float) -> Set[str]:
+        """Everyone on `server` at any point in [start, end)."""
+        players = self.online_at(server, start)
+        with self._db_lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT player FROM events WHERE server = ? AND ts >= ? AND ts < ? AND player IS NOT NULL",
+                (server, start, end),
+            ).fetchall()
+        players.update(row[0] for row in rows)
+        return players
+
+    def player_history(self, player: str, limit: int = 50) -> List[EventRow]:
+        with self._db_lock:
+            return self.conn.execute(
+                "SELECT ts, server, type, player, detail FROM events WHERE player = ? ORDER BY ts DESC LIMIT ?",
+                (player, limit),
+            ).fetchall()
+
+    def recent(self, server: Optional[str] = None, limit: int = 50) -> List[EventRow]:
+        with self._db_lock:
+            if server:
+                return self.conn.execute(
+                    "SELECT ts, server, type, player, detail FROM events WHERE server = ? ORDER BY ts DESC LIMIT ?",
+                    (server, limit),
+                ).fetchall()
+            return self.conn.execute(
+                "SELECT ts, server, type, player, detail FROM events ORDER BY ts DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+
+# ----------------------------
+# Query tool
+# ----------------------------
+
+def _parse_local(text: str) -> float:
+    return datetime.fromisoformat(text).timestamp()
+
+
+def _print_rows(rows: List[EventRow]) -> None:
+    for ts, server, event_type, player, detail in rows:
+        when = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"{when}  {server:<10} {event_type:<8} {player or '':<24} {detail or ''}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the relay event history.")
+    parser.add_argument("db")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    who = sub.add_parser("who", help="who was on a server between two local dates/times")
+    who.add_argument("server")
+    who.add_argument("start", help="e.g. 2026-10-16 or '2026-10-16 20:00'")
+    who.add_argument("end", nargs="?", help="defaults to start + 1 day")
+
+    player = sub.add_parser("player", help="recent events for one player")
+    player.add_argument("name")
+    player.add_argument("--limit", type=int, default=50)
+
+    tail = sub.add_parser("tail", help="most recent events")
+    tail.add_argument("server", nargs="?")
+    tail.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args()
+    store = EventStore(args.db, flush_thread=False)
+
+    started = time.perf_counter()
+    if args.command == "who":
+        start = _parse_local(args.start)
+        end = _parse_local(args.end) if args.end else start + 24 * 60 * 60
+        players = sorted(store.players_between(args.server, start, end), key=str.lower)
+        for name in players:
+            print(name)
+        print(f"[who] {len(players)} player(s) on {args.server}")
+    elif args.command == "player":
+        _print_rows(store.player_history(args.name, args.limit))
+    else:
+        _print_rows(store.recent(args.server, args.limit))
+    print(f"[query] {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
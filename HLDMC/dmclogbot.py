@@ -2,6 +2,7 @@ import os
 import re
 import time
 import glob
+import sys
 import requests
 
 # Discord Webhook URL
@@ -10,6 +11,11 @@ DISCORD_WEBHOOK_URL = "YOUR_WEBHOOK_URL_HERE"  # Replace with your Webhook URL
 # Half-Life Goldsrc Log Directory
 LOG_DIR = "YOUR_PATH_TO_DMC_HERE\\dmc\\logs"  # Replace with your HLDS log directory
 
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "dmc"
+
 # Regex for parsing events
 CHAT_PATTERN = r'L \d+/\d+/\d+ - \d+:\d+:\d+: "(.+)<\d+><STEAM_.+>" say "(.*)"'
 JOIN_PATTERN = r'L \d+/\d+/\d+ - \d+:\d+:\d+: "(.+)<\d+><STEAM_.+>" joined team "(.*)"'
@@ -30,6 +36,23 @@ TEAM_COLORS = {
 last_processed_timestamp = None
 
 
+event_store = None
+
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
+
 def get_most_recent_log():
     """Retrieve the most recent log file in the log directory."""
     log_files = glob.glob(os.path.join(LOG_DIR, '*.log'))
@@ -95,20 +118,26 @@ def process_log(log_file):
 
         if chat_match:
             username, message = chat_match.groups()
+            record_event("chat", username, message)
             send_to_discord(f"**{username}:** {message}", username=username, color=TEAM_COLORS.get("Spectator", "#808080"))
         elif join_match:
             username, team = join_match.groups()
+            record_event("join", username, team)
             send_to_discord(f"**{username}** joined team **{team}**", username="Half-Life Server", color=TEAM_COLORS.get(team, "#FFFFFF"))
         elif leave_match:
             username = leave_match.group(1)
+            record_event("leave", username)
             send_to_discord(f"**{username}** left the game.", username="Half-Life Server", color=TEAM_COLORS.get("Red", "#FF4C4C"))
         elif connect_match:
             username, ip_address = connect_match.groups()
+            record_event("connect", username)
             send_to_discord(f"**{username}** connected from IP **{ip_address}**", username="Half-Life Server", color="#32CD32")
 
 
 if __name__ == "__main__":
     last_processed_timestamp = None
+    if EVENT_STORE_DB:
+        open_event_store()
     while True:
         try:
             recent_log = get_most_recent_log()
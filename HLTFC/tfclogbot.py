@@ -2,6 +2,7 @@ import os
 import re
 import time
 import glob
+import sys
 import requests
 
 # Discord Webhook URL
@@ -10,6 +11,11 @@ DISCORD_WEBHOOK_URL = "YOUR_WEBHOOK_URL_HERE"  # Replace with your Webhook URL
 # Half-Life Goldsrc Log Directory
 LOG_DIR = "YOUR_PATH_TO_TFC_HERE\\goldsrc\\tfc\\logs"  # Replace with your HLDS log directory
 
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "tfc"
+
 # Regex for parsing events
 CHAT_PATTERN = r'L \d+/\d+/\d+ - \d+:\d+:\d+: "(.+)<\d+><STEAM_.+>" say "(.*)"'
 JOIN_PATTERN = r'L \d+/\d+/\d+ - \d+:\d+:\d+: "(.+)<\d+><STEAM_.+>" joined team "(.*)"'
@@ -26,10 +32,63 @@ TEAM_COLORS = {
     "": "#FFFFFF"
 }
 
+# Server status via A2S (the game server's own query port), polled in the
+# background by A2S/a2s.py. Join/leave embeds get an "N/M players on map"
+# footer from its cache (never waiting on the network) and trigger an early
+# re-poll, so the messages after them count that player.
+A2S_ENABLED = False
+A2S_HOST = "127.0.0.1"
+A2S_PORT = 27015
+A2S_POLL_SECONDS = 15
+A2S_TIMEOUT_SEC = 2.0
+
+a2s_poller = None
+
+
+def start_a2s_poller():
+    """Start the background A2S poller (a2s.py next to this script or in ../A2S)."""
+    global a2s_poller
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "A2S"))
+    from a2s import A2SPoller
+    a2s_poller = A2SPoller(A2S_HOST, A2S_PORT, A2S_POLL_SECONDS, A2S_TIMEOUT_SEC)
+    a2s_poller.start()
+    print(f"Polling A2S on {A2S_HOST}:{A2S_PORT} every {A2S_POLL_SECONDS}s")
+
+
+def a2s_status_line(wake=False):
+    """
+    'N/M players on map' from the poller's cache, or None; never waits on the
+    network. With wake, the poller also re-polls shortly, so the messages
+    after this one count the join/leave being reported.
+    """
+    if a2s_poller is None:
+        return None
+    if wake:
+        a2s_poller.wake()
+    return a2s_poller.status_line()
+
+
 # Store the last processed timestamp to avoid reprocessing lines
 last_processed_timestamp = None
 
 
+event_store = None
+
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
+
 def get_most_recent_log():
     """Retrieve the most recent log file in the log directory."""
     log_files = glob.glob(os.path.join(LOG_DIR, '*.log'))
@@ -47,18 +106,17 @@ def delete_old_logs():
                 os.remove(log)
 
 
-def send_to_discord(content, username="Half-Life Server", color="#808080"):
+def send_to_discord(content, username="Half-Life Server", color="#808080", footer=None):
     """Send a message to Discord via the Webhook."""
-    payload = {
-        "embeds": [
-            {
-                "author": {"name": username},
-                "description": content,
-                "color": int(color.lstrip('#'), 16),
-                "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
-            }
-        ]
+    embed = {
+        "author": {"name": username},
+        "description": content,
+        "color": int(color.lstrip('#'), 16),
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
     }
+    if footer:
+        embed["footer"] = {"text": footer}
+    payload = {"embeds": [embed]}
     try:
         response = requests.post(DISCORD_WEBHOOK_URL, json=payload)
         if response.status_code != 204:  # 204 = No Content, Discord's expected response for successful requests
@@ -95,20 +153,28 @@ def process_log(log_file):
 
         if chat_match:
             username, message = chat_match.groups()
+            record_event("chat", username, message)
             send_to_discord(f"**{username}:** {message}", username=username, color=TEAM_COLORS.get("Spectator", "#808080"))
         elif join_match:
             username, team = join_match.groups()
-            send_to_discord(f"**{username}** joined team **{team}**", username="Half-Life Server", color=TEAM_COLORS.get(team, "#FFFFFF"))
+            record_event("join", username, team)
+            send_to_discord(f"**{username}** joined team **{team}**", username="Half-Life Server", color=TEAM_COLORS.get(team, "#FFFFFF"), footer=a2s_status_line(wake=True))
         elif leave_match:
             username = leave_match.group(1)
-            send_to_discord(f"**{username}** left the game.", username="Half-Life Server", color=TEAM_COLORS.get("Red", "#FF4C4C"))
+            record_event("leave", username)
+            send_to_discord(f"**{username}** left the game.", username="Half-Life Server", color=TEAM_COLORS.get("Red", "#FF4C4C"), footer=a2s_status_line(wake=True))
         elif connect_match:
             username, ip_address = connect_match.groups()
-            send_to_discord(f"**{username}** connected from IP **{ip_address}**", username="Half-Life Server", color="#32CD32")
+            record_event("connect", username)
+            send_to_discord(f"**{username}** connected from IP **{ip_address}**", username="Half-Life Server", color="#32CD32", footer=a2s_status_line(wake=True))
 
 
 if __name__ == "__main__":
     last_processed_timestamp = None
+    if EVENT_STORE_DB:
+        open_event_store()
+    if A2S_ENABLED:
+        start_a2s_poller()
     while True:
         try:
             recent_log = get_most_recent_log()
@@ -1,14 +1,27 @@
+import asyncio
 import datetime
+import hashlib
 import logging
+import os
 import socket
 import struct
+import sys
 import threading
 import time
 import random
-import io
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
-import requests
+# Shared message packer (../DiscordLayout/discordlayout.py, or a copy next to this script)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DiscordLayout"))
+from discordlayout import layout_embeds, send_sequence  # noqa: E402
+
+# Shared edit-in-place board (../StatusBoard/statusboard.py, or a copy next to this script)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StatusBoard"))
+from statusboard import StatusBoard  # noqa: E402
+
+# Shared per-server adaptive scheduling (../PollScheduler/pollscheduler.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "PollScheduler"))
+from pollscheduler import FleetScheduler  # noqa: E402
 
 # ============================================================
 # Configuration (edit these)
@@ -23,6 +36,22 @@ HYQUERY_PORT = 5520
 # What you want displayed in the embed for "Server IP:"
 DISPLAY_SERVER_IP = "example.com:5520"
 
+# All servers to watch. Add one entry per Hytale instance; they are all
+# queried together from one UDP socket by a background poller. Each entry:
+#   host, port   - HyQuery address
+#   display      - text shown for "Server IP:" in the embed
+#   bridge_port  - UDP port the GameSpy4 bridge answers on for this server
+#                  (None = no bridge for this one)
+HYQUERY_TARGETS = [
+    {
+        "host": HYQUERY_HOST,
+        "port": HYQUERY_PORT,
+        "display": DISPLAY_SERVER_IP,
+        "bridge_port": 5521,
+    },
+    # Add more servers here as needed...
+]
+
 # Embed appearance
 EMBED_COLOR = 0x808000  # olive green
 
@@ -36,11 +65,47 @@ WEBHOOK_AVATAR_URL = "https://example.com/webhook-avatar.png"
 # Run every N minutes aligned to the clock (15 => :00, :15, :30, :45)
 INTERVAL_MINUTES = 15
 
+# Adaptive scheduling: instead of waiting for the next clock-aligned
+# interval, each target is scheduled on its own: checked every
+# FAST_POLL_SECONDS while players are on (or its player count just changed),
+# then backed off exponentially once it has been empty for
+# FAST_POLL_GRACE_SECONDS, up to MAX_POLL_SECONDS. Each delay gets
+# +/- POLL_JITTER_FRACTION of random jitter so many monitors don't align.
+# Needs STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED, otherwise every
+# fast check would post a full embed.
+ADAPTIVE_SCHEDULE_ENABLED = False
+FAST_POLL_SECONDS = 20
+FAST_POLL_GRACE_SECONDS = 10 * 60
+MAX_POLL_SECONDS = 60 * 60
+POLL_JITTER_FRACTION = 0.1
+
 # Run one check immediately when the script starts
 RUN_ON_STARTUP = True
 
 SOCKET_TIMEOUT_SEC = 3.0
 
+# Unanswered HyQuery requests are re-sent this many times within
+# SOCKET_TIMEOUT_SEC, at evenly spaced, jittered points.
+HYQUERY_RETRIES = 2
+
+# How often the background poller refreshes the per-server caches that the
+# Discord watcher and the bridge read from. Cached data older than
+# HYQUERY_STALE_SECONDS is treated as "server not responding".
+HYQUERY_REFRESH_SECONDS = 10.0
+HYQUERY_STALE_SECONDS = 3 * HYQUERY_REFRESH_SECONDS
+
+# Status board mode: keep one message and edit it in place only when its
+# content changes, instead of posting a new message every interval.
+STATUS_BOARD_ENABLED = False
+STATUS_BOARD_STATE_FILE = "hytalequery_board.json"
+
+# Change detection mode: remember the last snapshot and only send a webhook
+# on meaningful transitions (player joined/left, server went empty). Makes
+# shorter check intervals practical. Can be combined with the status board:
+# the board shows the live state and each change is also posted as its own
+# message.
+CHANGE_DETECTION_ENABLED = False
+
 
 # ============================================================
 # Optional: GameSpy4 / "Minecraft query" UDP bridge
@@ -50,8 +115,8 @@ SOCKET_TIMEOUT_SEC = 3.0
 #   Tools like GameTracker/GameDig can query Minecraft servers using the old
 #   GameSpy4 UDP protocol (0xFE 0xFD handshake + stat). Hytale doesn't speak
 #   this protocol, so this script can optionally expose a *separate* UDP port
-#   (default 5521) that replies in Minecraft's GameSpy4 format using data
-#   pulled from HyQuery.
+#   per server (bridge_port in HYQUERY_TARGETS, default 5521) that replies in
+#   Minecraft's GameSpy4 format using data pulled from HyQuery.
 #
 # Notes:
 #   - This does NOT change how the script queries Hytale (still HyQuery).
@@ -60,12 +125,19 @@ SOCKET_TIMEOUT_SEC = 3.0
 
 BRIDGE_ENABLED = True
 BRIDGE_BIND_HOST = "0.0.0.0"
-BRIDGE_LISTEN_PORT = 5521
 
-# How often to refresh cached HyQuery data for the bridge.
-# (Querying on every inbound UDP packet would also work, but caching makes
-# bursty tool queries cheaper.)
-BRIDGE_REFRESH_SECONDS = 10.0
+# Challenge tokens are derived from a per-process secret, the client address,
+# the session id and the current time window, so nothing is stored per
+# client. A token is accepted during the window it was issued in and the next
+# one. Stat requests with a wrong token are dropped.
+BRIDGE_TOKEN_LIFETIME_SECONDS = 30
+
+# Read up to this many queued packets per event-loop wakeup (like recvmmsg)
+# instead of asyncio's one-per-wakeup. Helps under bursts from scanners and
+# monitoring sites. Needs a selector event loop (Linux/macOS); on Windows'
+# default proactor loop the standard asyncio endpoint is used instead.
+# Set to 0 to always use the standard endpoint.
+BRIDGE_RECV_BATCH = 64
 
 # Values used to make the response look Minecraft-like
 BRIDGE_GAME_TYPE = "SMP"
@@ -91,66 +163,40 @@ RESP_MAGIC = b"HYREPLY\0"  # 8 bytes
 QUERY_TYPE_BASIC = 0x00
 QUERY_TYPE_FULL = 0x01
 
+HYQUERY_FULL_REQUEST = REQ_MAGIC + bytes([QUERY_TYPE_FULL])
 
-class ParseCursor:
-    def __init__(self, start: int = 0) -> None:
-        self.pos = start
 
+# Precompiled little-endian layouts used by parse_hyquery_reply()
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_COUNTS = struct.Struct("<III")  # online, max_players, port
 
-def _read_u16_le(buf: bytes, cur: ParseCursor) -> int:
-    if cur.pos + 2 > len(buf):
-        raise ValueError("Read past end while reading uint16")
-    (value,) = struct.unpack_from("<H", buf, cur.pos)
-    cur.pos += 2
-    return int(value)
-
+UUID_SIZE = 16
 
-def _read_u32_le(buf: bytes, cur: ParseCursor) -> int:
-    if cur.pos + 4 > len(buf):
-        raise ValueError("Read past end while reading uint32")
-    (value,) = struct.unpack_from("<I", buf, cur.pos)
-    cur.pos += 4
-    return int(value)
 
-
-def _read_bytes(buf: bytes, cur: ParseCursor, count: int) -> bytes:
-    if cur.pos + count > len(buf):
+def _read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    """
+    Reads a u16-length-prefixed UTF-8 string at pos; returns (text, new_pos).
+    """
+    if pos + 2 > len(data):
+        raise ValueError("Read past end while reading uint16")
+    (length,) = _U16.unpack_from(data, pos)
+    pos += 2
+    end = pos + length
+    if end > len(data):
         raise ValueError("Read past end while reading bytes")
-    out = buf[cur.pos : cur.pos + count]
-    cur.pos += count
-    return out
-
-
-def _read_string(buf: bytes, cur: ParseCursor) -> str:
-    length = _read_u16_le(buf, cur)
-    if length == 0:
-        return ""
-    data = _read_bytes(buf, cur, length)
-    return data.decode("utf-8", errors="replace")
+    return data[pos:end].decode("utf-8", errors="replace"), end
 
 
-def hyquery_full(
-    host: str,
-    port: int,
-    timeout_sec: float,
-) -> Tuple[str, str, int, int, int, str, List[str]]:
+def parse_hyquery_reply(data: bytes) -> Tuple[str, str, int, int, int, str, List[str]]:
     """
-    Sends a HyQuery FULL query and parses the reply.
+    Parses a HYREPLY packet (BASIC or FULL).
 
     Returns:
       (server_name, motd, online, max_players, port_in_response, version, player_names)
 
-    Notes:
-    - Player list requires HyQuery FULL query (0x01).
-    - If the server doesn't have HyQuery installed/enabled, this will time out or fail.
+    player_names is only filled for FULL (0x01) replies.
     """
-    request = REQ_MAGIC + bytes([QUERY_TYPE_FULL])
-
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-        sock.settimeout(timeout_sec)
-        sock.sendto(request, (host, port))
-        data, _addr = sock.recvfrom(65535)
-
     if len(data) < 9:
         raise ValueError("HyQuery response too short")
 
@@ -161,37 +207,148 @@ def hyquery_full(
     if reply_type not in (QUERY_TYPE_BASIC, QUERY_TYPE_FULL):
         raise ValueError(f"Unknown HyQuery reply type: {reply_type:#x}")
 
-    cur = ParseCursor(start=9)
+    size = len(data)
 
-    server_name = _read_string(data, cur)
-    motd = _read_string(data, cur)
-    online = _read_u32_le(data, cur)
-    max_players = _read_u32_le(data, cur)
-    port_in_resp = _read_u32_le(data, cur)
-    version = _read_string(data, cur)
+    server_name, pos = _read_string(data, 9)
+    motd, pos = _read_string(data, pos)
+    if pos + _COUNTS.size > size:
+        raise ValueError("Read past end while reading uint32")
+    online, max_players, port_in_resp = _COUNTS.unpack_from(data, pos)
+    pos += _COUNTS.size
+    version, pos = _read_string(data, pos)
 
     player_names: List[str] = []
 
     if reply_type == QUERY_TYPE_FULL:
-        player_count = _read_u32_le(data, cur)
+        if pos + 4 > size:
+            raise ValueError("Read past end while reading uint32")
+        (player_count,) = _U32.unpack_from(data, pos)
+        pos += 4
+
+        # Hot loop for large servers: inline the string read and skip the
+        # 16-byte UUID without slicing it. (Decoding a short bytes slice is
+        # cheaper in CPython than decoding through a memoryview.)
+        unpack_u16 = _U16.unpack_from
+        append = player_names.append
         for _ in range(player_count):
-            username = _read_string(data, cur)
-            _uuid_raw = _read_bytes(data, cur, 16)  # ignore or store if desired
-            player_names.append(username)
-
-        # Plugins section exists in FULL replies; advance cursor for correctness
-        plugin_count = _read_u32_le(data, cur)
+            if pos + 2 > size:
+                raise ValueError("Read past end while reading uint16")
+            (length,) = unpack_u16(data, pos)
+            pos += 2
+            end = pos + length
+            if end + UUID_SIZE > size:
+                raise ValueError("Read past end while reading bytes")
+            append(data[pos:end].decode("utf-8", "replace"))
+            pos = end + UUID_SIZE
+
+        # Plugins section exists in FULL replies; walk it for validation
+        if pos + 4 > size:
+            raise ValueError("Read past end while reading uint32")
+        (plugin_count,) = _U32.unpack_from(data, pos)
+        pos += 4
         for _ in range(plugin_count):
-            _plugin_name = _read_string(data, cur)
+            _plugin_name, pos = _read_string(data, pos)
 
     return server_name, motd, online, max_players, port_in_resp, version, player_names
 
 
+class HyQueryClientProtocol(asyncio.DatagramProtocol):
+    """
+    Client side of the poller's single UDP socket. Replies are matched to
+    outstanding requests by source address.
+    """
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.waiters: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        waiter = self.waiters.get(addr[:2])
+        if waiter is None or waiter.done():
+            return
+        try:
+            waiter.set_result(parse_hyquery_reply(data))
+        except ValueError:
+            logging.debug("HyQuery: bad reply from %s:%d", addr[0], addr[1], exc_info=True)
+
+    def error_received(self, exc: Exception) -> None:
+        # e.g. ICMP port unreachable; the request just times out.
+        logging.debug("HyQuery: socket error: %s", exc)
+
+
+async def hyquery_many(
+    protocol: HyQueryClientProtocol,
+    targets: List[Tuple[str, int]],
+    timeout_sec: float,
+    retries: int,
+) -> Dict[Tuple[str, int], Tuple[str, str, int, int, int, str, List[str]]]:
+    """
+    Sends a HyQuery FULL query to every target at once over the protocol's
+    UDP socket and collects the replies.
+
+    Each target is sent the request up to `retries + 1` times, waiting a
+    jittered slice of timeout_sec between attempts. Targets that never answer
+    (or whose hostname doesn't resolve) are missing from the result.
+
+    Targets that resolve to the same address (aliases or duplicates) share
+    one request and each get its reply.
+
+    Returns {(host, port): parse_hyquery_reply() tuple}.
+    """
+    loop = asyncio.get_running_loop()
+    step = timeout_sec / (retries + 1)
+
+    async def resolve(host: str, port: int) -> Optional[Tuple[str, int]]:
+        try:
+            infos = await loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        except OSError:
+            logging.warning("HyQuery: DNS resolution failed for %s", host)
+            return None
+        return infos[0][4][:2]
+
+    async def query_addr(addr: Tuple[str, int]):
+        waiter = loop.create_future()
+        protocol.waiters[addr] = waiter
+        try:
+            for _attempt in range(retries + 1):
+                protocol.transport.sendto(HYQUERY_FULL_REQUEST, addr)
+                try:
+                    return await asyncio.wait_for(asyncio.shield(waiter), step * random.uniform(0.85, 1.15))
+                except asyncio.TimeoutError:
+                    continue
+            return None
+        finally:
+            if protocol.waiters.get(addr) is waiter:
+                del protocol.waiters[addr]
+
+    resolved = await asyncio.gather(*(resolve(host, port) for host, port in targets))
+    by_addr: Dict[Tuple[str, int], List[Tuple[str, int]]] = {}
+    for target, addr in zip(targets, resolved):
+        if addr is not None:
+            by_addr.setdefault(addr, []).append(target)
+
+    replies = await asyncio.gather(*(query_addr(addr) for addr in by_addr))
+    results: Dict[Tuple[str, int], Tuple[str, str, int, int, int, str, List[str]]] = {}
+    for same_server, reply in zip(by_addr.values(), replies):
+        if reply is not None:
+            for target in same_server:
+                results[target] = reply
+    return results
+
+
 # ============================================================
 # GameSpy4 / "Minecraft query" bridge implementation
 # ============================================================
 
-class BridgeCache:
+class TargetCache:
+    """
+    Latest HyQuery result for one server. Written by HyQueryPoller, read by
+    the Discord watcher and the GameSpy4 bridge.
+    """
+
     def __init__(self) -> None:
         self.lock = threading.Lock()
         self.last_ok_utc: float = 0.0
@@ -203,6 +360,11 @@ class BridgeCache:
         self.version: str = ""
         self.player_names: List[str] = []
         self.last_error: str = ""
+        # GameSpy4 basic/full-stat reply bodies (everything after the 5-byte
+        # type/session header), re-rendered by the poller on each refresh.
+        # Replaced wholesale, so the bridge can read them without the lock.
+        self.basicstat_body: bytes = b""
+        self.fullstat_body: bytes = b""
 
 
 def _resolve_ipv4_string(hostname: str) -> str:
@@ -226,20 +388,47 @@ def _parse_display_hostport(display_server_ip: str) -> Tuple[str, int]:
     return display_server_ip.strip(), 0
 
 
-def _write_ascii(out: io.BytesIO, text: str) -> None:
-    out.write(text.encode("utf-8", errors="replace"))
+def build_gamespy_handshake_reply(session_id: bytes, challenge_token: int) -> bytes:
+    # 0x09 + session_id (int32 BE, echoed as-is) + token ASCII + null
+    token_ascii = str(challenge_token).encode("ascii")
+    return b"\x09" + session_id + token_ascii + b"\x00"
 
 
-def _build_gamespy_handshake_reply(session_id: int, challenge_token: int) -> bytes:
-    # 0x09 + session_id (int32 BE) + token ASCII + null
-    token_ascii = str(challenge_token).encode("ascii")
-    return struct.pack(">Bi", 0x09, session_id) + token_ascii + b"\x00"
+def build_gamespy_basicstat_body(
+    motd: str,
+    game_type: str,
+    map_name: str,
+    num_players: int,
+    max_players: int,
+    host_port: int,
+    host_ip: str,
+) -> bytes:
+    """
+    Renders a basic-stat reply without its header: MOTD, gametype, map,
+    numplayers, maxplayers (null-terminated), hostport (u16 LE), hostip.
+    """
+    def cstr(text: str) -> bytes:
+        return text.encode("utf-8", errors="replace") + b"\x00"
+
+    return b"".join(
+        (
+            cstr(motd),
+            cstr(game_type),
+            cstr(map_name),
+            cstr(str(num_players)),
+            cstr(str(max_players)),
+            struct.pack("<H", host_port & 0xFFFF),
+            cstr(host_ip),
+        )
+    )
 
 
-def _build_gamespy_fullstat_reply(
-    session_id: int,
+def build_gamespy_fullstat_body(
     hostname: str,
+    game_type: str,
+    game_id: str,
     version: str,
+    plugins: str,
     map_name: str,
     num_players: int,
     max_players: int,
@@ -247,209 +436,359 @@ def _build_gamespy_fullstat_reply(
     host_ip: str,
     player_names: List[str],
 ) -> bytes:
-    out = io.BytesIO()
-
-    # Header
-    out.write(struct.pack(">Bi", 0x00, session_id))
+    """
+    Renders a full-stat reply without its 0x00 + session id header, so it
+    can be built once per refresh and reused for every request. Also used
+    by QueryGateway for non-Hytale servers.
+    """
+    def enc(text: str) -> bytes:
+        return text.encode("utf-8", errors="replace")
 
     # splitnum\0 0x80 0x00
-    _write_ascii(out, "splitnum")
-    out.write(b"\x00\x80\x00")
+    parts = [b"splitnum\x00\x80\x00"]
 
     # Key/value pairs (ASCII, null-separated)
-    def kv(k: str, v: str) -> None:
-        _write_ascii(out, k)
-        out.write(b"\x00")
-        _write_ascii(out, v)
-        out.write(b"\x00")
-
-    kv("hostname", hostname)
-    kv("gametype", BRIDGE_GAME_TYPE)
-    kv("game_id", BRIDGE_GAME_ID)
-    kv("version", version)
-    kv("plugins", BRIDGE_PLUGINS_STRING)
-    kv("map", map_name)
-    kv("numplayers", str(num_players))
-    kv("maxplayers", str(max_players))
-    kv("hostport", str(host_port))
-    kv("hostip", host_ip)
-
-    # End of key/value section
-    out.write(b"\x00")
-
-    # Player section
-    out.write(b"\x01")
-    _write_ascii(out, "player_")
-    out.write(b"\x00\x00")
-    for name in player_names:
-        _write_ascii(out, name)
-        out.write(b"\x00")
+    for key, value in (
+        ("hostname", hostname),
+        ("gametype", game_type),
+        ("game_id", game_id),
+        ("version", version),
+        ("plugins", plugins),
+        ("map", map_name),
+        ("numplayers", str(num_players)),
+        ("maxplayers", str(max_players)),
+        ("hostport", str(host_port)),
+        ("hostip", host_ip),
+    ):
+        parts.append(enc(key) + b"\x00" + enc(value) + b"\x00")
+
+    # End of key/value section, then player section
+    parts.append(b"\x00\x01player_\x00\x00")
+    parts.extend(enc(name) + b"\x00" for name in player_names)
 
     # Two nulls at the end (matches modern servers)
-    out.write(b"\x00\x00")
-    return out.getvalue()
+    parts.append(b"\x00\x00")
+    return b"".join(parts)
 
 
-class HyQueryPoller(threading.Thread):
-    def __init__(self, cache: BridgeCache) -> None:
-        super().__init__(daemon=True)
-        self.cache = cache
-        self._stop_event = threading.Event()
+def _bridge_host_addr(target: dict) -> Tuple[str, int]:
+    """hostip/hostport advertised by the bridge for this target."""
+    display_host, display_port = _parse_display_hostport(target["display"])
+    host_ip = _resolve_ipv4_string(display_host)
+    host_port = display_port if display_port > 0 else int(target["port"])
+    return host_ip, host_port
 
-    def stop(self) -> None:
-        self._stop_event.set()
 
-    def run(self) -> None:
-        while not self._stop_event.is_set():
-            try:
-                server_name, motd, online, max_players, port_in_resp, version, player_names = hyquery_full(
-                    HYQUERY_HOST,
-                    HYQUERY_PORT,
-                    SOCKET_TIMEOUT_SEC,
-                )
+def render_stat_bodies(cache: TargetCache, host_ip: str, host_port: int) -> None:
+    """
+    Renders the cached data into cache.basicstat_body and cache.fullstat_body.
+    Call with cache.lock held.
+    """
+    hostname = cache.server_name or "Hytale Server"
+    if BRIDGE_OVERRIDE_HOSTNAME_ENABLED:
+        hostname = BRIDGE_OVERRIDE_HOSTNAME
+
+    map_name = BRIDGE_MAP_NAME
+    if BRIDGE_OVERRIDE_MAP_ENABLED:
+        map_name = BRIDGE_OVERRIDE_MAP_NAME
+
+    cache.basicstat_body = build_gamespy_basicstat_body(
+        motd=hostname,
+        game_type=BRIDGE_GAME_TYPE,
+        map_name=map_name,
+        num_players=int(cache.online),
+        max_players=int(cache.max_players),
+        host_port=host_port,
+        host_ip=host_ip,
+    )
+    cache.fullstat_body = build_gamespy_fullstat_body(
+        hostname=hostname,
+        game_type=BRIDGE_GAME_TYPE,
+        game_id=BRIDGE_GAME_ID,
+        version=cache.version or "Hytale",
+        plugins=BRIDGE_PLUGINS_STRING,
+        map_name=map_name,
+        num_players=int(cache.online),
+        max_players=int(cache.max_players),
+        host_port=host_port,
+        host_ip=host_ip,
+        player_names=cache.player_names,
+    )
+
+
+def target_key(target: dict) -> str:
+    return f"{target['host']}:{target['port']}"
+
+
+class GameSpyQueryBridge(asyncio.DatagramProtocol):
+    """
+    GameSpy4 responder for one target, served from the poller's event loop.
 
-                with self.cache.lock:
-                    self.cache.last_ok_utc = time.time()
-                    self.cache.server_name = server_name
-                    self.cache.motd = motd
-                    self.cache.online = online
-                    self.cache.max_players = max_players
-                    self.cache.port_in_resp = port_in_resp
-                    self.cache.version = version
-                    self.cache.player_names = list(player_names)
-                    self.cache.last_error = ""
-            except Exception as e:
-                with self.cache.lock:
-                    self.cache.last_error = str(e)
-            finally:
-                self._stop_event.wait(BRIDGE_REFRESH_SECONDS)
-
-
-class GameSpyQueryBridge(threading.Thread):
-    def __init__(self, cache: BridgeCache) -> None:
-        super().__init__(daemon=True)
+    Replies are built from bodies the poller pre-rendered into the cache, so
+    handling a packet is a token check plus one concatenation.
+    """
+
+    def __init__(self, cache: TargetCache) -> None:
         self.cache = cache
-        self._stop_event = threading.Event()
-        self._sock: Optional[socket.socket] = None
-        self._session_tokens: dict[int, int] = {}
-        self._session_lock = threading.Lock()
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._token_secret = os.urandom(16)
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def _token_for(self, client_ip: str, session_bytes: bytes, window: int) -> int:
+        """
+        Stateless challenge token: keyed BLAKE2s(secret; window|ip|session)
+        folded to a positive int32. Same inputs always give the same token,
+        so there is no table to grow or evict.
+        """
+        msg = window.to_bytes(8, "big") + client_ip.encode("ascii") + session_bytes
+        digest = hashlib.blake2s(msg, key=self._token_secret, digest_size=4).digest()
+        return int.from_bytes(digest, "big") & 0x7FFFFFFF
+
+    def _token_is_valid(self, client_ip: str, session_bytes: bytes, token: int) -> bool:
+        window = int(time.time()) // BRIDGE_TOKEN_LIFETIME_SECONDS
+        return token == self._token_for(client_ip, session_bytes, window) or token == self._token_for(
+            client_ip, session_bytes, window - 1
+        )
 
-    def stop(self) -> None:
-        self._stop_event.set()
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
         try:
-            if self._sock:
-                self._sock.close()
+            # Expect: 0xFE 0xFD <type> <sessionId(4)> ...
+            if len(data) < 7 or data[0] != 0xFE or data[1] != 0xFD:
+                return
+
+            req_type = data[2]
+            session_bytes = data[3:7]
+
+            if req_type == 0x09:
+                window = int(time.time()) // BRIDGE_TOKEN_LIFETIME_SECONDS
+                token = self._token_for(addr[0], session_bytes, window)
+                self.transport.sendto(build_gamespy_handshake_reply(session_bytes, token), addr)
+                return
+
+            if req_type == 0x00:
+                # Stat: <token(4)> for basic, <token(4)> + 4 padding bytes
+                # for full. Anything without a valid token is dropped, so
+                # spoofed sources can't use us as a reflector.
+                if len(data) < 11:
+                    return
+                token = struct.unpack(">i", data[7:11])[0]
+                if not self._token_is_valid(addr[0], session_bytes, token):
+                    return
+
+                # Bodies are pre-rendered by the poller; only the session id
+                # header differs per request.
+                if len(data) >= 15:
+                    body = self.cache.fullstat_body
+                else:
+                    body = self.cache.basicstat_body
+                self.transport.sendto(b"\x00" + session_bytes + body, addr)
+
         except Exception:
+            # Never let a bad packet crash the bridge.
+            logging.debug("Bridge: failed to handle packet", exc_info=True)
+
+    def error_received(self, exc: Exception) -> None:
+        logging.debug("Bridge: socket error: %s", exc)
+
+
+class _BatchedDatagramTransport:
+    """
+    Minimal stand-in for asyncio's datagram transport: reads up to
+    BRIDGE_RECV_BATCH packets per readiness callback and hands each to the
+    protocol. sendto() writes straight to the socket; a full send buffer
+    drops the reply, as UDP would.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, sock: socket.socket, protocol: asyncio.DatagramProtocol) -> None:
+        self._loop = loop
+        self._sock = sock
+        self._protocol = protocol
+        protocol.connection_made(self)  # type: ignore[arg-type]
+        loop.add_reader(sock.fileno(), self._drain)
+
+    def _drain(self) -> None:
+        recvfrom = self._sock.recvfrom
+        handle = self._protocol.datagram_received
+        for _ in range(BRIDGE_RECV_BATCH):
+            try:
+                data, addr = recvfrom(4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                self._protocol.error_received(exc)
+                return
+            handle(data, addr)
+
+    def sendto(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            self._sock.sendto(data, addr)
+        except (BlockingIOError, InterruptedError):
             pass
+        except OSError as exc:
+            self._protocol.error_received(exc)
 
-    def _get_or_create_token(self, session_id: int) -> int:
-        with self._session_lock:
-            token = self._session_tokens.get(session_id)
-            if token is None:
-                token = random.randint(1, 0x7FFFFFFF)
-                self._session_tokens[session_id] = token
-            return token
+    def get_extra_info(self, name: str, default=None):
+        return self._sock if name == "socket" else default
 
-    def run(self) -> None:
+    def close(self) -> None:
+        self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+
+
+async def create_bridge_endpoint(
+    protocol_factory,
+    bind_host: str,
+    port: int,
+):
+    """
+    Binds a UDP endpoint for a bridge protocol, using batched receive when
+    BRIDGE_RECV_BATCH is set and the event loop supports add_reader().
+    Returns (transport, protocol) like loop.create_datagram_endpoint().
+    """
+    loop = asyncio.get_running_loop()
+    if BRIDGE_RECV_BATCH > 0:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         try:
-            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._sock.bind((BRIDGE_BIND_HOST, BRIDGE_LISTEN_PORT))
-            self._sock.settimeout(0.5)
-        except Exception:
-            logging.exception("Bridge: failed to bind UDP/%d", BRIDGE_LISTEN_PORT)
-            return
+            sock.setblocking(False)
+            sock.bind((bind_host, port))
+            protocol = protocol_factory()
+            return _BatchedDatagramTransport(loop, sock, protocol), protocol
+        except NotImplementedError:
+            sock.close()  # proactor loop: no add_reader()
+        except BaseException:
+            sock.close()
+            raise
+    return await loop.create_datagram_endpoint(protocol_factory, local_addr=(bind_host, port))
 
-        logging.info("Bridge: listening for GameSpy4 query on %s:%d", BRIDGE_BIND_HOST, BRIDGE_LISTEN_PORT)
 
-        display_host, display_port = _parse_display_hostport(DISPLAY_SERVER_IP)
-        host_ip = _resolve_ipv4_string(display_host)
-        host_port = display_port if display_port > 0 else HYQUERY_PORT
+class HyQueryPoller(threading.Thread):
+    """
+    Runs one asyncio event loop (in this background thread) that hosts:
+      - the HyQuery client socket, refreshing every target's cache each
+        HYQUERY_REFRESH_SECONDS with all targets queried concurrently, and
+      - one GameSpyQueryBridge endpoint per bridged target (if enabled).
+    """
 
-        while not self._stop_event.is_set():
-            try:
-                data, addr = self._sock.recvfrom(4096)
-            except socket.timeout:
-                continue
-            except OSError:
-                break
+    def __init__(self, targets: List[dict], caches: Dict[str, TargetCache]) -> None:
+        super().__init__(daemon=True)
+        self.targets = targets
+        self.caches = caches
+        self.first_cycle_done = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+        # Bridges answer with placeholder data until the first reply arrives.
+        self.bridge_addrs: Dict[str, Tuple[str, int]] = {}
+        if BRIDGE_ENABLED:
+            for target in targets:
+                if target.get("bridge_port"):
+                    key = target_key(target)
+                    self.bridge_addrs[key] = _bridge_host_addr(target)
+                    cache = caches[key]
+                    with cache.lock:
+                        render_stat_bodies(cache, *self.bridge_addrs[key])
 
-            try:
-                # Expect: 0xFE 0xFD <type> <sessionId(4)> ...
-                if len(data) < 7 or data[0] != 0xFE or data[1] != 0xFD:
-                    continue
+    def stop(self) -> None:
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
 
-                req_type = data[2]
-                session_id = struct.unpack(">i", data[3:7])[0]
+    def run(self) -> None:
+        asyncio.run(self._main())
 
-                if req_type == 0x09:
-                    token = self._get_or_create_token(session_id)
-                    resp = _build_gamespy_handshake_reply(session_id, token)
-                    self._sock.sendto(resp, addr)
-                    continue
+    async def _main(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        transports: List[asyncio.BaseTransport] = []
 
-                if req_type == 0x00:
-                    with self.cache.lock:
-                        hostname = self.cache.server_name or "Hytale Server"
-                        version = self.cache.version or "Hytale"
-                        num_players = int(self.cache.online)
-                        max_players = int(self.cache.max_players)
-                        players = list(self.cache.player_names)
-
-                    # Optional overrides (off by default)
-                    if BRIDGE_OVERRIDE_HOSTNAME_ENABLED:
-                        hostname = BRIDGE_OVERRIDE_HOSTNAME
-
-                    map_name = BRIDGE_MAP_NAME
-                    if BRIDGE_OVERRIDE_MAP_ENABLED:
-                        map_name = BRIDGE_OVERRIDE_MAP_NAME
-
-
-                    resp = _build_gamespy_fullstat_reply(
-                        session_id=session_id,
-                        hostname=hostname,
-                        version=version,
-                        map_name=map_name,
-                        num_players=num_players,
-                        max_players=max_players,
-                        host_port=host_port,
-                        host_ip=host_ip,
-                        player_names=players,
-                    )
-                    self._sock.sendto(resp, addr)
-                    continue
+        for target in self.targets:
+            key = target_key(target)
+            if key not in self.bridge_addrs:
+                continue
+            port = int(target["bridge_port"])
+            try:
+                transport, _protocol = await create_bridge_endpoint(
+                    lambda cache=self.caches[key]: GameSpyQueryBridge(cache),
+                    BRIDGE_BIND_HOST,
+                    port,
+                )
+            except OSError:
+                logging.exception("Bridge: failed to bind UDP/%d", port)
+                continue
+            transports.append(transport)
+            logging.info("Bridge: listening for GameSpy4 query on %s:%d", BRIDGE_BIND_HOST, port)
 
-            except Exception:
-                # Never let a bad packet crash the bridge.
-                logging.debug("Bridge: failed to handle packet", exc_info=True)
+        transport, client = await self._loop.create_datagram_endpoint(
+            HyQueryClientProtocol,
+            family=socket.AF_INET,
+        )
+        transports.append(transport)
 
+        try:
+            while not self._stop_event.is_set():
+                await self._poll_once(client)
+                self.first_cycle_done.set()
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), HYQUERY_REFRESH_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for t in transports:
+                t.close()
+
+    async def _poll_once(self, client: HyQueryClientProtocol) -> None:
+        addrs = [(t["host"], int(t["port"])) for t in self.targets]
+        try:
+            results = await hyquery_many(client, addrs, SOCKET_TIMEOUT_SEC, HYQUERY_RETRIES)
+        except Exception:
+            logging.exception("HyQuery poll failed")
+            results = {}
+
+        now = time.time()
+        for target in self.targets:
+            key = target_key(target)
+            cache = self.caches[key]
+            result = results.get((target["host"], int(target["port"])))
+            with cache.lock:
+                if result is None:
+                    cache.last_error = "no reply"
+                    continue
+                server_name, motd, online, max_players, port_in_resp, version, player_names = result
+                cache.last_ok_utc = now
+                cache.server_name = server_name
+                cache.motd = motd
+                cache.online = online
+                cache.max_players = max_players
+                cache.port_in_resp = port_in_resp
+                cache.version = version
+                cache.player_names = list(player_names)
+                cache.last_error = ""
+                if key in self.bridge_addrs:
+                    render_stat_bodies(cache, *self.bridge_addrs[key])
 
 
 # ============================================================
 # Discord webhook
 # ============================================================
 
-def send_discord_webhook(
-    server_name: str,
+def build_discord_embeds(
+    display: str,
     online: int,
     max_players: int,
     player_names: List[str],
-) -> None:
-    if not DISCORD_WEBHOOK_URL or "WEBHOOK_ID" in DISCORD_WEBHOOK_URL:
-        logging.error("DISCORD_WEBHOOK_URL is not configured.")
-        return
-
-    # Embed field values are limited to 1024 chars
+    changes: Optional[List[str]] = None,
+    max_messages: Optional[int] = None,
+) -> List[dict]:
+    """One embed per message; long change/player lists continue in extra fields and embeds."""
     if player_names:
-        player_lines = "\n".join(f"- {name}" for name in player_names)
+        player_lines = [f"- {name}" for name in player_names]
+    elif online:
+        player_lines = ["(No names returned)"]
     else:
-        player_lines = "(No names returned)"
-
-    if len(player_lines) > 1024:
-        player_lines = player_lines[:1000] + "\n...(truncated)"
+        player_lines = ["(none)"]
 
-    now = datetime.datetime.now(datetime.timezone.utc)
-
-    embed = {
+    base = {
         "color": EMBED_COLOR,
         "author": {
             "name": EMBED_AUTHOR_NAME,
@@ -457,35 +796,116 @@ def send_discord_webhook(
         },
         "description": (
             f"There are {online}/{max_players} online.\n"
-            f"Server IP: `{DISPLAY_SERVER_IP}`"
+            f"Server IP: `{display}`"
         ),
-        "fields": [
-            {
-                "name": "Players",
-                "value": player_lines,
-                "inline": False,
-            }
-        ],
-        "timestamp": now.isoformat(),
+        "fields": [],
     }
+    sections = [("Changes", changes)] if changes else []
+    sections.append(("Players", player_lines))
+    return layout_embeds(base, sections, max_messages=max_messages)
 
-    payload = {
-        # Webhook username = server name
-        "username": server_name,
-        "avatar_url": WEBHOOK_AVATAR_URL,
-        "embeds": [embed],
-    }
+
+def build_discord_embed(
+    display: str,
+    online: int,
+    max_players: int,
+    player_names: List[str],
+) -> dict:
+    """Single-embed form for the status board, which edits exactly one message."""
+    return build_discord_embeds(display, online, max_players, player_names, max_messages=1)[0]
+
+
+def webhook_configured() -> bool:
+    if not DISCORD_WEBHOOK_URL or "WEBHOOK_ID" in DISCORD_WEBHOOK_URL:
+        logging.error("DISCORD_WEBHOOK_URL is not configured.")
+        return False
+    return True
+
+
+def send_discord_webhook(
+    server_name: str,
+    display: str,
+    online: int,
+    max_players: int,
+    player_names: List[str],
+    changes: Optional[List[str]] = None,
+) -> None:
+    if not webhook_configured():
+        return
+
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    payloads = [
+        {
+            # Webhook username = server name
+            "username": server_name,
+            "avatar_url": WEBHOOK_AVATAR_URL,
+            "embeds": [dict(embed, timestamp=timestamp)],
+        }
+        for embed in build_discord_embeds(display, online, max_players, player_names, changes)
+    ]
 
     try:
-        resp = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=10)
-        if resp.status_code >= 400:
-            logging.error("Webhook error %s: %s", resp.status_code, resp.text[:500])
+        sent, failed = send_sequence(DISCORD_WEBHOOK_URL, payloads)
+        if failed is not None:
+            logging.error("Webhook error %s: %s", failed.status_code, failed.text[:500])
         else:
-            logging.info("Webhook sent (%d players).", online)
+            logging.info("Webhook sent (%d players, %d message(s)).", online, sent)
     except Exception:
         logging.exception("Failed to send webhook")
 
 
+# ============================================================
+# Change detection
+# ============================================================
+
+class ChangeDetector:
+    """
+    Keeps the last snapshot per server and reports transitions.
+
+    A snapshot is (online, max_players, sorted player names). The first
+    snapshot after startup only produces a change if players are online.
+    """
+
+    def __init__(self) -> None:
+        self.snapshots: dict[str, Tuple[int, int, Tuple[str, ...]]] = {}
+
+    def update(
+        self,
+        key: str,
+        online: int,
+        max_players: int,
+        player_names: List[str],
+    ) -> List[str]:
+        new = (online, max_players, tuple(sorted(player_names)))
+        old = self.snapshots.get(key)
+        self.snapshots[key] = new
+
+        if old is None:
+            return ["Now monitoring"] if online > 0 else []
+        if old == new:
+            return []
+
+        old_online, _old_max, old_names = old
+        changes: List[str] = []
+
+        remaining = list(old_names)
+        for name in new[2]:
+            if name in remaining:
+                remaining.remove(name)
+            else:
+                changes.append(f"{name} joined")
+        changes.extend(f"{name} left" for name in remaining)
+
+        # Some servers don't return names; fall back to the count.
+        if not changes and old_online != online:
+            changes.append(f"Players: {old_online} -> {online}")
+
+        if old_online > 0 and online == 0:
+            changes.append("Server is now empty")
+
+        return changes
+
+
 # ============================================================
 # Scheduling
 # ============================================================
@@ -513,65 +933,134 @@ def seconds_until_next_interval(interval_minutes: int) -> float:
     return max(0.0, float(delta))
 
 
-def run_check_once() -> None:
-    try:
-        server_name, motd, online, max_players, port_in_resp, version, player_names = hyquery_full(
-            HYQUERY_HOST,
-            HYQUERY_PORT,
-            SOCKET_TIMEOUT_SEC,
-        )
+def run_check_once(
+    caches: Dict[str, TargetCache],
+    board: Optional[StatusBoard] = None,
+    detector: Optional[ChangeDetector] = None,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Optional[int]]:
+    """
+    Check every target (or just the keys in `only`) from the poller's caches
+    and post to Discord as configured. Returns {target key: online count},
+    with None for a target that had no fresh data.
+    """
+    online_by_key: Dict[str, Optional[int]] = {}
+
+    for target in HYQUERY_TARGETS:
+        key = target_key(target)
+        if only is not None and key not in only:
+            continue
+        online_by_key[key] = None
+        cache = caches[key]
+        with cache.lock:
+            last_ok = cache.last_ok_utc
+            last_error = cache.last_error
+            server_name = cache.server_name
+            online = int(cache.online)
+            max_players = int(cache.max_players)
+            version = cache.version
+            player_names = list(cache.player_names)
+
+        if time.time() - last_ok > HYQUERY_STALE_SECONDS:
+            logging.warning("HyQuery %s: no fresh data (%s)", key, last_error or "never answered")
+            continue
 
         logging.info(
-            "HyQuery OK: name=%r online=%d/%d port=%d version=%r players=%d",
+            "HyQuery OK: %s name=%r online=%d/%d version=%r players=%d",
+            key,
             server_name,
             online,
             max_players,
-            port_in_resp,
             version,
             len(player_names),
         )
+        online_by_key[key] = online
+        display = target["display"]
 
-        if online >= 1:
-            send_discord_webhook(server_name, online, max_players, player_names)
-        else:
-            logging.info("0 players online; no webhook sent.")
+        try:
+            if board is not None and webhook_configured():
+                board.update(
+                    key,
+                    build_discord_embed(display, online, max_players, player_names),
+                    username=server_name,
+                    avatar_url=WEBHOOK_AVATAR_URL,
+                    timestamp=True,
+                )
 
-    except Exception:
-        logging.exception("Check failed")
+            if detector is not None:
+                changes = detector.update(key, online, max_players, player_names)
+                if changes:
+                    send_discord_webhook(server_name, display, online, max_players, player_names, changes)
+                else:
+                    logging.info("%s: no changes since last check; no webhook sent.", key)
+            elif board is not None:
+                pass  # The board already shows this server
+            elif online >= 1:
+                send_discord_webhook(server_name, display, online, max_players, player_names)
+            else:
+                logging.info("%s: 0 players online; no webhook sent.", key)
+        except Exception:
+            logging.exception("Check failed for %s", key)
+
+    return online_by_key
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     logging.info("Starting server watcher (runs every %d minutes).", INTERVAL_MINUTES)
 
-    # Start the optional GameSpy4 bridge (separate UDP port) without affecting
-    # the Discord watcher behavior.
-    bridge_cache: Optional[BridgeCache] = None
-    poller: Optional[HyQueryPoller] = None
-    bridge: Optional[GameSpyQueryBridge] = None
-    if BRIDGE_ENABLED:
-        bridge_cache = BridgeCache()
-        poller = HyQueryPoller(bridge_cache)
-        bridge = GameSpyQueryBridge(bridge_cache)
-        poller.start()
-        bridge.start()
+    if ADAPTIVE_SCHEDULE_ENABLED and not (STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED):
+        raise SystemExit(
+            "ADAPTIVE_SCHEDULE_ENABLED needs STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED; "
+            "otherwise a full embed would be posted on every fast check."
+        )
+
+    # One poller feeds per-target caches for both the watcher and the
+    # optional GameSpy4 bridges (one separate UDP port per target), all on
+    # a single background event loop.
+    caches = {target_key(t): TargetCache() for t in HYQUERY_TARGETS}
+    poller = HyQueryPoller(HYQUERY_TARGETS, caches)
+    poller.start()
+
+    board: Optional[StatusBoard] = None
+    if STATUS_BOARD_ENABLED:
+        board = StatusBoard(DISCORD_WEBHOOK_URL, STATUS_BOARD_STATE_FILE)
 
+    detector: Optional[ChangeDetector] = None
+    if CHANGE_DETECTION_ENABLED:
+        detector = ChangeDetector()
+
+    online_by_key: Dict[str, Optional[int]] = {}
     if RUN_ON_STARTUP:
-        run_check_once()
+        poller.first_cycle_done.wait(SOCKET_TIMEOUT_SEC + 1.0)
+        online_by_key = run_check_once(caches, board, detector)
 
     try:
-        while True:
-            sleep_seconds = seconds_until_next_interval(INTERVAL_MINUTES)
-            logging.info("Sleeping %.1f seconds until next check.", sleep_seconds)
-            time.sleep(sleep_seconds)
-            run_check_once()
+        if ADAPTIVE_SCHEDULE_ENABLED:
+            schedule = FleetScheduler(
+                list(caches),
+                fast_seconds=FAST_POLL_SECONDS,
+                grace_seconds=FAST_POLL_GRACE_SECONDS,
+                max_seconds=MAX_POLL_SECONDS,
+                jitter_fraction=POLL_JITTER_FRACTION,
+            )
+            while True:
+                for key, online in online_by_key.items():
+                    schedule.record(key, online)
+                sleep_seconds = schedule.seconds_until_next()
+                logging.info("Sleeping %.1f seconds until next check.", sleep_seconds)
+                time.sleep(sleep_seconds)
+                online_by_key = run_check_once(caches, board, detector, only=schedule.due())
+        else:
+            while True:
+                sleep_seconds = seconds_until_next_interval(INTERVAL_MINUTES)
+                logging.info("Sleeping %.1f seconds until next check.", sleep_seconds)
+                time.sleep(sleep_seconds)
+                run_check_once(caches, board, detector)
     except KeyboardInterrupt:
         logging.info("Stopping...")
     finally:
-        if bridge is not None:
-            bridge.stop()
-        if poller is not None:
-            poller.stop()
+        poller.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+"""
+Micro-benchmark for the HyQuery FULL reply parser in HytaleQuery.py.
+
+Builds a synthetic FULL reply with a large player list and times
+parse_hyquery_reply() against the previous cursor/slice-based parser.
+
+Run from this folder:  python bench_hyquery_parse.py [players] [iterations]
+"""
+import struct
+import sys
+import timeit
+from typing import List, Tuple
+
+from HytaleQuery import QUERY_TYPE_BASIC, QUERY_TYPE_FULL, RESP_MAGIC, parse_hyquery_reply
+
+
+def _string(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    return struct.pack("<H", len(raw)) + raw
+
+
+def build_full_reply(num_players: int) -> bytes:
+    out = bytearray(RESP_MAGIC)
+    out.append(QUERY_TYPE_FULL)
+    out += _string("Benchmark Server")
+    out += _string("Synthetic FULL reply")
+    out += struct.pack("<III", num_players, num_players + 100, 5520)
+    out += _string("2026.01")
+    out += struct.pack("<I", num_players)
+    for i in range(num_players):
+        out += _string(f"Player_{i:04d}_é")
+        out += bytes(range(16))
+    plugins = ["HyQuery", "Essentials", "Permissions"]
+    out += struct.pack("<I", len(plugins))
+    for name in plugins:
+        out += _string(name)
+    return bytes(out)
+
+
+# ------------------------------------------------------------
+# Previous parser, kept here only as the comparison baseline
+# ------------------------------------------------------------
+
+class _LegacyCursor:
+    def __init__(self, start: int = 0) -> None:
+        self.pos = start
+
+
+def _legacy_u16(buf: bytes, cur: _LegacyCursor) -> int:
+    if cur.pos + 2 > len(buf):
+        raise ValueError("Read past end while reading uint16")
+    (value,) = struct.unpack_from("<H", buf, cur.pos)
+    cur.pos += 2
+    return int(value)
+
+
+def _legacy_u32(buf: bytes, cur: _LegacyCursor) -> int:
+    if cur.pos + 4 > len(buf):
+        raise ValueError("Read past end while reading uint32")
+    (value,) = struct.unpack_from("<I", buf, cur.pos)
+    cur.pos += 4
+    return int(value)
+
+
+def _legacy_bytes(buf: bytes, cur: _LegacyCursor, count: int) -> bytes:
+    if cur.pos + count > len(buf):
+        raise ValueError("Read past end while reading bytes")
+    out = buf[cur.pos : cur.pos + count]
+    cur.pos += count
+    return out
+
+
+def _legacy_string(buf: bytes, cur: _LegacyCursor) -> str:
+    length = _legacy_u16(buf, cur)
+    if length == 0:
+        return ""
+    return _legacy_bytes(buf, cur, length).decode("utf-8", errors="replace")
+
+
+def legacy_parse(data: bytes) -> Tuple[str, str, int, int, int, str, List[str]]:
+    reply_type = data[8]
+    cur = _LegacyCursor(start=9)
+    server_name = _legacy_string(data, cur)
+    motd = _legacy_string(data, cur)
+    online = _legacy_u32(data, cur)
+    max_players = _legacy_u32(data, cur)
+    port_in_resp = _legacy_u32(data, cur)
+    version = _legacy_string(data, cur)
+    player_names: List[str] = []
+    if reply_type != QUERY_TYPE_BASIC:
+        for _ in range(_legacy_u32(data, cur)):
+            player_names.append(_legacy_string(data, cur))
+            _legacy_bytes(data, cur, 16)
+        for _ in range(_legacy_u32(data, cur)):
+            _legacy_string(data, cur)
+    return server_name, motd, online, max_players, port_in_resp, version, player_names
+
+
+def main() -> None:
+    num_players = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    data = build_full_reply(num_players)
+    assert parse_hyquery_reply(data) == legacy_parse(data)
+
+    print(f"FULL reply: {num_players} players, {len(data)} bytes, {iterations} iterations")
+    results = {}
+    for label, func in (("legacy", legacy_parse), ("current", parse_hyquery_reply)):
+        best = min(timeit.repeat(lambda: func(data), number=iterations, repeat=5))
+        results[label] = best / iterations
+        print(f"  {label:<11} {results[label] * 1e6:8.1f} us/reply")
+
+    print(f"  speedup     {results['legacy'] / results['current']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Load test for the GameSpy4 bridge in HytaleQuery.py.
+
+Starts the bridge in a child process with synthetic cached data (no Hytale
+server needed), fires full-stat queries at it from one local UDP client at a
+fixed rate, and reports achieved rate, loss, p50/p99 response latency and the
+bridge process's CPU use.
+
+Run from this folder:
+    python loadtest_bridge.py [--rate 50000] [--duration 10] [--players 20]
+
+Note: the client is plain Python too, so at very high rates it can be the
+bottleneck; the "achieved" line shows the rate that was actually offered.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from HytaleQuery import GameSpyQueryBridge, TargetCache, create_bridge_endpoint, render_stat_bodies
+
+SESSION_POOL = 4096
+SOCKET_BUFFER_BYTES = 4 * 1024 * 1024
+
+
+# ------------------------------------------------------------
+# Child process: the bridge under test
+# ------------------------------------------------------------
+
+async def _serve(port: int, players: int) -> None:
+    cache = TargetCache()
+    with cache.lock:
+        cache.server_name = "Load Test"
+        cache.version = "loadtest"
+        cache.online = players
+        cache.max_players = players + 10
+        cache.player_names = [f"Player_{i:04d}" for i in range(players)]
+        render_stat_bodies(cache, "127.0.0.1", 5520)
+
+    loop = asyncio.get_running_loop()
+    transport, _protocol = await create_bridge_endpoint(lambda: GameSpyQueryBridge(cache), "127.0.0.1", port)
+    transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)
+
+    stop = asyncio.Event()
+    threading.Thread(target=lambda: (sys.stdin.readline(), loop.call_soon_threadsafe(stop.set)), daemon=True).start()
+
+    print("ready", flush=True)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    await stop.wait()
+    print(json.dumps({"cpu": time.process_time() - cpu_start, "wall": time.perf_counter() - wall_start}), flush=True)
+    transport.close()
+
+
+# ------------------------------------------------------------
+# Parent process: the load generator
+# ------------------------------------------------------------
+
+def _handshake_tokens(sock: socket.socket, addr) -> list:
+    """Gets a challenge token for every session id in the pool."""
+    tokens = [None] * SESSION_POOL
+    missing = set(range(SESSION_POOL))
+    deadline = time.monotonic() + 5.0
+    while missing and time.monotonic() < deadline:
+        for session in list(missing)[:512]:
+            sock.sendto(b"\xfe\xfd\x09" + struct.pack(">I", session), addr)
+        end = time.monotonic() + 0.05
+        while time.monotonic() < end:
+            try:
+                data = sock.recv(64)
+            except BlockingIOError:
+                time.sleep(0.001)
+                continue
+            session = struct.unpack(">I", data[1:5])[0]
+            if session in missing:
+                tokens[session] = int(data[5:-1])
+                missing.discard(session)
+    if missing:
+        raise SystemExit(f"Handshake failed for {len(missing)} session ids")
+    return tokens
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100.0))
+    return sorted_values[index]
+
+
+def run_load(port: int, rate: int, duration: float) -> dict:
+    addr = ("127.0.0.1", port)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)
+    sock.setblocking(False)
+
+    tokens = _handshake_tokens(sock, addr)
+    requests = [
+        b"\xfe\xfd\x00" + struct.pack(">Ii", session, tokens[session]) + b"\x00" * 4
+        for session in range(SESSION_POOL)
+    ]
+
+    send_times = [0.0] * SESSION_POOL
+    latencies = []
+    interval = 1.0 / rate
+    total = int(rate * duration)
+    sent = 0
+
+    perf = time.perf_counter
+    start = perf()
+    next_send = start
+    end = start + duration
+
+    def drain() -> None:
+        while True:
+            try:
+                data = sock.recv(4096)
+            except (BlockingIOError, ConnectionRefusedError):
+                return
+            session = struct.unpack(">I", data[1:5])[0]
+            sent_at = send_times[session]
+            if sent_at:
+                latencies.append(perf() - sent_at)
+                send_times[session] = 0.0
+
+    while sent < total:
+        now = perf()
+        if now > end + 1.0:
+            break
+        while next_send <= now and sent < total:
+            session = sent % SESSION_POOL
+            try:
+                sock.sendto(requests[session], addr)
+            except BlockingIOError:
+                break
+            send_times[session] = now
+            sent += 1
+            next_send += interval
+        drain()
+
+    send_elapsed = perf() - start
+    grace_end = perf() + 0.5
+    while perf() < grace_end:
+        drain()
+        time.sleep(0.001)
+    sock.close()
+
+    latencies.sort()
+    return {
+        "sent": sent,
+        "received": len(latencies),
+        "achieved_rate": sent / send_elapsed if send_elapsed > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=int, default=50000, help="queries per second to offer")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--players", type=int, default=20, help="players in the synthetic reply")
+    parser.add_argument("--port", type=int, default=25565)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(_serve(args.port, args.players))
+        return
+
+    child = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--port", str(args.port), "--players", str(args.players)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        if child.stdout.readline().strip() != "ready":
+            raise SystemExit("Bridge process failed to start")
+        result = run_load(args.port, args.rate, args.duration)
+        child.stdin.write("stop\n")
+        child.stdin.flush()
+        usage = json.loads(child.stdout.readline())
+    finally:
+        child.stdin.close()
+        child.wait(timeout=5)
+
+    sent = result["sent"]
+    loss = 100.0 * (sent - result["received"]) / sent if sent else 0.0
+    print(f"offered:  {args.rate} q/s for {args.duration:.0f}s ({args.players} players per reply)")
+    print(f"achieved: {result['achieved_rate']:.0f} q/s, {sent} sent, {result['received']} answered ({loss:.1f}% loss)")
+    print(f"latency:  p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms")
+    print(f"bridge:   {usage['cpu']:.2f}s CPU over {usage['wall']:.2f}s ({100.0 * usage['cpu'] / usage['wall']:.0f}% of one core)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import time
 import re
+import os
+import sys
 import requests
 import subprocess
 from pathlib import Path
@@ -19,11 +21,41 @@ RCON_PASSWORD = "rconpassword"
 RCON_ADDRESS = "127.0.0.1"
 RCON_PORT = 27970
 
+# Out-of-band roster via getinfo/getstatus. Catches bots and players who
+# never show up in qconsole.log. getinfo is polled every tick (small reply);
+# the full getstatus is only fetched when the client count changed or the
+# cached roster is older than STATUS_FULL_SECONDS. Off by default: it sends
+# UDP queries to the game server's port.
+STATUS_POLL_ENABLED = False
+STATUS_SERVERS = [(RCON_ADDRESS, RCON_PORT)]
+STATUS_POLL_SECONDS = 3
+STATUS_FULL_SECONDS = 15
+STATUS_TIMEOUT_SEC = 1.0
+
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "jk2"
+
 # Patterns
 JOIN_PATTERN = re.compile(r'broadcast: print "(.*?)\s+\@\@\@PLCONNECT\\n?"')
 DISCONNECT_PATTERN = re.compile(r'broadcast: print "(.*?)\s+\@\@\@DISCONNECTED\\n?"')
 CHAT_PATTERN = re.compile(r'say: (.+?): (.+)')
 
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def load_ignore_list(file_path):
     try:
         with open(file_path, "r", encoding="utf-8") as file:
@@ -70,6 +102,51 @@ def send_rcon_command(password, command, address, port):
     except Exception as e:
         print(f"[RCON ERROR] {e}")
 
+status_poller = None
+
+def start_status_poller():
+    """Start the shared getinfo/getstatus poller (q3query.py next to this script or in ../Q3Query)."""
+    global status_poller
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Q3Query"))
+    from q3query import StatusPoller
+    status_poller = StatusPoller(STATUS_SERVERS, STATUS_POLL_SECONDS, STATUS_FULL_SECONDS, STATUS_TIMEOUT_SEC)
+    status_poller.start()
+    print(f"Polling getstatus on {len(STATUS_SERVERS)} server(s) every {STATUS_POLL_SECONDS}s")
+
+# name -> "log" or "status": who announced the player's join, so the two sources don't double-post
+online_sources = {}
+
+def log_join_is_new(username):
+    """Record a join seen in the log; returns False if the poller already announced it."""
+    announced_by_poller = online_sources.get(username) == "status"
+    online_sources[username] = "log"
+    return not announced_by_poller
+
+def log_leave_is_new(username):
+    """Record a leave seen in the log; returns False if the poller already announced it."""
+    was_online = online_sources.pop(username, None) is not None
+    return was_online or status_poller is None
+
+def dispatch_status_events(ignore_list):
+    """Announce poller roster changes the log hasn't already reported."""
+    if status_poller is None:
+        return
+    while not status_poller.events.empty():
+        kind, username, is_bot = status_poller.events.get_nowait()
+        label = f"{username} (bot)" if is_bot else username
+        if kind == "seed":
+            online_sources.setdefault(username, "status")
+        elif kind == "join" and username not in online_sources:
+            online_sources[username] = "status"
+            if username.lower() not in ignore_list:
+                record_event("join", username, "bot" if is_bot else "status poll")
+                send_to_discord(f"{label} entered the game", COLOR_JOIN)
+        elif kind == "leave" and username in online_sources:
+            del online_sources[username]
+            if username.lower() not in ignore_list:
+                record_event("leave", username, "bot" if is_bot else "status poll")
+                send_to_discord(f"{label} disconnected", COLOR_DISCONNECT)
+
 def monitor_log(file_path, ignore_list):
     file_path = Path(file_path)
     last_size = file_path.stat().st_size
@@ -79,6 +156,7 @@ def monitor_log(file_path, ignore_list):
         if current_size < last_size:
             print("Log file reset detected.")
             last_size = 0
+            online_sources.clear()
 
         if current_size > last_size:
             with file_path.open("r", encoding="utf-8") as file:
@@ -92,7 +170,10 @@ def monitor_log(file_path, ignore_list):
                         raw_username = match.group(1)
                         username = sanitize_text(raw_username)
                         print(f"Detected join: raw='{raw_username}', sanitized='{username}'")
-                        if username.lower() not in ignore_list:
+                        if not log_join_is_new(username):
+                            print(f"Join already announced by status poll: {username}")
+                        elif username.lower() not in ignore_list:
+                            record_event("join", username)
                             send_to_discord(f"{username} joined the game", COLOR_JOIN)
                         else:
                             print(f"Ignored join from: {username}")
@@ -102,7 +183,10 @@ def monitor_log(file_path, ignore_list):
                         raw_username = match.group(1)
                         username = sanitize_text(raw_username)
                         print(f"Detected disconnect: raw='{raw_username}', sanitized='{username}'")
-                        if username.lower() not in ignore_list:
+                        if not log_leave_is_new(username):
+                            print(f"Leave already announced by status poll: {username}")
+                        elif username.lower() not in ignore_list:
+                            record_event("leave", username)
                             send_to_discord(f"{username} disconnected", COLOR_DISCONNECT)
                         else:
                             print(f"Ignored disconnect from: {username}")
@@ -115,6 +199,7 @@ def monitor_log(file_path, ignore_list):
                         print(f"Detected chat: username='{username}', message='{message}'")
 
                         if username.lower() not in ignore_list:
+                            record_event("chat", username, message)
                             send_to_discord(f"{username}: {message}", COLOR_CHAT)
 
                             # Check for !bots <number>
@@ -129,8 +214,13 @@ def monitor_log(file_path, ignore_list):
 
             last_size = current_size
 
+        dispatch_status_events(ignore_list)
         time.sleep(1)
 
 if __name__ == "__main__":
     ignore_list = load_ignore_list(IGNORE_LIST_FILE)
+    if EVENT_STORE_DB:
+        open_event_store()
+    if STATUS_POLL_ENABLED:
+        start_status_poller()
     monitor_log(LOG_FILE_PATH, ignore_list)
@@ -1,4 +1,6 @@
 import re
+import os
+import sys
 import time
 import requests
 from pathlib import Path
@@ -9,6 +11,16 @@ LOG_PATH = Path(r"path_to_\server.log")
 # Discord webhook URL
 WEBHOOK_URL = "your webhook here"
 
+# Local "who's online" endpoint (GET http://127.0.0.1:25580/ returns JSON)
+ROSTER_ENABLED = False
+ROSTER_BIND_HOST = "127.0.0.1"
+ROSTER_PORT = 25580
+
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "mcbeta"
+
 # Color codes
 EMBED_COLORS = {
     "join": 0x00FF00,      # Green
@@ -22,6 +34,31 @@ LEAVE_PATTERN = re.compile(r"\[INFO\] (?P<name>\w+) lost connection: (?P<reason>
 CHAT_PATTERN = re.compile(r"\[INFO\] <(?P<name>\w+)> (?P<message>.+)")
 CMD_PATTERN = re.compile(r"\[INFO\] (?P<name>\w+) issued server command: (?P<servercmd>.+)")
 
+roster = None
+
+def start_roster_server():
+    """Track who's online and serve it on a local HTTP port (roster.py next to this script or in ../Roster)."""
+    global roster
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Roster"))
+    from roster import Roster, serve_roster
+    tracked = Roster()
+    if serve_roster(tracked, ROSTER_BIND_HOST, ROSTER_PORT) is not None:
+        roster = tracked
+
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def get_avatar_url(username):
     return f"https://minotar.net/helm/{username}/64.png"
 
@@ -56,23 +93,35 @@ def parse_log():
         for line in log_lines:
             if match := JOIN_PATTERN.search(line):
                 name = match.group("name")
+                if roster is not None:
+                    roster.join(name)
+                record_event("join", name)
                 send_discord_embed(name, "joined the game", EMBED_COLORS["join"])
 
             elif match := LEAVE_PATTERN.search(line):
                 name = match.group("name")
                 reason = match.group("reason")
+                if roster is not None:
+                    roster.leave(name)
+                record_event("leave", name, reason)
                 send_discord_embed(name, f"left the game ({reason})", EMBED_COLORS["leave"])
 
             elif match := CHAT_PATTERN.search(line):
                 name = match.group("name")
                 message = match.group("message")
+                record_event("chat", name, message)
                 send_discord_embed(name, message, EMBED_COLORS["chat"])
                 
             elif match := CMD_PATTERN.search(line):
                 name = match.group("name")
                 servercmd = match.group("servercmd")
+                record_event("command", name, servercmd)
                 send_discord_embed(name, f"issued server command: ({servercmd})", EMBED_COLORS["chat"])                
 
 if __name__ == "__main__":
+    if EVENT_STORE_DB:
+        open_event_store()
+    if ROSTER_ENABLED:
+        start_roster_server()
     print("Watching log file for events...")
     parse_log()
\ No newline at end of file
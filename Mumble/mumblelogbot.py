@@ -1,5 +1,7 @@
 import time
 import re
+import os
+import sys
 import requests
 from pathlib import Path
 from datetime import datetime
@@ -10,6 +12,11 @@ LOG_FILE_PATH = r"YOUR_PATH_TO_MURMUR_LOGS_HERE\\AppData\\Local\\Mumble\\Murmur\
 DISCORD_WEBHOOK_URL = "YOUR_WEBHOOK_URL_HERE"
 LOCAL_TIMEZONE = timezone("US/Pacific")  # Assume the log timestamps are PST
 
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "mumble"
+
 # Embed Colors
 COLOR_JOIN = 0x00FF00  # Green
 COLOR_DISCONNECT = 0xFF0000  # Red
@@ -28,6 +35,20 @@ AUTHENTICATION_PATTERN = re.compile(r"<\d+:(.+?)\(\d+\)> Authenticated")
 CHANNEL_CHANGE_PATTERN = re.compile(r"<\d+:(.+?)\(\d+\)> Moved .+ to (.+?)\[")
 DISCONNECT_PATTERN = re.compile(r"<\d+:(.+?)\(\d+\)> Connection closed")
 
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def send_to_discord(username, message, color, timestamp):
     """Send a message to Discord with a timestamp."""
     embed = {
@@ -79,22 +100,26 @@ def monitor_log(file_path):
                         if ip in ("BLOCKEDIP", "BLOCKEDIP2"):
                             print(f"Ignored connection from {ip}")
                             continue
+                        record_event("connect")
                         send_to_discord("New Connection", f"IP: {ip}", COLOR_JOIN, timestamp)
 
                     # Match authentications
                     elif match := AUTHENTICATION_PATTERN.search(line):
                         username = match.group(1)
+                        record_event("join", username)
                         send_to_discord(username, "Authenticated", COLOR_CHAT, timestamp)
 
                     # Match channel changes
                     elif match := CHANNEL_CHANGE_PATTERN.search(line):
                         username, channel = match.groups()
                         color = CHANNEL_COLORS.get(channel, COLOR_CHAT)
+                        record_event("channel", username, channel)
                         send_to_discord(username, f"Moved to {channel}", color, timestamp)
 
                     # Match disconnects
                     elif match := DISCONNECT_PATTERN.search(line):
                         username = match.group(1)
+                        record_event("leave", username)
                         send_to_discord(username, "Disconnected", COLOR_DISCONNECT, timestamp)
 
             last_size = current_size
@@ -103,4 +128,6 @@ def monitor_log(file_path):
 
 
 if __name__ == "__main__":
+    if EVENT_STORE_DB:
+        open_event_store()
     monitor_log(LOG_FILE_PATH)
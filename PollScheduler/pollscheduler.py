@@ -0,0 +1,84 @@
+"""
+Adaptive per-server poll scheduling for the server status pollers.
+
+Scripts add ../PollScheduler to sys.path (or copy this file next to them):
+
+    schedule = FleetScheduler(["host:port", ...], fast_seconds=20)
+    while True:
+        time.sleep(schedule.seconds_until_next())
+        for key in schedule.due():
+            schedule.record(key, check(key))  # humans seen, or None on failure
+
+Each server keeps its own delay: it is polled every `fast_seconds` while
+populated (or while its player count keeps changing), and once it has been
+quiet for `grace_seconds` its delay doubles on every check, up to
+`max_seconds`. A busy server therefore never speeds up polling of an empty
+one. Every delay gets +/- `jitter_fraction` of random jitter so many
+monitors don't align.
+"""
+import random
+import time
+from typing import Dict, Hashable, Iterable, List, Optional
+
+
+class AdaptiveScheduler:
+    """Picks the delay before the next check of one server from its recent activity."""
+
+    def __init__(
+        self,
+        fast_seconds: float = 20,
+        grace_seconds: float = 10 * 60,
+        max_seconds: float = 60 * 60,
+        jitter_fraction: float = 0.1,
+    ) -> None:
+        self.fast_seconds = float(fast_seconds)
+        self.grace_seconds = float(grace_seconds)
+        self.max_seconds = float(max_seconds)
+        self.jitter_fraction = jitter_fraction
+        self.interval = self.fast_seconds
+        self.last_humans: Optional[int] = None
+        self.last_active = time.monotonic()
+
+    def next_delay(self, humans: Optional[int]) -> float:
+        """`humans` is the count seen by the check just done, or None if it failed."""
+        now = time.monotonic()
+        active = bool(humans) or humans != self.last_humans
+        self.last_humans = humans
+        if active:
+            self.last_active = now
+
+        if active or now - self.last_active < self.grace_seconds:
+            self.interval = self.fast_seconds
+        else:
+            self.interval = min(self.interval * 2, self.max_seconds)
+
+        jitter = self.interval * self.jitter_fraction
+        return max(1.0, self.interval + random.uniform(-jitter, jitter))
+
+
+class FleetScheduler:
+    """One AdaptiveScheduler per server key, all driven from a single loop."""
+
+    def __init__(self, keys: Iterable[Hashable], **scheduler_options: float) -> None:
+        self.schedulers: Dict[Hashable, AdaptiveScheduler] = {
+            key: AdaptiveScheduler(**scheduler_options) for key in keys
+        }
+        now = time.monotonic()
+        self.next_due: Dict[Hashable, float] = {key: now for key in self.schedulers}
+
+    def due(self) -> List[Hashable]:
+        """Keys whose next check is due now."""
+        now = time.monotonic()
+        return [key for key, at in self.next_due.items() if at <= now]
+
+    def record(self, key: Hashable, humans: Optional[int]) -> float:
+        """Record a check of `key` and schedule its next one. Returns the delay."""
+        delay = self.schedulers[key].next_delay(humans)
+        self.next_due[key] = time.monotonic() + delay
+        return delay
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the earliest server is due (0 if one already is)."""
+        if not self.next_due:
+            return 60.0
+        return max(0.0, min(self.next_due.values()) - time.monotonic())
@@ -0,0 +1,61 @@
+"""
+Local UDP stub that answers Quake 3 getinfo/getstatus like a dedicated server.
+
+Useful for trying the getstatus poller in q3logbot.py (and the QL/JK2 copies)
+without a running game server. The roster is read from a text file on every
+request, one player per line as: score ping name (ping 0 = bot), so you can
+edit the file while the relay is running and watch join/leave events appear.
+
+Run:  python getstatus_stub.py [--port 27960] [--roster stub_roster.txt]
+"""
+import argparse
+import socket
+from pathlib import Path
+
+OOB_HEADER = b"\xff\xff\xff\xff"
+
+
+def load_roster(path):
+    players = []
+    try:
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            parts = line.split(None, 2)
+            if len(parts) == 3:
+                players.append((int(parts[0]), int(parts[1]), parts[2]))
+    except FileNotFoundError:
+        pass
+    return players
+
+
+def build_reply(request, players, map_name):
+    cvars = f"\\sv_hostname\\Stub Server\\mapname\\{map_name}\\sv_maxclients\\16\\clients\\{len(players)}"
+    if request.startswith(b"getstatus"):
+        lines = [f'{score} {ping} "{name}"' for score, ping, name in players]
+        return OOB_HEADER + ("statusResponse\n" + cvars + "\n" + "".join(l + "\n" for l in lines)).encode("latin-1")
+    if request.startswith(b"getinfo"):
+        return OOB_HEADER + ("infoResponse\n" + cvars).encode("latin-1")
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=27960)
+    parser.add_argument("--roster", default="stub_roster.txt")
+    parser.add_argument("--map", default="q3dm17")
+    args = parser.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((args.host, args.port))
+    print(f"getstatus stub on {args.host}:{args.port}, roster from {args.roster}")
+    while True:
+        data, addr = sock.recvfrom(2048)
+        if not data.startswith(OOB_HEADER):
+            continue
+        reply = build_reply(data[4:], load_roster(args.roster), args.map)
+        if reply:
+            sock.sendto(reply, addr)
+
+
+if __name__ == "__main__":
+    main()
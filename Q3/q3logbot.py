@@ -1,7 +1,8 @@
 import time
 import re
+import sys
+import os
 import requests
-import socket
 import subprocess
 from pathlib import Path
 
@@ -20,11 +21,46 @@ RCON_PASSWORD = "rconpassword"  # <- Replace with your actual RCON password
 RCON_ADDRESS = "127.0.0.1"
 RCON_PORT = 27960
 
+# Local "who's online" endpoint (GET http://127.0.0.1:27961/ returns JSON)
+ROSTER_ENABLED = False
+ROSTER_BIND_HOST = "127.0.0.1"
+ROSTER_PORT = 27961
+
+# Out-of-band roster via getinfo/getstatus. Catches bots and players who
+# never show up in qconsole.log. getinfo is polled every tick (small reply);
+# the full getstatus is only fetched when the client count changed or the
+# cached roster is older than STATUS_FULL_SECONDS. Off by default: it sends
+# UDP queries to the game server's port.
+STATUS_POLL_ENABLED = False
+STATUS_SERVERS = [(RCON_ADDRESS, RCON_PORT)]
+STATUS_POLL_SECONDS = 3
+STATUS_FULL_SECONDS = 15
+STATUS_TIMEOUT_SEC = 1.0
+
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "q3"
+
 # Patterns
 JOIN_PATTERN = re.compile(r'broadcast: print "(.+?) entered the game\\n"')
 CHAT_PATTERN = re.compile(r'say: (.+?): (.+)')
 DISCONNECT_PATTERN = re.compile(r'broadcast: print "(.+?) disconnected\\n"')
 
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def load_ignore_list(file_path):
     try:
         with open(file_path, "r", encoding="utf-8") as file:
@@ -38,6 +74,30 @@ def load_ignore_list(file_path):
 def sanitize_name(name):
     return re.sub(r"\^\d", "", name)
 
+# Who's online, keyed by sanitized name (None unless ROSTER_ENABLED)
+roster = None
+
+def start_roster_server():
+    """Track who's online and serve it on a local HTTP port (roster.py next to this script or in ../Roster)."""
+    global roster
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Roster"))
+    from roster import Roster, serve_roster
+    tracked = Roster()
+    if serve_roster(tracked, ROSTER_BIND_HOST, ROSTER_PORT) is not None:
+        roster = tracked
+
+def roster_join(username):
+    if roster is not None:
+        roster.join(username)
+
+def roster_leave(username):
+    if roster is not None:
+        roster.leave(username)
+
+def roster_clear():
+    if roster is not None:
+        roster.clear()
+
 def send_to_discord(message, color):
     embed = {
         "description": message,
@@ -69,6 +129,54 @@ def send_rcon_command(password, command, address, port):
     except Exception as e:
         print(f"[RCON ERROR] {e}")
 
+status_poller = None
+
+def start_status_poller():
+    """Start the shared getinfo/getstatus poller (q3query.py next to this script or in ../Q3Query)."""
+    global status_poller
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Q3Query"))
+    from q3query import StatusPoller
+    status_poller = StatusPoller(STATUS_SERVERS, STATUS_POLL_SECONDS, STATUS_FULL_SECONDS, STATUS_TIMEOUT_SEC)
+    status_poller.start()
+    print(f"Polling getstatus on {len(STATUS_SERVERS)} server(s) every {STATUS_POLL_SECONDS}s")
+
+# name -> "log" or "status": who announced the player's join, so the two sources don't double-post
+online_sources = {}
+
+def log_join_is_new(username):
+    """Record a join seen in the log; returns False if the poller already announced it."""
+    announced_by_poller = online_sources.get(username) == "status"
+    online_sources[username] = "log"
+    return not announced_by_poller
+
+def log_leave_is_new(username):
+    """Record a leave seen in the log; returns False if the poller already announced it."""
+    was_online = online_sources.pop(username, None) is not None
+    return was_online or status_poller is None
+
+def dispatch_status_events(ignore_list):
+    """Announce poller roster changes the log hasn't already reported."""
+    if status_poller is None:
+        return
+    while not status_poller.events.empty():
+        kind, username, is_bot = status_poller.events.get_nowait()
+        label = f"{username} (bot)" if is_bot else username
+        if kind == "seed":
+            online_sources.setdefault(username, "status")
+            roster_join(username)
+        elif kind == "join" and username not in online_sources:
+            online_sources[username] = "status"
+            roster_join(username)
+            if username not in ignore_list:
+                record_event("join", username, "bot" if is_bot else "status poll")
+                send_to_discord(f"{label} entered the game", COLOR_JOIN)
+        elif kind == "leave" and username in online_sources:
+            del online_sources[username]
+            roster_leave(username)
+            if username not in ignore_list:
+                record_event("leave", username, "bot" if is_bot else "status poll")
+                send_to_discord(f"{label} disconnected", COLOR_DISCONNECT)
+
 def monitor_log(file_path, ignore_list):
     file_path = Path(file_path)
     last_size = file_path.stat().st_size
@@ -78,6 +186,8 @@ def monitor_log(file_path, ignore_list):
         if current_size < last_size:
             print("Log file reset detected.")
             last_size = 0
+            roster_clear()
+            online_sources.clear()
 
         if current_size > last_size:
             with file_path.open("r", encoding="utf-8") as file:
@@ -88,13 +198,16 @@ def monitor_log(file_path, ignore_list):
                     # Player join
                     if match := JOIN_PATTERN.search(line):
                         username = sanitize_name(match.group(1))
-                        if username not in ignore_list:
+                        roster_join(username)
+                        if log_join_is_new(username) and username not in ignore_list:
+                            record_event("join", username)
                             send_to_discord(f"{username} entered the game", COLOR_JOIN)
 
                     # Player chat
                     elif match := CHAT_PATTERN.search(line):
                         username, message = map(sanitize_name, match.groups())
                         if username not in ignore_list:
+                            record_event("chat", username, message)
                             send_to_discord(f"{username}: {message}", COLOR_CHAT)
 
                             # --- Check for !bots command ---
@@ -109,13 +222,22 @@ def monitor_log(file_path, ignore_list):
                     # Player disconnect
                     elif match := DISCONNECT_PATTERN.search(line):
                         username = sanitize_name(match.group(1))
-                        if username not in ignore_list:
+                        roster_leave(username)
+                        if log_leave_is_new(username) and username not in ignore_list:
+                            record_event("leave", username)
                             send_to_discord(f"{username} disconnected", COLOR_DISCONNECT)
 
             last_size = current_size
 
+        dispatch_status_events(ignore_list)
         time.sleep(1)
 
 if __name__ == "__main__":
     ignore_list = load_ignore_list(IGNORE_LIST_FILE)
+    if EVENT_STORE_DB:
+        open_event_store()
+    if STATUS_POLL_ENABLED:
+        start_status_poller()
+    if ROSTER_ENABLED:
+        start_roster_server()
     monitor_log(LOG_FILE_PATH, ignore_list)
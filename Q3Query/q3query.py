@@ -0,0 +1,202 @@
+"""
+Shared Quake 3 getinfo/getstatus client for the log relays (Q3, QL, JK2) and
+QueryGateway.
+
+Relays add ../Q3Query to sys.path (or copy this file next to them) and run a
+StatusPoller. It polls getinfo every tick (small reply) and only fetches the
+full getstatus when a server's client count changed or its cached roster is
+older than `full_seconds`. Roster changes are put on `poller.events` as
+(kind, name, is_bot) tuples, kind being "seed" (already on at the first
+poll), "join" or "leave", for the relay's log loop to drain.
+
+Names have ^N colour codes removed, as the relays' sanitize_name() does.
+Bots are reported with a ping of 0 on ioq3-derived servers.
+
+Also a one-shot query tool (try it against Q3/getstatus_stub.py):
+
+    python q3query.py 127.0.0.1 27960
+"""
+import argparse
+import queue
+import re
+import select
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+OOB_HEADER = b"\xff\xff\xff\xff"
+GETINFO_REQUEST = OOB_HEADER + b"getinfo poll\n"
+GETSTATUS_REQUEST = OOB_HEADER + b"getstatus\n"
+INFO_PREFIX = OOB_HEADER + b"infoResponse"
+STATUS_PREFIX = OOB_HEADER + b"statusResponse"
+
+# A host that fails to resolve is looked up again after this long
+RESOLVE_RETRY_SECONDS = 60
+
+STATUS_PLAYER_PATTERN = re.compile(r'^(-?\d+) (-?\d+) "(.*)"$')
+COLOR_PATTERN = re.compile(r"\^\d")
+
+Addr = Tuple[str, int]
+Player = Dict[str, object]  # {"name": str, "score": int, "ping": int}
+
+
+# ----------------------------
+# Packets
+# ----------------------------
+
+def parse_infostring(text: str) -> Dict[str, str]:
+    fields = text.split("\\")[1:]
+    return dict(zip(fields[0::2], fields[1::2]))
+
+
+def parse_oob_response(data: bytes) -> Tuple[Dict[str, str], List[Player]]:
+    """Split an infoResponse/statusResponse into (cvars, players)."""
+    lines = data[4:].decode("latin-1").split("\n")
+    cvars = parse_infostring(lines[1]) if len(lines) > 1 else {}
+    players = []
+    for line in lines[2:]:
+        if match := STATUS_PLAYER_PATTERN.match(line):
+            score, ping, name = match.groups()
+            players.append({"name": COLOR_PATTERN.sub("", name).strip(), "score": int(score), "ping": int(ping)})
+    return cvars, players
+
+
+def query_many(servers: Sequence[Addr], request: bytes, reply_prefix: bytes, timeout_sec: float = 1.0) -> Dict[Addr, bytes]:
+    """
+    Send `request` to every (numeric) address from one socket and collect
+    replies until the timeout; silent servers get it once more halfway through.
+    """
+    replies: Dict[Addr, bytes] = {}
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        for addr in servers:
+            sock.sendto(request, addr)
+        deadline = time.monotonic() + timeout_sec
+        resend_at: Optional[float] = time.monotonic() + timeout_sec / 2
+        while len(replies) < len(servers):
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if resend_at and now >= resend_at:
+                for addr in servers:
+                    if addr not in replies:
+                        sock.sendto(request, addr)
+                resend_at = None
+            ready, _, _ = select.select([sock], [], [], min(deadline, resend_at or deadline) - now)
+            if not ready:
+                continue
+            try:
+                data, addr = sock.recvfrom(65535)
+            except OSError:
+                continue  # ICMP port unreachable from one server
+            if addr in servers and data.startswith(reply_prefix):
+                replies[addr] = data
+    return replies
+
+
+def diff_rosters(old_players: List[Player], new_players: List[Player]) -> List[Tuple[str, str, bool]]:
+    """Return [(kind, name, is_bot)] for players who appeared/disappeared between two polls."""
+    old = {p["name"]: p for p in old_players}
+    new = {p["name"]: p for p in new_players}
+    events = [("join", name, p["ping"] == 0) for name, p in new.items() if name not in old]
+    events += [("leave", name, p["ping"] == 0) for name, p in old.items() if name not in new]
+    return events
+
+
+# ----------------------------
+# Background poller
+# ----------------------------
+
+class StatusPoller:
+    def __init__(self, servers: Sequence[Tuple[str, int]], poll_seconds: float = 3,
+                 full_seconds: float = 15, timeout_sec: float = 1.0):
+        self.servers = list(servers)
+        self.poll_seconds = poll_seconds
+        self.full_seconds = full_seconds
+        self.timeout_sec = timeout_sec
+
+        # addr -> {"cvars": {...}, "players": [{"name", "score", "ping"}], "updated": ts}
+        self.cache: Dict[Addr, dict] = {}
+        self.events: "queue.Queue[Tuple[str, str, bool]]" = queue.Queue()
+        self._addrs: Dict[Tuple[str, int], Addr] = {}
+        self._resolve_after: Dict[Tuple[str, int], float] = {}
+
+    def start(self) -> None:
+        threading.Thread(target=self._poll_loop, daemon=True).start()
+
+    def resolve(self) -> List[Addr]:
+        """
+        Numeric addresses of the servers resolved so far. Hosts that fail to
+        resolve are skipped and tried again after RESOLVE_RETRY_SECONDS.
+        """
+        now = time.monotonic()
+        for host, port in self.servers:
+            if (host, port) in self._addrs or now < self._resolve_after.get((host, port), 0.0):
+                continue
+            try:
+                self._addrs[(host, port)] = (socket.gethostbyname(host), port)
+            except OSError as e:
+                self._resolve_after[(host, port)] = now + RESOLVE_RETRY_SECONDS
+                print(f"[STATUS ERROR] Could not resolve {host}: {e}")
+        return list(dict.fromkeys(self._addrs.values()))
+
+    def poll_once(self, addrs: Sequence[Addr]) -> None:
+        """One getinfo fan-out, then getstatus only for servers whose roster may have changed."""
+        if not addrs:
+            return
+        now = time.time()
+        infos = query_many(addrs, GETINFO_REQUEST, INFO_PREFIX, self.timeout_sec)
+        stale = []
+        for addr, data in infos.items():
+            cvars, _ = parse_oob_response(data)
+            cached = self.cache.get(addr)
+            if (
+                cached is None
+                or now - cached["updated"] >= self.full_seconds
+                or cvars.get("clients") != str(len(cached["players"]))
+            ):
+                stale.append(addr)
+
+        if not stale:
+            return
+        for addr, data in query_many(stale, GETSTATUS_REQUEST, STATUS_PREFIX, self.timeout_sec).items():
+            cvars, players = parse_oob_response(data)
+            previous = self.cache.get(addr)
+            self.cache[addr] = {"cvars": cvars, "players": players, "updated": now}
+            if previous is None:  # First poll: record who's already on, without announcing
+                events = [("seed", p["name"], p["ping"] == 0) for p in players]
+            else:
+                events = diff_rosters(previous["players"], players)
+            for event in events:
+                self.events.put(event)
+
+    def _poll_loop(self) -> None:
+        while True:
+            try:
+                self.poll_once(self.resolve())
+            except Exception as e:
+                print(f"[STATUS ERROR] {e}")
+            time.sleep(self.poll_seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query a Quake 3 engine server with getstatus.")
+    parser.add_argument("host")
+    parser.add_argument("port", type=int, nargs="?", default=27960)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    addr = (socket.gethostbyname(args.host), args.port)
+    reply = query_many([addr], GETSTATUS_REQUEST, STATUS_PREFIX, args.timeout).get(addr)
+    if reply is None:
+        raise SystemExit(f"No statusResponse from {args.host}:{args.port}")
+    cvars, players = parse_oob_response(reply)
+    print(f"{COLOR_PATTERN.sub('', cvars.get('sv_hostname', ''))} on {cvars.get('mapname', '?')}, "
+          f"{len(players)}/{cvars.get('sv_maxclients', '?')} clients")
+    for player in players:
+        print(f"  {player['score']:>4} {player['ping']:>4}  {player['name']}{'  (bot)' if player['ping'] == 0 else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import time
 import re
+import os
+import sys
 import requests
 from pathlib import Path
 
@@ -13,11 +15,41 @@ COLOR_JOIN = 0x00FF00  # Green
 COLOR_DISCONNECT = 0xFF0000  # Red
 COLOR_CHAT = 0xFFFFFF  # White
 
+# Out-of-band roster via getinfo/getstatus. Catches bots and players who
+# never show up in qconsole.log. getinfo is polled every tick (small reply);
+# the full getstatus is only fetched when the client count changed or the
+# cached roster is older than STATUS_FULL_SECONDS. Off by default: it sends
+# UDP queries to the game server's port.
+STATUS_POLL_ENABLED = False
+STATUS_SERVERS = [("127.0.0.1", 27960)]
+STATUS_POLL_SECONDS = 3
+STATUS_FULL_SECONDS = 15
+STATUS_TIMEOUT_SEC = 1.0
+
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "ql"
+
 # Patterns
 STEAM_ID_PATTERN = re.compile(r"(.+?) connected with Steam ID (\d+)")
 CHAT_PATTERN = re.compile(r"(.+?)\^7: (.+)")
 DISCONNECT_PATTERN = re.compile(r'broadcast: print "(.+?) disconnected\\n"')
 
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def load_ignore_list(file_path):
     """Load names to ignore from a text file."""
     try:
@@ -48,6 +80,51 @@ def send_to_discord(message, color, username=None):
     else:
         print(f"Failed to send message: {response.status_code}, {response.text}")
 
+status_poller = None
+
+def start_status_poller():
+    """Start the shared getinfo/getstatus poller (q3query.py next to this script or in ../Q3Query)."""
+    global status_poller
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Q3Query"))
+    from q3query import StatusPoller
+    status_poller = StatusPoller(STATUS_SERVERS, STATUS_POLL_SECONDS, STATUS_FULL_SECONDS, STATUS_TIMEOUT_SEC)
+    status_poller.start()
+    print(f"Polling getstatus on {len(STATUS_SERVERS)} server(s) every {STATUS_POLL_SECONDS}s")
+
+# name -> "log" or "status": who announced the player's join, so the two sources don't double-post
+online_sources = {}
+
+def log_join_is_new(username):
+    """Record a join seen in the log; returns False if the poller already announced it."""
+    announced_by_poller = online_sources.get(username) == "status"
+    online_sources[username] = "log"
+    return not announced_by_poller
+
+def log_leave_is_new(username):
+    """Record a leave seen in the log; returns False if the poller already announced it."""
+    was_online = online_sources.pop(username, None) is not None
+    return was_online or status_poller is None
+
+def dispatch_status_events(ignore_list):
+    """Announce poller roster changes the log hasn't already reported."""
+    if status_poller is None:
+        return
+    while not status_poller.events.empty():
+        kind, username, is_bot = status_poller.events.get_nowait()
+        label = f"{username} (bot)" if is_bot else username
+        if kind == "seed":
+            online_sources.setdefault(username, "status")
+        elif kind == "join" and username not in online_sources:
+            online_sources[username] = "status"
+            if username.lower() not in ignore_list:
+                record_event("join", username, "bot" if is_bot else "status poll")
+                send_to_discord(f"{label} entered the game", COLOR_JOIN)
+        elif kind == "leave" and username in online_sources:
+            del online_sources[username]
+            if username.lower() not in ignore_list:
+                record_event("leave", username, "bot" if is_bot else "status poll")
+                send_to_discord(f"{label} disconnected", COLOR_DISCONNECT)
+
 def monitor_log(file_path, ignore_list):
     """Monitor the log file for relevant events."""
     file_path = Path(file_path)
@@ -58,6 +135,7 @@ def monitor_log(file_path, ignore_list):
         if current_size < last_size:  # Log file reset
             print("Log file reset detected.")
             last_size = 0
+            online_sources.clear()
 
         if current_size > last_size:
             with file_path.open("r", encoding="utf-8") as file:
@@ -69,7 +147,8 @@ def monitor_log(file_path, ignore_list):
                     if match := STEAM_ID_PATTERN.search(line):
                         username, steam_id = match.groups()
                         username = sanitize_text(username)
-                        if username.lower() not in ignore_list:
+                        if log_join_is_new(username) and username.lower() not in ignore_list:
+                            record_event("join", username, steam_id)
                             send_to_discord(
                                 f"{line}",
                                 COLOR_JOIN
@@ -81,6 +160,7 @@ def monitor_log(file_path, ignore_list):
                         username = sanitize_text(username)
                         message = sanitize_text(message)
                         if username.lower() not in ignore_list:
+                            record_event("chat", username, message)
                             send_to_discord(
                                 message,
                                 COLOR_CHAT,
@@ -90,7 +170,8 @@ def monitor_log(file_path, ignore_list):
                     # Player disconnects (explicit pattern match)
                     elif match := DISCONNECT_PATTERN.search(line):
                         username = sanitize_text(match.group(1))
-                        if username.lower() not in ignore_list:
+                        if log_leave_is_new(username) and username.lower() not in ignore_list:
+                            record_event("leave", username)
                             send_to_discord(
                                 f"{username} disconnected",
                                 COLOR_DISCONNECT
@@ -98,8 +179,13 @@ def monitor_log(file_path, ignore_list):
 
             last_size = current_size
 
+        dispatch_status_events(ignore_list)
         time.sleep(1)
 
 if __name__ == "__main__":
     ignore_list = load_ignore_list(IGNORE_LIST_FILE)
+    if EVENT_STORE_DB:
+        open_event_store()
+    if STATUS_POLL_ENABLED:
+        start_status_poller()
     monitor_log(LOG_FILE_PATH, ignore_list)
@@ -0,0 +1,677 @@
+"""
+Multi-protocol game server query gateway.
+
+Polls a fleet of game servers once per refresh through pluggable backends
+(HyQuery, Zandronum via doomlist, Chocolate Doom, Quake 3 getstatus, A2S)
+into one shared cache, pre-renders every reply, and answers monitoring tools
+through pluggable front ends:
+
+  - GameSpy4 / "Minecraft query" on a per-server UDP port
+  - A2S_INFO on a per-server UDP port
+  - JSON over HTTP for the whole fleet (GET /) or one server (GET /<name>)
+
+Serving a query never touches the game server; it only copies a pre-rendered
+reply out of the cache.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import socket
+import struct
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+# Protocol parsers and reply renderers are shared with the per-game scripts:
+# ../A2S/a2s.py, ../Q3Query/q3query.py, ../Hytale/HytaleQuery.py and
+# ../ChocolateDoom/chocdoom_status.py.
+for _shared_dir in ("A2S", "Q3Query", "Hytale", "ChocolateDoom"):
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", _shared_dir))
+import a2s  # noqa: E402
+import chocdoom_status  # noqa: E402
+import HytaleQuery  # noqa: E402
+import q3query  # noqa: E402
+
+# ============================================================
+# Configuration (edit these)
+# ============================================================
+
+# Servers to poll. Each entry:
+#   name          - short unique name (also the HTTP path: GET /<name>)
+#   backend       - one of BACKENDS below
+#   host, port    - address of the game server's query port
+#   gamespy_port  - (optional) UDP port to answer GameSpy4 queries for it
+#   a2s_port      - (optional) UDP port to answer A2S_INFO queries for it
+GATEWAY_SERVERS = [
+    {
+        "name": "hytale",
+        "backend": "hyquery",
+        "host": "example.com",
+        "port": 5520,
+        "gamespy_port": 5521,
+    },
+    {
+        "name": "doom",
+        "backend": "zandronum",
+        "host": "example.doomserver.net",
+        "port": 10666,
+    },
+    {
+        "name": "chocdoom",
+        "backend": "chocdoom",
+        "host": "example.doomserver.net",
+        "port": 2342,
+    },
+    {
+        "name": "q3",
+        "backend": "quake3",
+        "host": "127.0.0.1",
+        "port": 27960,
+        "a2s_port": 27961,
+    },
+    {
+        "name": "tf2",
+        "backend": "a2s",
+        "host": "127.0.0.1",
+        "port": 27015,
+        "gamespy_port": 27016,
+    },
+    # Add more servers here as needed...
+]
+
+# How often every backend is polled
+REFRESH_SECONDS = 10.0
+
+# After this many failed polls in a row a server is reported offline: its
+# player list is cleared, the JSON shows "online": false and the UDP front
+# ends stop answering for it (as the real server wouldn't).
+OFFLINE_AFTER_FAILURES = 3
+
+# Per-query timeout; unanswered UDP requests are re-sent QUERY_RETRIES times
+QUERY_TIMEOUT_SEC = 3.0
+QUERY_RETRIES = 2
+
+# Front-end bind addresses
+BIND_HOST = "0.0.0.0"
+HTTP_ENABLED = True
+HTTP_BIND_HOST = "127.0.0.1"
+HTTP_PORT = 8080
+
+# Challenge tokens for GameSpy4/A2S front ends are valid for the window they
+# were issued in and the next one.
+TOKEN_LIFETIME_SECONDS = 30
+
+# doomlist API endpoint used by the Zandronum backend
+DOOMLIST_API_URL = "https://doomlist.net/api/full"
+
+
+# ============================================================
+# Shared cache model
+# ============================================================
+
+@dataclass
+class ServerStatus:
+    """Normalized result of one backend query."""
+    name: str = ""
+    map: str = ""
+    game: str = ""
+    version: str = ""
+    num_players: int = 0
+    max_players: int = 0
+    bots: int = 0
+    players: List[str] = field(default_factory=list)
+    online: bool = False
+    ok_utc: float = 0.0
+    error: str = ""
+
+
+class CacheEntry:
+    """
+    Latest status for one configured server plus its pre-rendered replies.
+    Every attribute is replaced wholesale by the poller, so front ends read
+    them without locking (the gateway runs on a single event loop anyway).
+    """
+
+    def __init__(self, server: dict) -> None:
+        self.server = server
+        self.status = ServerStatus(name=server["name"], error="not polled yet")
+        self.failures = 0  # failed polls since the last good one
+        self.rendered: Dict[str, bytes] = {}
+
+
+# ============================================================
+# UDP client helper
+# ============================================================
+
+class _UdpClientProtocol(asyncio.DatagramProtocol):
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.queue.put_nowait(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logging.debug("UDP client error: %s", exc)
+
+
+class UdpExchange:
+    """
+    One connected UDP socket for a request/response exchange. Usage:
+
+        async with UdpExchange(host, port) as udp:
+            reply = await udp.request(payload, accept=lambda d: d[:4] == b"...")
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._protocol: Optional[_UdpClientProtocol] = None
+
+    async def __aenter__(self) -> "UdpExchange":
+        loop = asyncio.get_running_loop()
+        self._transport, self._protocol = await loop.create_datagram_endpoint(
+            _UdpClientProtocol,
+            remote_addr=(self.host, self.port),
+            family=socket.AF_INET,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    async def request(
+        self,
+        payload: bytes,
+        accept: Callable[[bytes], bool] = lambda data: True,
+        timeout_sec: float = QUERY_TIMEOUT_SEC,
+        retries: int = QUERY_RETRIES,
+    ) -> bytes:
+        """
+        Sends payload and returns the first reply `accept` agrees with,
+        re-sending up to `retries` times within timeout_sec.
+        """
+        step = timeout_sec / (retries + 1)
+        for _attempt in range(retries + 1):
+            self._transport.sendto(payload)
+            deadline = time.monotonic() + step * random.uniform(0.85, 1.15)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    data = await asyncio.wait_for(self._protocol.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if accept(data):
+                    return data
+        raise TimeoutError(f"No reply from {self.host}:{self.port}")
+
+
+# ============================================================
+# Backends
+# ============================================================
+#
+# A backend is `async def backend(server, ctx) -> ServerStatus`. Register new
+# ones in BACKENDS. `ctx` is shared by every backend within one refresh, for
+# things worth fetching only once per cycle (e.g. the doomlist JSON).
+
+class PollContext:
+    def __init__(self) -> None:
+        self._doomlist: Optional[asyncio.Task] = None
+
+    def doomlist(self) -> asyncio.Task:
+        if self._doomlist is None:
+            loop = asyncio.get_running_loop()
+            self._doomlist = asyncio.ensure_future(loop.run_in_executor(None, _fetch_doomlist))
+        return self._doomlist
+
+
+# --- HyQuery (Hytale) ---
+
+async def query_hyquery(server: dict, ctx: PollContext) -> ServerStatus:
+    async with UdpExchange(server["host"], int(server["port"])) as udp:
+        reply = await udp.request(HytaleQuery.HYQUERY_FULL_REQUEST, accept=lambda d: d[:8] == HytaleQuery.RESP_MAGIC)
+    name, _motd, online, max_players, _port, version, players = HytaleQuery.parse_hyquery_reply(reply)
+    return ServerStatus(
+        name=name,
+        game="Hytale",
+        version=version,
+        num_players=online,
+        max_players=max_players,
+        players=players,
+    )
+
+
+# --- Zandronum (via doomlist) ---
+#
+# Zandronum's own launcher protocol is Huffman-compressed; doomlist already
+# polls every public server, so one JSON fetch per refresh covers the fleet.
+
+def _fetch_doomlist() -> Dict[str, Any]:
+    response = requests.get(DOOMLIST_API_URL, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data, dict):
+        raise ValueError("Unexpected doomlist API format (expected JSON object)")
+    return data
+
+
+async def query_zandronum(server: dict, ctx: PollContext) -> ServerStatus:
+    # Shielded: a timeout on this server must not cancel the fetch every
+    # other Zandronum server in this refresh is waiting on.
+    doomlist = await asyncio.shield(ctx.doomlist())
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(server["host"], None, family=socket.AF_INET)
+    ip = infos[0][4][0]
+    port = int(server["port"])
+
+    info = doomlist.get(f"{ip}:{port}")
+    if info is None:
+        for candidate in doomlist.values():
+            try:
+                if candidate.get("addr") == ip and int(candidate.get("port")) == port:
+                    info = candidate
+                    break
+            except Exception:
+                continue
+    if info is None:
+        raise LookupError("Server not listed on doomlist")
+
+    humans: List[str] = []
+    bots = 0
+    for player in info.get("playerdata") or []:
+        if player.get("bot"):
+            bots += 1
+        else:
+            humans.append(player.get("plain-name") or player.get("name") or "Unknown")
+
+    num_players = len(humans) if info.get("playerdata") else int(info.get("numplayers") or 0)
+    return ServerStatus(
+        name=info.get("hostname") or info.get("name") or server["name"],
+        map=info.get("mapname", ""),
+        game=info.get("gamename", "Zandronum"),
+        version=str(info.get("version", "")),
+        num_players=num_players,
+        max_players=int(info.get("maxplayers") or info.get("maxclients") or 0),
+        bots=bots,
+        players=humans,
+    )
+
+
+# --- Chocolate Doom ---
+
+CHOCDOOM_QUERY = struct.pack(">H", chocdoom_status.NET_PACKET_TYPE_QUERY)
+CHOCDOOM_QUERY_RESPONSE = struct.pack(">H", chocdoom_status.NET_PACKET_TYPE_QUERY_RESPONSE)
+
+
+async def query_chocdoom(server: dict, ctx: PollContext) -> ServerStatus:
+    async with UdpExchange(server["host"], int(server["port"])) as udp:
+        reply = await udp.request(CHOCDOOM_QUERY, accept=lambda d: d[:2] == CHOCDOOM_QUERY_RESPONSE)
+    info = chocdoom_status.parse_query_response(reply)
+    return ServerStatus(
+        name=info["description"],
+        map="(game running)" if info["inProgress"] else "(lobby)",
+        game=info["game"] or "",
+        version=info["version"],
+        num_players=info["players"],
+        max_players=info["maxPlayers"],
+    )
+
+
+# --- Quake 3 getstatus (Q3/QL/JK2/ioq3 family) ---
+
+async def query_quake3(server: dict, ctx: PollContext) -> ServerStatus:
+    async with UdpExchange(server["host"], int(server["port"])) as udp:
+        reply = await udp.request(q3query.GETSTATUS_REQUEST, accept=lambda d: d.startswith(q3query.STATUS_PREFIX))
+    cvars, players = q3query.parse_oob_response(reply)
+    # Bots report a ping of 0 on ioq3-derived servers.
+    humans = [p["name"] for p in players if p["ping"] > 0]
+    return ServerStatus(
+        name=q3query.COLOR_PATTERN.sub("", cvars.get("sv_hostname", server["name"])),
+        map=cvars.get("mapname", ""),
+        game=cvars.get("gamename", "Quake 3"),
+        version=cvars.get("version", ""),
+        num_players=len(humans),
+        max_players=int(cvars.get("sv_maxclients", "0") or 0),
+        bots=len(players) - len(humans),
+        players=humans,
+    )
+
+
+# --- A2S (GoldSrc/Source) ---
+
+async def a2s_request(udp: UdpExchange, request: bytes, reply_types: bytes) -> bytes:
+    """Sends an A2S request, answering one S2C_CHALLENGE round if asked."""
+    accept = lambda d: d[:4] == a2s.HEADER and len(d) > 4 and (d[4] == a2s.CHALLENGE or d[4] in reply_types)
+    reply = await udp.request(request, accept=accept)
+    retry = a2s.challenge_retry(request, reply)
+    if retry is not None:
+        reply = await udp.request(retry, accept=accept)
+        if reply[4] == a2s.CHALLENGE:
+            raise ValueError("Server kept answering with challenges")
+    return reply
+
+
+async def query_a2s(server: dict, ctx: PollContext) -> ServerStatus:
+    async with UdpExchange(server["host"], int(server["port"])) as udp:
+        info = a2s.parse_info(await a2s_request(udp, a2s.INFO_REQUEST, bytes((a2s.INFO_SOURCE, a2s.INFO_GOLDSRC))))
+        status = ServerStatus(
+            name=info["name"],
+            map=info["map"],
+            game=info["game"],
+            version=info["version"],
+            num_players=info["players"],
+            max_players=info["max_players"],
+            bots=info["bots"],
+        )
+        try:
+            reply = await a2s_request(udp, a2s.PLAYER_REQUEST + a2s.HEADER, bytes((a2s.PLAYER_REPLY,)))
+            status.players = a2s.parse_players(reply)
+        except (TimeoutError, ValueError, IndexError):
+            pass  # Some servers disable A2S_PLAYER; counts are still valid.
+    return status
+
+
+BACKENDS: Dict[str, Callable] = {
+    "hyquery": query_hyquery,
+    "zandronum": query_zandronum,
+    "chocdoom": query_chocdoom,
+    "quake3": query_quake3,
+    "a2s": query_a2s,
+}
+
+
+# ============================================================
+# Front ends
+# ============================================================
+#
+# A front end has a `render(entry)` that pre-renders its reply bodies into
+# entry.rendered after each refresh, and (for UDP ones) a DatagramProtocol
+# that serves them. Register new ones in FRONTENDS.
+
+class ChallengeTokens:
+    """
+    Stateless challenge tokens: keyed BLAKE2s over (time window, client IP,
+    session bytes). Nothing is stored per client, so a flood of random
+    session ids costs constant memory.
+    """
+
+    def __init__(self) -> None:
+        self._secret = os.urandom(16)
+
+    def issue(self, client_ip: str, session: bytes, window: Optional[int] = None) -> int:
+        if window is None:
+            window = int(time.time()) // TOKEN_LIFETIME_SECONDS
+        msg = window.to_bytes(8, "big") + client_ip.encode("ascii") + session
+        digest = hashlib.blake2s(msg, key=self._secret, digest_size=4).digest()
+        return int.from_bytes(digest, "big") & 0x7FFFFFFF
+
+    def valid(self, client_ip: str, session: bytes, token: int) -> bool:
+        window = int(time.time()) // TOKEN_LIFETIME_SECONDS
+        return token == self.issue(client_ip, session, window) or token == self.issue(client_ip, session, window - 1)
+
+
+def _host_addr(entry: CacheEntry) -> Tuple[str, int]:
+    try:
+        ip = socket.gethostbyname(entry.server["host"])
+    except OSError:
+        ip = "127.0.0.1"
+    return ip, int(entry.server["port"])
+
+
+# --- GameSpy4 / "Minecraft query" ---
+
+class GameSpyFrontend(asyncio.DatagramProtocol):
+    port_key = "gamespy_port"
+
+    def __init__(self, entry: CacheEntry, tokens: ChallengeTokens) -> None:
+        self.entry = entry
+        self.tokens = tokens
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    @staticmethod
+    def render(entry: CacheEntry) -> None:
+        status = entry.status
+        host_ip, host_port = entry.server.get("_host_addr") or _host_addr(entry)
+        map_name = status.map or "world"
+        entry.rendered["gamespy_basic"] = HytaleQuery.build_gamespy_basicstat_body(
+            motd=status.name,
+            game_type="SMP",
+            map_name=map_name,
+            num_players=status.num_players,
+            max_players=status.max_players,
+            host_port=host_port,
+            host_ip=host_ip,
+        )
+        entry.rendered["gamespy_full"] = HytaleQuery.build_gamespy_fullstat_body(
+            hostname=status.name,
+            game_type="SMP",
+            game_id="MINECRAFT",
+            version=status.version or status.game,
+            plugins="QueryGateway",
+            map_name=map_name,
+            num_players=status.num_players,
+            max_players=status.max_players,
+            host_port=host_port,
+            host_ip=host_ip,
+            player_names=status.players,
+        )
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        if len(data) < 7 or data[0] != 0xFE or data[1] != 0xFD or not self.entry.status.online:
+            return
+        session = data[3:7]
+        if data[2] == 0x09:
+            token = self.tokens.issue(addr[0], session)
+            self.transport.sendto(HytaleQuery.build_gamespy_handshake_reply(session, token), addr)
+        elif data[2] == 0x00 and len(data) >= 11:
+            if not self.tokens.valid(addr[0], session, struct.unpack(">i", data[7:11])[0]):
+                return
+            body = self.entry.rendered.get("gamespy_full" if len(data) >= 15 else "gamespy_basic", b"")
+            self.transport.sendto(b"\x00" + session + body, addr)
+
+
+# --- A2S_INFO ---
+
+class A2SInfoFrontend(asyncio.DatagramProtocol):
+    port_key = "a2s_port"
+
+    def __init__(self, entry: CacheEntry, tokens: ChallengeTokens) -> None:
+        self.entry = entry
+        self.tokens = tokens
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    @staticmethod
+    def render(entry: CacheEntry) -> None:
+        status = entry.status
+        _host_ip, host_port = entry.server.get("_host_addr") or _host_addr(entry)
+
+        def cstr(text: str) -> bytes:
+            return text.encode("utf-8", errors="replace") + b"\x00"
+
+        entry.rendered["a2s_info"] = b"".join(
+            (
+                a2s.HEADER + bytes((a2s.INFO_SOURCE, 0x11)),
+                cstr(status.name),
+                cstr(status.map),
+                cstr(entry.server["backend"]),
+                cstr(status.game),
+                struct.pack(
+                    "<HBBBBBBB",
+                    0,
+                    min(255, status.num_players + status.bots),
+                    min(255, status.max_players),
+                    min(255, status.bots),
+                    ord("d"),
+                    ord("l"),
+                    0,
+                    0,
+                ),
+                cstr(status.version or "1.0"),
+                b"\x80" + struct.pack("<H", host_port & 0xFFFF),
+            )
+        )
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        if not data.startswith(a2s.INFO_REQUEST) or not self.entry.status.online:
+            return
+        challenge = data[len(a2s.INFO_REQUEST) : len(a2s.INFO_REQUEST) + 4]
+        if len(challenge) == 4 and self.tokens.valid(addr[0], b"", struct.unpack("<i", challenge)[0]):
+            self.transport.sendto(self.entry.rendered.get("a2s_info", b""), addr)
+        else:
+            # Same challenge handshake as real servers, so spoofed sources
+            # only ever get 9 bytes back.
+            token = self.tokens.issue(addr[0], b"")
+            self.transport.sendto(a2s.HEADER + bytes((a2s.CHALLENGE,)) + struct.pack("<i", token), addr)
+
+
+# --- JSON over HTTP ---
+
+class JsonHttpFrontend:
+    def __init__(self, entries: Dict[str, CacheEntry]) -> None:
+        self.entries = entries
+        self.fleet_body = b"{}"
+
+    @staticmethod
+    def render(entry: CacheEntry) -> None:
+        entry.rendered["json"] = json.dumps(asdict(entry.status)).encode("utf-8")
+
+    def render_fleet(self) -> None:
+        fleet = {name: asdict(entry.status) for name, entry in self.entries.items()}
+        self.fleet_body = json.dumps(fleet).encode("utf-8")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5.0)
+            # Drain headers; we don't need any of them.
+            while (await asyncio.wait_for(reader.readline(), 5.0)) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].strip("/") if len(parts) >= 2 else ""
+            if not path:
+                status_line, body = b"200 OK", self.fleet_body
+            elif path in self.entries:
+                status_line, body = b"200 OK", self.entries[path].rendered.get("json", b"{}")
+            else:
+                status_line, body = b"404 Not Found", b'{"error": "unknown server"}'
+
+            writer.write(
+                b"HTTP/1.0 " + status_line + b"\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+FRONTENDS = [GameSpyFrontend, A2SInfoFrontend, JsonHttpFrontend]
+
+
+# ============================================================
+# Gateway
+# ============================================================
+
+class Gateway:
+    def __init__(self, servers: List[dict]) -> None:
+        self.entries: Dict[str, CacheEntry] = {s["name"]: CacheEntry(s) for s in servers}
+        self.tokens = ChallengeTokens()
+        self.http = JsonHttpFrontend(self.entries)
+        for entry in self.entries.values():
+            if entry.server["backend"] not in BACKENDS:
+                raise SystemExit(f"Unknown backend {entry.server['backend']!r} for {entry.server['name']!r}")
+            entry.server["_host_addr"] = _host_addr(entry)
+            self._render(entry)
+        self.http.render_fleet()
+
+    def _render(self, entry: CacheEntry) -> None:
+        for frontend in FRONTENDS:
+            frontend.render(entry)
+
+    async def _poll_one(self, entry: CacheEntry, ctx: PollContext) -> None:
+        backend = BACKENDS[entry.server["backend"]]
+        try:
+            status = await asyncio.wait_for(backend(entry.server, ctx), QUERY_TIMEOUT_SEC + 10.0)
+            status.online = True
+            status.ok_utc = time.time()
+            entry.status = status
+            entry.failures = 0
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            entry.failures += 1
+            logging.info("%s: query failed (%d in a row): %s", entry.server["name"], entry.failures, error)
+            if entry.failures >= OFFLINE_AFTER_FAILURES and entry.status.online:
+                logging.warning("%s: marking offline", entry.server["name"])
+                old = entry.status
+                entry.status = ServerStatus(
+                    name=old.name,
+                    game=old.game,
+                    version=old.version,
+                    max_players=old.max_players,
+                    ok_utc=old.ok_utc,
+                )
+            entry.status.error = error
+        self._render(entry)
+
+    async def poll_once(self) -> None:
+        ctx = PollContext()
+        await asyncio.gather(*(self._poll_one(entry, ctx) for entry in self.entries.values()))
+        self.http.render_fleet()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        for entry in self.entries.values():
+            for frontend in FRONTENDS:
+                port_key = getattr(frontend, "port_key", None)
+                port = entry.server.get(port_key) if port_key else None
+                if not port:
+                    continue
+                try:
+                    await loop.create_datagram_endpoint(
+                        lambda frontend=frontend, entry=entry: frontend(entry, self.tokens),
+                        local_addr=(BIND_HOST, int(port)),
+                    )
+                    logging.info("%s: %s listening on UDP/%d", entry.server["name"], frontend.__name__, port)
+                except OSError:
+                    logging.exception("%s: failed to bind UDP/%d", entry.server["name"], port)
+
+        if HTTP_ENABLED:
+            await asyncio.start_server(self.http.handle, HTTP_BIND_HOST, HTTP_PORT)
+            logging.info("JSON status on http://%s:%d/", HTTP_BIND_HOST, HTTP_PORT)
+
+        while True:
+            started = time.monotonic()
+            await self.poll_once()
+            await asyncio.sleep(max(0.0, REFRESH_SECONDS - (time.monotonic() - started)))
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    logging.info("Starting query gateway for %d servers.", len(GATEWAY_SERVERS))
+    try:
+        asyncio.run(Gateway(GATEWAY_SERVERS).run())
+    except KeyboardInterrupt:
+        logging.info("Stopping...")
+
+
+if __name__ == "__main__":
+    main()
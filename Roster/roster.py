@@ -0,0 +1,92 @@
+"""
+Shared local "who's online" endpoint for the log relays.
+
+Relays add ../Roster to sys.path (or copy this file next to them), keep a
+Roster up to date from the join/leave lines they parse and serve it:
+
+    roster = Roster()
+    roster.join("Some Name")
+    roster.leave("Some Name")
+    serve_roster(roster, "127.0.0.1", 27961)   # GET / returns the JSON
+
+Entries are keyed by whatever identifies a player best (a name, a Steam
+ID); extra fields passed to join() are stored on the entry:
+
+    roster = Roster(defaults={"team": "Unassigned"})
+    roster.join(steam_id, name="Some Name", steam_id=steam_id, team=None)
+
+serve_roster() never takes a relay down: if the port can't be bound it logs
+why and returns None, and the relay carries on without the endpoint.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class Roster:
+    """In-memory roster built from join/leave events. Safe to use from several threads."""
+
+    def __init__(self, defaults: Optional[Dict[str, Any]] = None,
+                 extra: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+        """
+        `defaults` are the fields a new entry starts with; `extra` returns
+        more top-level keys for the JSON (e.g. a cached server status).
+        """
+        self.defaults = dict(defaults or {})
+        self.extra = extra
+        self._entries: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def join(self, key: Hashable, **fields: Any) -> None:
+        """Add or update a player. Fields given as None keep their current value."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {"name": key, **self.defaults, "since": time.time()}
+            entry.update((name, value) for name, value in fields.items() if value is not None)
+
+    def leave(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            players = [dict(entry) for entry in self._entries.values()]
+        data = {"count": len(players), "players": players}
+        if self.extra is not None:
+            data.update(self.extra())
+        return data
+
+
+def _make_handler(roster: Roster):
+    class RosterHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(roster.snapshot()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep the console for log events only
+
+    return RosterHandler
+
+
+def serve_roster(roster: Roster, host: str, port: int) -> Optional[ThreadingHTTPServer]:
+    """Serve `roster` on http://host:port/ from a background thread. Returns None if the port can't be bound."""
+    try:
+        server = ThreadingHTTPServer((host, port), _make_handler(roster))
+    except OSError as e:
+        print(f"[roster] Could not listen on {host}:{port} ({e}); continuing without the roster endpoint")
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving roster on http://{host}:{server.server_address[1]}/")
+    return server
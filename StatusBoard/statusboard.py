@@ -0,0 +1,108 @@
+"""
+Edit-in-place Discord status messages for the server status pollers.
+
+Scripts add ../StatusBoard to sys.path (or copy this file next to them):
+
+    board = StatusBoard(webhook_url, "myscript_board.json")
+    board.update("host:port", embed, username="My Server")
+
+Each key gets one message. It is created once with ?wait=true so its id can
+be captured, then PATCHed only when the embed hashes differently from what
+was last sent. Ids and hashes are persisted, so a restart keeps editing the
+same messages, and a message deleted in Discord is simply recreated.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import requests
+
+
+class StatusBoard:
+    def __init__(self, webhook_url: str, state_path: str, legacy_key: Optional[str] = None) -> None:
+        """
+        `legacy_key` adopts an older single-message state file
+        ({"message_id": ..., "hash": ...}) as the entry for that key.
+        """
+        self.webhook_url = webhook_url
+        self.state_path = state_path
+        self.state: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and "message_id" in data:
+                data = {legacy_key: data} if legacy_key else {}
+            if isinstance(data, dict):
+                self.state = data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning("Could not read %s: %s", state_path, e)
+
+    def _save(self) -> None:
+        tmp_path = self.state_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logging.warning("Could not write %s: %s", self.state_path, e)
+
+    def update(
+        self,
+        key: str,
+        embed: Dict[str, Any],
+        username: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+        timestamp: bool = False,
+    ) -> bool:
+        """
+        Create or edit the message for `key`. Returns True if Discord was sent
+        anything. `username`/`avatar_url` only apply when the message is
+        created (webhook edits can't change them). With `timestamp`, the
+        embed is stamped with the current time, which doesn't count as a change.
+        """
+        raw = json.dumps(embed, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        entry = self.state.get(key, {})
+        if entry.get("hash") == digest:
+            logging.info("Status board for %s unchanged; nothing sent.", key)
+            return False
+
+        if timestamp:
+            embed = dict(embed, timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat())
+        body: Dict[str, Any] = {"content": "", "embeds": [embed]}
+        message_id = entry.get("message_id")
+
+        try:
+            if message_id:
+                resp = requests.patch(f"{self.webhook_url}/messages/{message_id}", json=body, timeout=10)
+                if resp.status_code == 404:
+                    logging.info("Status board message for %s is gone; recreating.", key)
+                    message_id = None
+                elif resp.status_code >= 400:
+                    logging.error("Webhook edit error %s: %s", resp.status_code, resp.text[:500])
+                    return False
+
+            if not message_id:
+                payload = dict(body)
+                if username:
+                    payload["username"] = username
+                if avatar_url:
+                    payload["avatar_url"] = avatar_url
+                resp = requests.post(self.webhook_url, params={"wait": "true"}, json=payload, timeout=10)
+                if resp.status_code >= 400:
+                    logging.error("Webhook error %s: %s", resp.status_code, resp.text[:500])
+                    return False
+                message_id = str(resp.json()["id"])
+        except Exception as e:
+            logging.exception("Failed to update status board for %s: %s", key, e)
+            return False
+
+        self.state[key] = {"message_id": message_id, "hash": digest}
+        self._save()
+        logging.info("Status board for %s updated.", key)
+        return True
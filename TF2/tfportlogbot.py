@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import time
 import glob
 import requests
@@ -10,6 +11,16 @@ DISCORD_WEBHOOK_URL = "YOUR_WEBHOOK_URL_HERE"
 # Source Engine Log Directory
 LOG_DIR = "YOUR_PATH_TO_TF_FOLDER_HERE\\logs"
 
+# Local "who's online" endpoint (GET http://127.0.0.1:27800/ returns JSON)
+ROSTER_ENABLED = False
+ROSTER_BIND_HOST = "127.0.0.1"
+ROSTER_PORT = 27800
+
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "tf2"
+
 # Regex patterns for log parsing
 CONNECT_PATTERN = r'L (\d+/\d+/\d+ - \d+:\d+:\d+): "([^<]+)<\d+><(\[U:\d:\d+\])><>" connected, address "([^"]+)"'
 VALIDATED_PATTERN = r'L (\d+/\d+/\d+ - \d+:\d+:\d+): "([^<]+)<\d+><(\[U:\d:\d+\])><>" STEAM USERID validated'
@@ -26,17 +37,86 @@ TEAM_COLORS = {
     "Spectator": 0xAAAAAA,
 }
 
-def send_discord_message(title, description, color=0x7289DA):
+# Server status via A2S (the game server's own query port), polled in the
+# background by A2S/a2s.py. Join/leave embeds get an "N/M players on map"
+# footer from its cache (never waiting on the network) and trigger an early
+# re-poll, so the messages after them count that player.
+A2S_ENABLED = False
+A2S_HOST = "127.0.0.1"
+A2S_PORT = 27015
+A2S_POLL_SECONDS = 15
+A2S_TIMEOUT_SEC = 2.0
+
+a2s_poller = None
+
+def start_a2s_poller():
+    """Start the background A2S poller (a2s.py next to this script or in ../A2S)."""
+    global a2s_poller
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "A2S"))
+    from a2s import A2SPoller
+    a2s_poller = A2SPoller(A2S_HOST, A2S_PORT, A2S_POLL_SECONDS, A2S_TIMEOUT_SEC)
+    a2s_poller.start()
+    print(f"Polling A2S on {A2S_HOST}:{A2S_PORT} every {A2S_POLL_SECONDS}s")
+
+def a2s_status_line(wake=False):
+    """
+    'N/M players on map' from the poller's cache, or None; never waits on the
+    network. With wake, the poller also re-polls shortly, so the messages
+    after this one count the join/leave being reported.
+    """
+    if a2s_poller is None:
+        return None
+    if wake:
+        a2s_poller.wake()
+    return a2s_poller.status_line()
+
+roster = None
+
+def start_roster_server():
+    """Track who's online and serve it on a local HTTP port (roster.py next to this script or in ../Roster)."""
+    global roster
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Roster"))
+    from roster import Roster, serve_roster
+    tracked = Roster(
+        defaults={"steam_id": None, "team": "Unassigned"},
+        extra=lambda: {"server": a2s_poller.snapshot() if a2s_poller is not None else None},
+    )
+    if serve_roster(tracked, ROSTER_BIND_HOST, ROSTER_PORT) is not None:
+        roster = tracked
+
+def roster_join(steam_id, player, team=None):
+    """Add or update a player in the roster, keyed by Steam ID."""
+    if roster is not None:
+        roster.join(steam_id, name=player, steam_id=steam_id, team=team)
+
+def roster_leave(steam_id):
+    if roster is not None:
+        roster.leave(steam_id)
+
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
+def send_discord_message(title, description, color=0x7289DA, footer=None):
     """Send a message to Discord via webhook."""
-    data = {
-        "embeds": [
-            {
-                "title": title,
-                "description": description,
-                "color": color,
-            }
-        ]
+    embed = {
+        "title": title,
+        "description": description,
+        "color": color,
     }
+    if footer:
+        embed["footer"] = {"text": footer}
+    data = {"embeds": [embed]}
     response = requests.post(DISCORD_WEBHOOK_URL, json=data)
     if response.status_code != 204:
         print(f"Failed to send message to Discord: {response.status_code}, {response.text}")
@@ -45,13 +125,17 @@ def process_log_line(line):
     """Process a single log line and send appropriate Discord messages."""
     if match := re.match(CONNECT_PATTERN, line):
         timestamp, player, steam_id, address = match.groups()
+        roster_join(steam_id, player)
+        record_event("connect", player, steam_id)
         send_discord_message(
             "Player Connected",
             f"**[{timestamp}]** **{player}** (`{steam_id}`) connected from `{address}`.",
-            0x00FF00  # Explicitly set to green (0x00FF00)
+            0x00FF00,  # Explicitly set to green (0x00FF00)
+            footer=a2s_status_line(wake=True)
         )
     elif match := re.match(VALIDATED_PATTERN, line):
         timestamp, player, steam_id = match.groups()
+        record_event("validated", player, steam_id)
         send_discord_message(
             "Player Validated",
             f"**[{timestamp}]** **{player}** (`{steam_id}`) has been validated.",
@@ -59,13 +143,18 @@ def process_log_line(line):
         )
     elif match := re.match(ENTER_GAME_PATTERN, line):
         timestamp, player, steam_id = match.groups()
+        roster_join(steam_id, player)
+        record_event("join", player, steam_id)
         send_discord_message(
             "Player Entered the Game",
             f"**[{timestamp}]** **{player}** (`{steam_id}`) has entered the game.",
-            TEAM_COLORS["Unassigned"]
+            TEAM_COLORS["Unassigned"],
+            footer=a2s_status_line()
         )
     elif match := re.match(TEAM_JOIN_PATTERN, line):
         timestamp, player, steam_id, old_team, new_team = match.groups()
+        roster_join(steam_id, player, new_team)
+        record_event("team", player, new_team)
         send_discord_message(
             "Team Change",
             f"**[{timestamp}]** **{player}** (`{steam_id}`) joined team **{new_team}**.",
@@ -73,6 +162,7 @@ def process_log_line(line):
         )
     elif match := re.match(CHAT_PATTERN, line):
         timestamp, player, steam_id, team, message = match.groups()
+        record_event("chat", player, message)
         send_discord_message(
             f"Chat - {team} Team",
             f"**[{timestamp}]** **{player}** (`{steam_id}`): {message}",
@@ -80,10 +170,13 @@ def process_log_line(line):
         )
     elif match := re.match(DISCONNECT_PATTERN, line):
         timestamp, player, steam_id, team = match.groups()
+        roster_leave(steam_id)
+        record_event("leave", player, steam_id)
         send_discord_message(
             "Player Disconnected",
             f"**[{timestamp}]** **{player}** (`{steam_id}`) has disconnected.",
-            0xFF0000
+            0xFF0000,
+            footer=a2s_status_line(wake=True)
         )
 
 def monitor_logs():
@@ -108,4 +201,10 @@ def monitor_logs():
                 time.sleep(0.1)
 
 if __name__ == "__main__":
+    if EVENT_STORE_DB:
+        open_event_store()
+    if ROSTER_ENABLED:
+        start_roster_server()
+    if A2S_ENABLED:
+        start_a2s_poller()
     monitor_logs()
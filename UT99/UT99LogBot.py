@@ -1,4 +1,6 @@
 import re
+import os
+import sys
 import time
 from datetime import datetime
 import requests
@@ -8,6 +10,11 @@ import pytz
 log_file_path = r"YOUR_PATH_TO_UT99\Unreal\UnrealTournament\System\server.log"
 webhook_url = "YOUR_WEBHOOK_URL_HERE"
 
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "ut99"
+
 # Discord Embed Colors
 COLORS = {
     "join": 0x00FF00,  # Green
@@ -20,6 +27,20 @@ PATTERNS = {
     "map_change": re.compile(r"ScriptLog: ProcessServerTravel: (.+\.unr)"),
 }
 
+event_store = None
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event_type, player=None, detail=None):
+    if event_store is not None:
+        event_store.record(EVENT_STORE_SERVER, event_type, player, detail)
+
 def send_discord_message(event_type, description, timestamp):
     """
     Sends a message to the Discord webhook.
@@ -55,8 +76,10 @@ def parse_log_line(line):
         match = pattern.search(line)
         if match:
             if event_type == "join":
+                record_event("join", match.group(1))
                 return event_type, f"Player joined: {match.group(1)}"
             if event_type == "map_change":
+                record_event("map", None, match.group(1))
                 return event_type, f"Map changed to: {match.group(1)}"
     return None, None
 
@@ -65,6 +88,8 @@ def main():
     Main function to monitor the log and send Discord messages.
     """
     print("Monitoring UT99 server log...")
+    if EVENT_STORE_DB:
+        open_event_store()
     
     # Set timezone to PST (Pacific Standard Time)
     pst = pytz.timezone('US/Pacific')
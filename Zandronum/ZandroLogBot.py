@@ -1,5 +1,6 @@
 import time
 import re
+import sys
 import requests
 from datetime import datetime
 import pytz
@@ -8,9 +9,36 @@ import os
 file_path = r"YOUR_ZANDRONUM_LOG_DIRECTORY_HERE"
 webhook_url = "YOUR_WEBHOOK_URL_HERE"
 
+# Optional event history: set EVENT_STORE_DB to a SQLite path to record every
+# relayed event (see EventStore/eventstore.py; several relays can share one file)
+EVENT_STORE_DB = None
+EVENT_STORE_SERVER = "zandronum"
+
 # Define PST timezone
 pst = pytz.timezone('US/Pacific')
 
+event_store = None
+
+# Log event types -> event store types ("join"/"leave" drive the who-was-on queries)
+EVENT_STORE_TYPES = {"connect": "join", "disconnect": "leave", "map_change": "map", "obituary": "death"}
+
+def open_event_store():
+    """Open the shared event store (eventstore.py next to this script or in ../EventStore)."""
+    global event_store
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EventStore"))
+    from eventstore import EventStore
+    event_store = EventStore(EVENT_STORE_DB)
+    print(f"Recording events to {EVENT_STORE_DB} as '{EVENT_STORE_SERVER}'")
+
+def record_event(event):
+    if event_store is None:
+        return
+    detail = event.get("message") or event.get("map") or event.get("item") or event.get("death")
+    if event["type"] == "obituary":
+        detail = f"{event['death']} by {event['killer']}"
+    event_type = EVENT_STORE_TYPES.get(event["type"], event["type"])
+    event_store.record(EVENT_STORE_SERVER, event_type, event.get("player"), detail)
+
 def parse_log_line(line):
     # Get timestamp for messages in PST time zone
     timestamp = datetime.now(pst).isoformat()  # ISO format with correct PST timezone
@@ -153,7 +181,10 @@ def monitor_log():
                 continue
             event = parse_log_line(line.strip())
             if event:
+                record_event(event)
                 post_to_discord(event)
 
 if __name__ == "__main__":
+    if EVENT_STORE_DB:
+        open_event_store()
     monitor_log()
@@ -1,11 +1,21 @@
 import datetime
 import logging
+import os
 import socket
+import sys
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+# Shared edit-in-place board (../StatusBoard/statusboard.py, or a copy next to this script)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StatusBoard"))
+from statusboard import StatusBoard  # noqa: E402
+
+# Shared per-server adaptive scheduling (../PollScheduler/pollscheduler.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "PollScheduler"))
+from pollscheduler import FleetScheduler  # noqa: E402
+
 # =========================================
 # Configuration
 # =========================================
@@ -20,6 +30,38 @@ DOOMLIST_API_URL = "https://doomlist.net/api/full"
 # How often to run: every 15 minutes on the clock (00, 15, 30, 45)
 CHECK_INTERVAL_MINUTES = 15
 
+# Adaptive scheduling: instead of waiting for the next clock-aligned
+# interval, each server is scheduled on its own: polled every
+# FAST_POLL_SECONDS while players are on (or its player count just changed),
+# then backed off exponentially once it has been empty for
+# FAST_POLL_GRACE_SECONDS, up to MAX_POLL_SECONDS. Each delay gets
+# +/- POLL_JITTER_FRACTION of random jitter so many monitors don't align.
+# Needs STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED, otherwise every
+# fast poll would post a full embed.
+ADAPTIVE_SCHEDULE_ENABLED = False
+FAST_POLL_SECONDS = 20
+FAST_POLL_GRACE_SECONDS = 10 * 60
+MAX_POLL_SECONDS = 60 * 60
+POLL_JITTER_FRACTION = 0.1
+
+# doomlist lists every server in one response, so checks made within this
+# many seconds of each other share one download. With the adaptive schedule
+# the servers' jittered delays otherwise each trigger their own fetch.
+DOOMLIST_CACHE_SECONDS = 10
+
+# Status board mode: instead of posting a new message every cycle, keep one
+# message per server and edit it in place only when its content changes.
+# Message ids are persisted in STATUS_BOARD_STATE_FILE so restarts reuse them.
+STATUS_BOARD_ENABLED = False
+STATUS_BOARD_STATE_FILE = "zandroquery_board.json"
+
+# Change detection mode: remember the last snapshot of each server and only
+# send a webhook when something meaningful changed (player joined/left, map
+# changed, server went empty). Makes shorter check intervals practical.
+# Can be combined with the status board: the board shows the live state and
+# each change is also posted as its own message.
+CHANGE_DETECTION_ENABLED = False
+
 # Zandronum servers to monitor.
 # Each entry:
 #   label       - Friendly human-readable label to show in the embed.
@@ -56,13 +98,24 @@ def resolve_dns(hostname: str) -> Optional[str]:
         return None
 
 
+# (time.monotonic() of the fetch, data) of the last successful download
+_doomlist_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
 def fetch_doomlist_data() -> Dict[str, Any]:
-    """Fetch the doomlist JSON data and return it as a dict."""
+    """
+    Fetch the doomlist JSON data and return it as a dict. A download less
+    than DOOMLIST_CACHE_SECONDS old is reused.
+    """
+    global _doomlist_cache
+    if _doomlist_cache is not None and time.monotonic() - _doomlist_cache[0] < DOOMLIST_CACHE_SECONDS:
+        return _doomlist_cache[1]
     response = requests.get(DOOMLIST_API_URL, timeout=10)
     response.raise_for_status()
     data = response.json()
     if not isinstance(data, dict):
         raise ValueError("Unexpected doomlist API format (expected JSON object)")
+    _doomlist_cache = (time.monotonic(), data)
     return data
 
 
@@ -275,6 +328,126 @@ def send_discord_webhook(embed: Dict[str, Any], username: Optional[str] = None)
         logging.exception("Failed to send webhook: %s", e)
 
 
+# =========================================
+# Status board (edit-in-place) mode
+# =========================================
+
+status_board: Optional[StatusBoard] = None
+
+
+def update_status_board(
+    board_key: str,
+    embed: Dict[str, Any],
+    username: Optional[str] = None,
+) -> None:
+    """Create or edit the status board message for one server (see StatusBoard)."""
+    if not DISCORD_WEBHOOK_URL or "your_webhook_id" in DISCORD_WEBHOOK_URL:
+        logging.error("DISCORD_WEBHOOK_URL is not configured.")
+        return
+    status_board.update(board_key, embed, username=username)
+
+
+# =========================================
+# Change detection
+# =========================================
+
+# Last snapshot per server key ("dns:port"), kept in memory only.
+last_snapshots: Dict[str, Dict[str, Any]] = {}
+
+
+def take_snapshot(
+    server_info: Dict[str, Any],
+    num_playing: int,
+    num_spectating: int,
+    human_names: List[str],
+) -> Dict[str, Any]:
+    """Reduce a doomlist entry to the fields worth diffing."""
+    return {
+        "map": server_info.get("mapname", "Unknown"),
+        "playing": num_playing,
+        "spectating": num_spectating,
+        "players": sorted(human_names),
+    }
+
+
+def diff_snapshots(
+    old: Optional[Dict[str, Any]],
+    new: Dict[str, Any],
+) -> List[str]:
+    """
+    Return human-readable transitions between two snapshots.
+
+    An empty list means nothing worth announcing changed. The first snapshot
+    after startup only reports anything if the server is populated.
+    """
+    new_total = new["playing"] + new["spectating"]
+    if old is None:
+        return ["Now monitoring"] if new_total > 0 else []
+
+    old_total = old["playing"] + old["spectating"]
+    changes: List[str] = []
+
+    old_names = list(old["players"])
+    new_names = list(new["players"])
+    joined = []
+    for name in new_names:
+        if name in old_names:
+            old_names.remove(name)
+        else:
+            joined.append(name)
+    left = old_names
+
+    changes.extend(f"{name} joined" for name in joined)
+    changes.extend(f"{name} left" for name in left)
+
+    # No player detail from doomlist; fall back to comparing counts.
+    if not joined and not left and old_total != new_total:
+        changes.append(f"Players: {old_total} -> {new_total}")
+
+    if new_total > 0 and old["map"] != new["map"]:
+        changes.append(f"Map changed: {old['map']} -> {new['map']}")
+
+    if old_total > 0 and new_total == 0:
+        changes.append("Server is now empty")
+
+    return changes
+
+
+def send_changes(
+    server_meta: Dict[str, Any],
+    server_info: Dict[str, Any],
+    num_playing: int,
+    num_spectating: int,
+    human_names: List[str],
+) -> None:
+    """Diff against the last snapshot and send a webhook only on transitions."""
+    board_key = server_key(server_meta)
+    snapshot = take_snapshot(server_info, num_playing, num_spectating, human_names)
+    changes = diff_snapshots(last_snapshots.get(board_key), snapshot)
+    last_snapshots[board_key] = snapshot
+
+    if not changes:
+        logging.info("Server %s unchanged; no webhook sent.", server_meta["label"])
+        return
+
+    embed, hostname = build_zandronum_embed(
+        server_meta,
+        server_info,
+        num_playing,
+        num_spectating,
+        human_names,
+    )
+    if num_playing + num_spectating == 0:
+        embed["color"] = 0x808080  # Grey: server is empty
+    changes_value = "\n".join(changes)
+    if len(changes_value) > 1024:
+        changes_value = changes_value[:1000] + "\n...(truncated)"
+    embed["fields"].insert(0, {"name": "Changes", "value": changes_value, "inline": False})
+
+    send_discord_webhook(embed, username=hostname)
+    logging.info("Sent %d change(s) for server %s.", len(changes), server_meta["label"])
+
+
 # =========================================
 # Scheduling
 # =========================================
@@ -319,22 +492,31 @@ def seconds_until_next_quarter() -> float:
     return delta
 
 
-def run_check_once() -> None:
+def server_key(server_meta: Dict[str, Any]) -> str:
+    return f"{server_meta['dns']}:{server_meta['port']}"
+
+
+def run_check_once(only: Optional[List[str]] = None) -> Dict[str, Optional[int]]:
     """
     Single pass:
-    - Fetch doomlist.
-    - For each configured Zandronum server, if total humans (players + spectators) > 0,
-      send a Discord webhook with details.
+    - Fetch doomlist (once for every server checked, see DOOMLIST_CACHE_SECONDS).
+    - For each configured Zandronum server (or just the keys in `only`), if
+      total humans (players + spectators) > 0, send a Discord webhook with details.
+
+    Returns {server key: humans seen} for the servers checked, with None for
+    a server that could not be found (or if doomlist could not be fetched).
     """
     logging.info("Running server check...")
+    servers = [s for s in ZANDRONUM_SERVERS if only is None or server_key(s) in only]
+    humans_seen: Dict[str, Optional[int]] = {server_key(s): None for s in servers}
 
     try:
         doomlist_data = fetch_doomlist_data()
     except Exception as e:
         logging.error("Failed to fetch doomlist data: %s", e)
-        return
+        return humans_seen
 
-    for server_meta in ZANDRONUM_SERVERS:
+    for server_meta in servers:
         try:
             server_info = find_zandronum_server(
                 doomlist_data=doomlist_data,
@@ -349,8 +531,31 @@ def run_check_once() -> None:
 
             num_playing, num_spectating, human_names = get_player_counts(server_info)
             total_humans = num_playing + num_spectating
+            humans_seen[server_key(server_meta)] = total_humans
 
-            if total_humans > 0:
+            if STATUS_BOARD_ENABLED:
+                embed, hostname = build_zandronum_embed(
+                    server_meta,
+                    server_info,
+                    num_playing,
+                    num_spectating,
+                    human_names,
+                )
+                if total_humans == 0:
+                    embed["color"] = 0x808080  # Grey: server is empty
+                update_status_board(server_key(server_meta), embed, username=hostname)
+
+            if CHANGE_DETECTION_ENABLED:
+                send_changes(
+                    server_meta,
+                    server_info,
+                    num_playing,
+                    num_spectating,
+                    human_names,
+                )
+            elif STATUS_BOARD_ENABLED:
+                pass  # The board already shows this server
+            elif total_humans > 0:
                 embed, hostname = build_zandronum_embed(
                     server_meta,
                     server_info,
@@ -378,6 +583,8 @@ def run_check_once() -> None:
                 e,
             )
 
+    return humans_seen
+
 
 def main() -> None:
     logging.basicConfig(
@@ -387,19 +594,45 @@ def main() -> None:
 
     logging.info("Starting generic Doom server status bot.")
 
+    if ADAPTIVE_SCHEDULE_ENABLED and not (STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED):
+        raise SystemExit(
+            "ADAPTIVE_SCHEDULE_ENABLED needs STATUS_BOARD_ENABLED or CHANGE_DETECTION_ENABLED; "
+            "otherwise a full embed would be posted on every fast poll."
+        )
+
+    global status_board
+    if STATUS_BOARD_ENABLED:
+        status_board = StatusBoard(DISCORD_WEBHOOK_URL, STATUS_BOARD_STATE_FILE)
+
     # Immediate check on startup
     logging.info("Running initial check on startup...")
-    run_check_once()
-
-    # Then continue on the regular quarter-hour cadence
-    while True:
-        sleep_seconds = seconds_until_next_quarter()
-        logging.info(
-            "Sleeping %.1f seconds until next quarter-hour check.",
-            sleep_seconds,
+    humans_seen = run_check_once()
+
+    if ADAPTIVE_SCHEDULE_ENABLED:
+        schedule = FleetScheduler(
+            [server_key(s) for s in ZANDRONUM_SERVERS],
+            fast_seconds=FAST_POLL_SECONDS,
+            grace_seconds=FAST_POLL_GRACE_SECONDS,
+            max_seconds=MAX_POLL_SECONDS,
+            jitter_fraction=POLL_JITTER_FRACTION,
         )
-        time.sleep(sleep_seconds)
-        run_check_once()
+        while True:
+            for key, humans in humans_seen.items():
+                schedule.record(key, humans)
+            sleep_seconds = schedule.seconds_until_next()
+            logging.info("Sleeping %.1f seconds until next check.", sleep_seconds)
+            time.sleep(sleep_seconds)
+            humans_seen = run_check_once(schedule.due())
+    else:
+        # Continue on the regular quarter-hour cadence
+        while True:
+            sleep_seconds = seconds_until_next_quarter()
+            logging.info(
+                "Sleeping %.1f seconds until next quarter-hour check.",
+                sleep_seconds,
+            )
+            time.sleep(sleep_seconds)
+            run_check_once()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+"""
+Benchmark for the keyword scorer in radio_webhook_feeds.py.
+
+Builds synthetic feed entries (title + summary, a few hundred characters, most
+with no keyword hits) and times score_text() against the previous
+implementation, which rebuilt its term checks on every call.
+
+Run from this folder:  python bench_scoring.py [entries] [seed]
+"""
+import random
+import re
+import sys
+import time
+from typing import List, Tuple
+
+from radio_webhook_feeds import HIGH_WEIGHT, MED_WEIGHT, NEGATIVE, WORD_BOUNDARY_TERMS, score_text
+
+FILLER = (
+    "the of and to in is it that for on was with as this at by from have an be are or not but my so "
+    "radio night receiver antenna frequency station voice heard listening logged signal sdr kiwisdr "
+    "recording audio today morning europe sale tale valeria"
+).split()
+
+
+def build_entries(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    terms = list(HIGH_WEIGHT) + list(MED_WEIGHT) + list(NEGATIVE)
+    entries = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(40, 160))]
+        for _ in range(rng.choice((0, 0, 0, 1, 2))):
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        entries.append(" ".join(words).title())
+    return entries
+
+
+# ------------------------------------------------------------
+# Previous scorer, kept here only as the comparison baseline
+# ------------------------------------------------------------
+
+def legacy_score_text(text: str) -> Tuple[int, List[str]]:
+    lower_text = (text or "").lower()
+    score = 0
+    hits: List[str] = []
+
+    def contains(term: str) -> bool:
+        if term in WORD_BOUNDARY_TERMS:
+            return re.search(rf"\b{re.escape(term)}\b", lower_text) is not None
+        return term in lower_text
+
+    for table in (HIGH_WEIGHT, MED_WEIGHT, NEGATIVE):
+        for term, weight in table.items():
+            if contains(term):
+                score += weight
+                hits.append(term)
+
+    return score, hits
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    entries = build_entries(count, seed)
+
+    results = {}
+    outputs = {}
+    print(f"{count} entries, avg {sum(map(len, entries)) / count:.0f} chars")
+    for label, func in (("legacy", legacy_score_text), ("current", score_text)):
+        start = time.perf_counter()
+        outputs[label] = [func(text) for text in entries]
+        results[label] = time.perf_counter() - start
+        print(f"  {label:<11} {results[label]:8.2f} s  ({results[label] / count * 1e6:.1f} us/entry)")
+    assert outputs["legacy"] == outputs["current"], "scorers disagree"
+    print(f"  speedup     {results['legacy'] / results['current']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
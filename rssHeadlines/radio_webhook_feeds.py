@@ -4,9 +4,11 @@ import time
 import json
 import hashlib
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Dict, List, Tuple, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import feedparser
 import requests
@@ -60,15 +62,69 @@ GLOBAL_MAX_POSTS_PER_DAY = 3
 GLOBAL_MIN_SECONDS_BETWEEN_POSTS = 2 * 60 * 60  # 2 hours
 SUPER_HOT_BYPASS_SCORE = 12  # can bypass the 2-hour delay if extremely relevant
 
+
+@dataclass
+class Destination:
+    """A webhook that gets items from some feeds and/or a score band, with its own limits and digest."""
+    name: str
+    webhook_env: str  # environment variable holding the webhook URL
+    sources: Optional[Set[str]] = None  # FeedSource names; None = every feed
+    min_score: Optional[int] = None     # score band; None = no bound
+    max_score: Optional[int] = None
+    max_posts_per_day: int = GLOBAL_MAX_POSTS_PER_DAY
+    min_seconds_between_posts: int = GLOBAL_MIN_SECONDS_BETWEEN_POSTS
+    digest: bool = True
+    webhook_url: str = ""  # filled in from webhook_env at startup
+
+    def accepts(self, source_name: str, score: int) -> bool:
+        if self.sources is not None and source_name not in self.sources:
+            return False
+        if self.min_score is not None and score < self.min_score:
+            return False
+        if self.max_score is not None and score > self.max_score:
+            return False
+        return True
+
+    def key(self, state_key: str) -> str:
+        # "main" keeps the pre-routing state keys, so upgrading doesn't reset its counters
+        return state_key if self.name == "main" else f"{self.name}:{state_key}"
+
+
+# Every feed is fetched and scored once per poll; each item then goes to every
+# destination that accepts it. Destinations whose variable isn't set are skipped.
+DESTINATIONS: List[Destination] = [
+    Destination(name="main", webhook_env="DISCORD_WEBHOOK_URL"),
+    # Destination(
+    #     name="numbers",
+    #     webhook_env="NUMBERS_WEBHOOK_URL",
+    #     sources={"r/signalidentification"},
+    #     min_score=10,
+    #     max_posts_per_day=5,
+    #     min_seconds_between_posts=30 * 60,
+    # ),
+]
+
 # Polling interval
 POLL_SECONDS = 15 * 60  # 15 minutes
 
+# Feed fetching (all feeds are fetched in parallel; one slow site doesn't hold up the rest)
+FETCH_CONNECT_TIMEOUT = 10
+FETCH_READ_TIMEOUT = 20
+FETCH_MAX_WORKERS = 8
+FETCH_USER_AGENT = "radio-webhook-feeds/1.0 (+feed watcher)"
+
 # Digest schedule (America/Los_Angeles)
 DIGEST_TZ = "America/Los_Angeles"
 DIGEST_POST_WEEKDAY = 6  # Sunday (Mon=0 ... Sun=6)
 DIGEST_POST_HOUR = 10    # 10:00 local
 DIGEST_MAX_ITEMS = 5
 
+# Database maintenance (runs at most once per MAINTENANCE_INTERVAL_SECONDS)
+MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+SEEN_RETENTION_DAYS = 180     # forget non-queued items first seen longer ago than this
+COUNTER_RETENTION_DAYS = 7    # per-day post counters are only read for "today"
+VACUUM_PAGES_PER_RUN = 2000   # free pages handed back to the OS per run (incremental)
+
 # Keyword scoring
 HIGH_WEIGHT: Dict[str, int] = {
     "numbers station": 6,
@@ -117,6 +173,11 @@ NEGATIVE: Dict[str, int] = {
 
 WORD_BOUNDARY_TERMS = {"ale"}
 
+# Optional JSON override for the tables above, re-read whenever it changes:
+# {"high": {...}, "medium": {...}, "negative": {...}, "word_boundary": [...]}
+# Missing keys keep the built-in table.
+WEIGHTS_FILE = os.getenv("RADIO_FEEDS_WEIGHTS", "radio_feed_weights.json")
+
 
 # ----------------------------
 # Helpers
@@ -169,30 +230,80 @@ def parse_entry_datetime(entry) -> datetime:
 
     return now_utc()
 
-def score_text(text: str) -> Tuple[int, List[str]]:
-    lower_text = (text or "").lower()
-    score = 0
-    hits: List[str] = []
-
-    def contains(term: str) -> bool:
-        if term in WORD_BOUNDARY_TERMS:
-            return re.search(rf"\b{re.escape(term)}\b", lower_text) is not None
-        return term in lower_text
-
-    for term, weight in HIGH_WEIGHT.items():
-        if contains(term):
-            score += weight
-            hits.append(term)
-    for term, weight in MED_WEIGHT.items():
-        if contains(term):
-            score += weight
-            hits.append(term)
-    for term, weight in NEGATIVE.items():
-        if contains(term):
+_WORD_BOUNDARY = re.compile(r"\b")
+
+
+class KeywordScorer:
+    """Weighted term tables flattened once into (term, weight, boundary_re) rows.
+
+    Terms are matched as substrings, except WORD_BOUNDARY_TERMS which must also
+    be whole words. Those are compiled as `term\b` (a literal prefix, so the
+    regex engine can skip ahead) and the leading `\b` is checked per candidate;
+    a plain `\bterm\b` search is tried at every position and was ~20x slower.
+    """
+
+    def __init__(self, tables: Iterable[Dict[str, int]], word_boundary_terms: Iterable[str]):
+        boundary = {term.lower() for term in word_boundary_terms}
+        rows = []
+        for table in tables:
+            for term, weight in table.items():
+                term = term.lower()
+                pattern = re.compile(rf"{re.escape(term)}\b") if term in boundary else None
+                rows.append((term, int(weight), pattern))
+        self.rows: Tuple[Tuple[str, int, Optional[re.Pattern]], ...] = tuple(rows)
+
+    def score(self, text: str) -> Tuple[int, List[str]]:
+        lower_text = (text or "").lower()
+        score = 0
+        hits: List[str] = []
+        for term, weight, pattern in self.rows:
+            if term not in lower_text:
+                continue
+            if pattern is not None and not any(
+                _WORD_BOUNDARY.match(lower_text, m.start()) for m in pattern.finditer(lower_text)
+            ):
+                continue
             score += weight
             hits.append(term)
+        return score, hits
+
+
+DEFAULT_SCORER = KeywordScorer((HIGH_WEIGHT, MED_WEIGHT, NEGATIVE), WORD_BOUNDARY_TERMS)
+_scorer = DEFAULT_SCORER
+_weights_mtime: Optional[float] = None
+
+
+def reload_weights_if_changed() -> None:
+    """Swap in WEIGHTS_FILE when it changes; fall back to the built-in tables if it goes away."""
+    global _scorer, _weights_mtime
+    try:
+        mtime = os.path.getmtime(WEIGHTS_FILE)
+    except OSError:
+        if _weights_mtime is not None:
+            print(f"[weights] {WEIGHTS_FILE} removed, using built-in weights.")
+            _scorer = DEFAULT_SCORER
+            _weights_mtime = None
+        return
+    if mtime == _weights_mtime:
+        return
+
+    _weights_mtime = mtime  # a broken file is only reported once, until it changes again
+    try:
+        with open(WEIGHTS_FILE, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+        scorer = KeywordScorer(
+            (cfg.get("high", HIGH_WEIGHT), cfg.get("medium", MED_WEIGHT), cfg.get("negative", NEGATIVE)),
+            cfg.get("word_boundary", WORD_BOUNDARY_TERMS),
+        )
+    except (OSError, ValueError, TypeError, AttributeError, re.error) as exc:
+        print(f"[weights] {WEIGHTS_FILE} not loaded, keeping current weights: {exc}")
+        return
+    _scorer = scorer
+    print(f"[weights] Loaded {len(scorer.rows)} terms from {WEIGHTS_FILE}")
+
 
-    return score, hits
+def score_text(text: str) -> Tuple[int, List[str]]:
+    return _scorer.score(text)
 
 def compact_hits(hits: List[str], max_terms: int = 6) -> str:
     if not hits:
@@ -229,31 +340,105 @@ CREATE TABLE IF NOT EXISTS state (
     key TEXT PRIMARY KEY,
     value TEXT NOT NULL
 );
+
+-- Per-destination delivery state; seen_items' own flags only say whether any
+-- destination queued/posted the item. score/published_utc are copied here so
+-- the digest query below is one index walk per destination.
+CREATE TABLE IF NOT EXISTS deliveries (
+    dest TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    published_utc TEXT NOT NULL,
+    queued_digest INTEGER NOT NULL DEFAULT 0,
+    posted_immediate INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dest, item_id)
+);
+
+-- Matches fetch_digest_items() exactly, so the digest needs no sort
+CREATE INDEX IF NOT EXISTS idx_deliveries_digest_queue ON deliveries(dest, score DESC, published_utc DESC)
+    WHERE queued_digest = 1 AND posted_immediate = 0;
+DROP INDEX IF EXISTS idx_seen_digest_queue;
 """
 
+# [<dest>:]global_posts_<day> / [<dest>:]src_posts_<source>_<day> counters written by record_post()
+DAY_COUNTER_KEY = re.compile(r"^(?:[^:]*:)?(?:global|src)_posts_(?:.*_)?(\d{4}-\d{2}-\d{2})$")
+
+# SQLite's default limit on bound parameters is 999 on older builds
+SEEN_QUERY_CHUNK = 500
+
 class Store:
+    """
+    The state table is small and only this process writes it, so it is read
+    once into memory and then kept as a write-through cache. Writes made inside
+    `with store.batch():` share one transaction (one fsync) instead of each
+    committing on its own.
+    """
+
     def __init__(self, path: str):
         self.conn = sqlite3.connect(path)
+        if self.conn.execute("PRAGMA auto_vacuum;").fetchone()[0] != 2:
+            # INCREMENTAL only applies to an existing file after one full VACUUM;
+            # new files just pick it up.
+            print("[db] Enabling incremental vacuum (one-time full VACUUM)...")
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+            self.conn.execute("VACUUM;")
         self.conn.execute("PRAGMA journal_mode=WAL;")
         self.conn.executescript(CREATE_SQL)
         self.conn.commit()
+        self._state: Dict[str, str] = dict(self.conn.execute("SELECT key, value FROM state"))
+        self._batch_depth = 0
+
+        if not self.get_state("deliveries_migrated"):
+            # Digest queue from before per-destination routing belongs to "main"
+            self.conn.execute(
+                "INSERT OR IGNORE INTO deliveries(dest, item_id, score, published_utc, queued_digest, posted_immediate) "
+                "SELECT 'main', item_id, score, published_utc, 1, 0 FROM seen_items "
+                "WHERE queued_digest = 1 AND posted_immediate = 0"
+            )
+            self.set_state("deliveries_migrated", "1")
+
+    @contextmanager
+    def batch(self) -> Iterator["Store"]:
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                # Commit even on error: anything already posted must stay recorded.
+                self.conn.commit()
+
+    def _commit(self) -> None:
+        if self._batch_depth == 0:
+            self.conn.commit()
 
     def get_state(self, key: str, default: str = "") -> str:
-        cur = self.conn.execute("SELECT value FROM state WHERE key = ?", (key,))
-        row = cur.fetchone()
-        return row[0] if row else default
+        return self._state.get(key, default)
 
     def set_state(self, key: str, value: str) -> None:
+        if self._state.get(key) == value:
+            return
+        self._state[key] = value
         self.conn.execute(
             "INSERT INTO state(key, value) VALUES(?, ?) "
             "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
             (key, value),
         )
-        self.conn.commit()
+        self._commit()
 
     def seen(self, item_id: str) -> bool:
-        cur = self.conn.execute("SELECT 1 FROM seen_items WHERE item_id = ?", (item_id,))
-        return cur.fetchone() is not None
+        return bool(self.seen_many([item_id]))
+
+    def seen_many(self, item_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of item_ids already stored, in chunked IN (...) queries."""
+        ids = list(dict.fromkeys(item_ids))
+        found: Set[str] = set()
+        for start in range(0, len(ids), SEEN_QUERY_CHUNK):
+            chunk = ids[start:start + SEEN_QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cur = self.conn.execute(f"SELECT item_id FROM seen_items WHERE item_id IN ({placeholders})", chunk)
+            found.update(row[0] for row in cur)
+        return found
 
     def insert_item(self, item_id: str, source: str, title: str, url: str, published_utc: datetime, score: int,
                     queued_digest: bool, posted_immediate: bool) -> None:
@@ -272,24 +457,66 @@ class Store:
                 now_utc().isoformat(),
             ),
         )
-        self.conn.commit()
+        self._commit()
+
+    def add_delivery(self, dest: str, item_id: str, score: int, published_utc: datetime,
+                     queued_digest: bool, posted_immediate: bool) -> None:
+        self.conn.execute(
+            "INSERT OR IGNORE INTO deliveries(dest, item_id, score, published_utc, queued_digest, posted_immediate) "
+            "VALUES(?, ?, ?, ?, ?, ?)",
+            (dest, item_id, score, published_utc.isoformat(), 1 if queued_digest else 0, 1 if posted_immediate else 0),
+        )
+        self._commit()
 
-    def queue_count(self) -> int:
-        cur = self.conn.execute("SELECT COUNT(1) FROM seen_items WHERE queued_digest = 1 AND posted_immediate = 0")
+    def queue_count(self, dest: str) -> int:
+        cur = self.conn.execute(
+            "SELECT COUNT(1) FROM deliveries WHERE dest = ? AND queued_digest = 1 AND posted_immediate = 0",
+            (dest,),
+        )
         return int(cur.fetchone()[0])
 
-    def fetch_digest_items(self, limit: int) -> List[Tuple[str, str, str, str, str, int]]:
+    def fetch_digest_items(self, dest: str, limit: int) -> List[Tuple[str, str, str, str, str, int]]:
         cur = self.conn.execute(
-            "SELECT item_id, source, title, url, published_utc, score "
-            "FROM seen_items WHERE queued_digest = 1 AND posted_immediate = 0 "
-            "ORDER BY score DESC, published_utc DESC LIMIT ?",
-            (limit,),
+            "SELECT d.item_id, s.source, s.title, s.url, d.published_utc, d.score "
+            "FROM deliveries d JOIN seen_items s ON s.item_id = d.item_id "
+            "WHERE d.dest = ? AND d.queued_digest = 1 AND d.posted_immediate = 0 "
+            "ORDER BY d.score DESC, d.published_utc DESC LIMIT ?",
+            (dest, limit),
         )
         return cur.fetchall()
 
-    def clear_digest_flags(self, item_ids: List[str]) -> None:
-        self.conn.executemany("UPDATE seen_items SET queued_digest = 0 WHERE item_id = ?", [(i,) for i in item_ids])
-        self.conn.commit()
+    def clear_digest_flags(self, dest: str, item_ids: List[str]) -> None:
+        self.conn.executemany(
+            "UPDATE deliveries SET queued_digest = 0 WHERE dest = ? AND item_id = ?",
+            [(dest, i) for i in item_ids],
+        )
+        self._commit()
+
+    def prune(self, seen_before: datetime, counters_before_day: str) -> Tuple[int, int]:
+        """Delete old items no destination is waiting to digest, and per-day counters older than the given day."""
+        cur = self.conn.execute(
+            "DELETE FROM seen_items WHERE created_utc < ? AND item_id NOT IN "
+            "(SELECT item_id FROM deliveries WHERE queued_digest = 1 AND posted_immediate = 0)",
+            (seen_before.isoformat(),),
+        )
+        items = cur.rowcount
+        self.conn.execute("DELETE FROM deliveries WHERE item_id NOT IN (SELECT item_id FROM seen_items)")
+
+        stale = [
+            key for key in self._state
+            if (m := DAY_COUNTER_KEY.match(key)) and m.group(1) < counters_before_day
+        ]
+        self.conn.executemany("DELETE FROM state WHERE key = ?", [(key,) for key in stale])
+        for key in stale:
+            del self._state[key]
+        self._commit()
+        return items, len(stale)
+
+    def compact(self, max_pages: int) -> int:
+        """Return up to max_pages free pages to the filesystem. Returns how many are still free."""
+        # executescript() steps the pragma to completion; execute() would free only one page.
+        self.conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)}); PRAGMA optimize;")
+        return int(self.conn.execute("PRAGMA freelist_count;").fetchone()[0])
 
 
 # ----------------------------
@@ -334,41 +561,41 @@ def build_embed(source: str, title: str, url: str, published_utc: datetime, scor
 # Rate limiting
 # ----------------------------
 
-def can_post_now(store: Store, source_name: str, score: int, per_source_limit: int) -> bool:
+def can_post_now(store: Store, dest: Destination, source_name: str, score: int, per_source_limit: int) -> bool:
     day = utc_day_key()
 
-    global_count = int(store.get_state(f"global_posts_{day}", "0") or "0")
-    if global_count >= GLOBAL_MAX_POSTS_PER_DAY:
+    global_count = int(store.get_state(dest.key(f"global_posts_{day}"), "0") or "0")
+    if global_count >= dest.max_posts_per_day:
         return False
 
-    src_count = int(store.get_state(f"src_posts_{source_name}_{day}", "0") or "0")
+    src_count = int(store.get_state(dest.key(f"src_posts_{source_name}_{day}"), "0") or "0")
     if src_count >= per_source_limit:
         return False
 
-    last_post_ts = float(store.get_state("last_post_unix", "0") or "0")
+    last_post_ts = float(store.get_state(dest.key("last_post_unix"), "0") or "0")
     now_ts = time.time()
-    if score < SUPER_HOT_BYPASS_SCORE and (now_ts - last_post_ts) < GLOBAL_MIN_SECONDS_BETWEEN_POSTS:
+    if score < SUPER_HOT_BYPASS_SCORE and (now_ts - last_post_ts) < dest.min_seconds_between_posts:
         return False
 
     return True
 
 
-def record_post(store: Store, source_name: str) -> None:
+def record_post(store: Store, dest: Destination, source_name: str) -> None:
     day = utc_day_key()
 
-    global_count = int(store.get_state(f"global_posts_{day}", "0") or "0")
-    src_count = int(store.get_state(f"src_posts_{source_name}_{day}", "0") or "0")
+    global_count = int(store.get_state(dest.key(f"global_posts_{day}"), "0") or "0")
+    src_count = int(store.get_state(dest.key(f"src_posts_{source_name}_{day}"), "0") or "0")
 
-    store.set_state(f"global_posts_{day}", str(global_count + 1))
-    store.set_state(f"src_posts_{source_name}_{day}", str(src_count + 1))
-    store.set_state("last_post_unix", str(time.time()))
+    store.set_state(dest.key(f"global_posts_{day}"), str(global_count + 1))
+    store.set_state(dest.key(f"src_posts_{source_name}_{day}"), str(src_count + 1))
+    store.set_state(dest.key("last_post_unix"), str(time.time()))
 
 
 # ----------------------------
 # Digest scheduler
 # ----------------------------
 
-def should_post_digest(store: Store) -> bool:
+def should_post_digest(store: Store, dest: Destination) -> bool:
     local_now = get_local_now()
     if local_now.weekday() != DIGEST_POST_WEEKDAY:
         return False
@@ -376,85 +603,154 @@ def should_post_digest(store: Store) -> bool:
         return False
 
     today_local = local_now.strftime("%Y-%m-%d")
-    last_digest = store.get_state("last_digest_date_local", "")
+    last_digest = store.get_state(dest.key("last_digest_date_local"), "")
     if last_digest == today_local:
         return False
 
     return True
 
 
-def mark_digest_done(store: Store) -> None:
+def mark_digest_done(store: Store, dest: Destination) -> None:
     local_now = get_local_now()
     today_local = local_now.strftime("%Y-%m-%d")
-    store.set_state("last_digest_date_local", today_local)
+    store.set_state(dest.key("last_digest_date_local"), today_local)
+
+
+# ----------------------------
+# Feed fetching
+# ----------------------------
+
+@dataclass
+class FetchResult:
+    feed: FeedSource
+    status: int  # HTTP status, 0 on network error
+    entries: list
+    etag: str = ""
+    modified: str = ""
+    error: str = ""
+
+
+def fetch_feed(feed: FeedSource, etag: str, modified: str) -> FetchResult:
+    """Conditional GET + parse; runs on a worker thread, so it must not touch the Store."""
+    headers = {"User-Agent": FETCH_USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+
+    try:
+        resp = requests.get(feed.url, headers=headers, timeout=(FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT))
+    except Exception as exc:
+        return FetchResult(feed, 0, [], error=str(exc))
+
+    if resp.status_code == 304:
+        return FetchResult(feed, 304, [])
+    if resp.status_code != 200:
+        return FetchResult(feed, resp.status_code, [], error=f"HTTP {resp.status_code}")
+
+    try:
+        parsed = feedparser.parse(
+            resp.content,
+            response_headers={"content-type": resp.headers.get("Content-Type", ""), "content-location": feed.url},
+        )
+    except Exception as exc:
+        return FetchResult(feed, 200, [], error=f"parse error: {exc}")
+
+    return FetchResult(
+        feed,
+        200,
+        parsed.entries[:20],
+        etag=resp.headers.get("ETag", ""),
+        modified=resp.headers.get("Last-Modified", ""),
+    )
 
 
 # ----------------------------
 # Main loop
 # ----------------------------
 
-def poll_once(store: Store, webhook_url: str) -> None:
-    for feed in FEEDS:
-        try:
-            parsed = feedparser.parse(feed.url)
-            entries = parsed.entries[:20]
-        except Exception as exc:
-            print(f"[feed] {feed.name} parse error: {exc}")
+def poll_once(store: Store, destinations: List[Destination]) -> None:
+    reload_weights_if_changed()
+    with store.batch(), ThreadPoolExecutor(max_workers=min(FETCH_MAX_WORKERS, len(FEEDS))) as pool:
+        futures = [
+            pool.submit(fetch_feed, feed, store.get_state(f"etag_{feed.name}"), store.get_state(f"modified_{feed.name}"))
+            for feed in FEEDS
+        ]
+        # Handle each feed as soon as it arrives; the Store is only used on this thread.
+        for future in as_completed(futures):
+            result = future.result()
+            feed = result.feed
+            if result.status == 304:
+                continue
+            if result.error:
+                print(f"[feed] {feed.name} fetch error: {result.error}")
+                continue
+
+            process_entries(store, destinations, feed, result.entries)
+            # Only remember the validators once the entries have been handled.
+            store.set_state(f"etag_{feed.name}", result.etag)
+            store.set_state(f"modified_{feed.name}", result.modified)
+
+
+def process_entries(store: Store, destinations: List[Destination], feed: FeedSource, entries: list) -> None:
+    candidates = []
+    for entry in entries:
+        title = (entry.get("title") or "").strip()
+        link = (entry.get("link") or "").strip()
+        if not title or not link:
             continue
+        url = normalize_url(link)
+        candidates.append((entry, title, url, stable_id(feed.name, title, url)))
 
-        for entry in entries:
-            title = (entry.get("title") or "").strip()
-            link = (entry.get("link") or "").strip()
-            if not title or not link:
-                continue
+    already_seen = store.seen_many(item_id for _entry, _title, _url, item_id in candidates)
 
-            url = normalize_url(link)
-            item_id = stable_id(feed.name, title, url)
-            if store.seen(item_id):
-                continue
+    for entry, title, url, item_id in candidates:
+        if item_id in already_seen:
+            continue
+        already_seen.add(item_id)  # same item twice in one feed
+
+        summary = entry.get("summary") or entry.get("description") or ""
+        combined = f"{title}\n{summary}"
+        score, hits = score_text(combined)
+        published_utc = parse_entry_datetime(entry)
 
-            summary = entry.get("summary") or entry.get("description") or ""
-            combined = f"{title}\n{summary}"
-            score, hits = score_text(combined)
-            published_utc = parse_entry_datetime(entry)
+        embed = None
+        queued_any = posted_any = False
 
+        for dest in destinations:
+            if not dest.accepts(feed.name, score):
+                continue
+            queued = posted = False
             # Decide immediate vs digest queue vs ignore
-            if score >= feed.min_score_immediate:
-                if can_post_now(store, feed.name, score, feed.max_posts_per_day):
+            if score >= feed.min_score_immediate and can_post_now(store, dest, feed.name, score, feed.max_posts_per_day):
+                if embed is None:
                     embed = build_embed(feed.name, title, url, published_utc, score, hits)
-                    ok = post_webhook(webhook_url, embeds=[embed])
-                    store.insert_item(
-                        item_id, feed.name, title, url, published_utc, score,
-                        queued_digest=False, posted_immediate=ok
-                    )
-                    if ok:
-                        record_post(store, feed.name)
-                else:
-                    # too soon / over cap -> queue if decent
-                    queued = score >= feed.min_score_digest
-                    store.insert_item(
-                        item_id, feed.name, title, url, published_utc, score,
-                        queued_digest=queued, posted_immediate=False
-                    )
-
+                posted = post_webhook(dest.webhook_url, embeds=[embed])
+                if posted:
+                    record_post(store, dest, feed.name)
             elif score >= feed.min_score_digest:
-                store.insert_item(
-                    item_id, feed.name, title, url, published_utc, score,
-                    queued_digest=True, posted_immediate=False
-                )
-            else:
-                store.insert_item(
-                    item_id, feed.name, title, url, published_utc, score,
-                    queued_digest=False, posted_immediate=False
-                )
-
-
-def post_digest_if_due(store: Store, webhook_url: str) -> None:
-    if not should_post_digest(store):
-        return
+                # below the immediate bar, or too soon / over cap -> queue if decent
+                queued = dest.digest
+            if queued or posted:
+                store.add_delivery(dest.name, item_id, score, published_utc, queued, posted)
+            queued_any = queued_any or queued
+            posted_any = posted_any or posted
+
+        store.insert_item(
+            item_id, feed.name, title, url, published_utc, score,
+            queued_digest=queued_any, posted_immediate=posted_any
+        )
+
+
+def post_digest_if_due(store: Store, destinations: List[Destination]) -> None:
+    for dest in destinations:
+        if dest.digest and should_post_digest(store, dest):
+            post_digest(store, dest)
+
 
-    rows = store.fetch_digest_items(DIGEST_MAX_ITEMS)
-    mark_digest_done(store)
+def post_digest(store: Store, dest: Destination) -> None:
+    rows = store.fetch_digest_items(dest.name, DIGEST_MAX_ITEMS)
+    mark_digest_done(store, dest)
 
     if not rows:
         return
@@ -469,15 +765,36 @@ def post_digest_if_due(store: Store, webhook_url: str) -> None:
         "timestamp": now_utc().isoformat(),
     }
 
-    ok = post_webhook(webhook_url, embeds=[embed])
+    ok = post_webhook(dest.webhook_url, embeds=[embed])
     if ok:
-        store.clear_digest_flags([r[0] for r in rows])
+        store.clear_digest_flags(dest.name, [r[0] for r in rows])
+
+
+def run_maintenance_if_due(store: Store) -> None:
+    now_ts = time.time()
+    last_ts = float(store.get_state("last_maintenance_unix", "0") or "0")
+    if now_ts - last_ts < MAINTENANCE_INTERVAL_SECONDS:
+        return
+
+    seen_before = now_utc() - timedelta(days=SEEN_RETENTION_DAYS)
+    counters_before = (now_utc() - timedelta(days=COUNTER_RETENTION_DAYS)).strftime("%Y-%m-%d")
+    with store.batch():
+        items, counters = store.prune(seen_before, counters_before)
+        store.set_state("last_maintenance_unix", str(now_ts))
+    free_pages = store.compact(VACUUM_PAGES_PER_RUN)
+    print(f"[db] Pruned {items} old item(s) and {counters} day counter(s); {free_pages} free page(s) left.")
 
 
 def main() -> None:
-    webhook_url = os.getenv("DISCORD_WEBHOOK_URL", "").strip()
-    if not webhook_url:
-        raise SystemExit("Set DISCORD_WEBHOOK_URL in your environment.")
+    destinations = []
+    for dest in DESTINATIONS:
+        dest.webhook_url = os.getenv(dest.webhook_env, "").strip()
+        if dest.webhook_url:
+            destinations.append(dest)
+        else:
+            print(f"[warn] {dest.webhook_env} not set; skipping destination '{dest.name}'.")
+    if not destinations:
+        raise SystemExit("Set DISCORD_WEBHOOK_URL (or another destination's webhook variable) in your environment.")
 
     db_path = os.getenv("RADIO_FEEDS_DB", "radio_feeds.sqlite3")
     store = Store(db_path)
@@ -487,12 +804,15 @@ def main() -> None:
 
     print("[ok] Starting feed watcher (webhook mode).")
     print(f"[ok] Digest TZ: {DIGEST_TZ}, weekday={DIGEST_POST_WEEKDAY}, hour={DIGEST_POST_HOUR}")
-    print(f"[ok] Polling every {POLL_SECONDS} seconds. Queue currently: {store.queue_count()}")
+    print(f"[ok] Polling every {POLL_SECONDS} seconds.")
+    for dest in destinations:
+        print(f"[ok] Destination '{dest.name}': queue currently {store.queue_count(dest.name)}")
 
     while True:
         try:
-            poll_once(store, webhook_url)
-            post_digest_if_due(store, webhook_url)
+            poll_once(store, destinations)
+            post_digest_if_due(store, destinations)
+            run_maintenance_if_due(store)
         except Exception as exc:
             print(f"[loop] error: {exc}")
 
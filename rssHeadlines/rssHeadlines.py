@@ -2,10 +2,19 @@ import feedparser
 import requests
 import schedule
 import time
+import os
+import sys
+import sqlite3
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pytz
 import html
 
+# Shared message packer (../DiscordLayout/discordlayout.py, or a copy next to this script)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DiscordLayout"))
+from discordlayout import content_messages, send_sequence
+
 DISCORD_WEBHOOK_URL = "insertwebhook"
 
 rss_feeds = {
@@ -19,76 +28,146 @@ rss_feeds = {
 vegas_deal_feed = "https://www.reddit.com/r/Gamebundles/.rss"
 vegas_keywords = ["sony vegas", "vegas pro", "magix vegas"]
 
-def collect_headlines(max_per_source=3):
+# Feeds are fetched in parallel; each request gets its own timeout
+FETCH_TIMEOUT_SEC = 20
+FETCH_USER_AGENT = "rssHeadlines/1.0 (+daily hardware headlines)"
+
+# Links already posted, so the daily post only has new headlines.
+# Stored as 64-bit hashes; entries older than SEEN_RETENTION_DAYS are dropped.
+SEEN_DB_PATH = "rss_seen.sqlite3"
+SEEN_RETENTION_DAYS = 30
+
+# url -> {"etag", "modified", "entries"}: a 304 reuses the entries from the last fetch
+feed_cache = {}
+
+def fetch_feed(url):
+    """Conditional GET; returns the feed's entries (cached ones if the server says 304)."""
+    cached = feed_cache.get(url)
+    headers = {"User-Agent": FETCH_USER_AGENT}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["modified"]:
+            headers["If-Modified-Since"] = cached["modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=FETCH_TIMEOUT_SEC)
+    except Exception as e:
+        print(f"[{datetime.now()}] Fetch failed for {url}: {e}")
+        return cached["entries"] if cached else []
+
+    if response.status_code == 304 and cached:
+        return cached["entries"]
+    if response.status_code != 200:
+        print(f"[{datetime.now()}] Fetch failed for {url}: HTTP {response.status_code}")
+        return cached["entries"] if cached else []
+
+    entries = feedparser.parse(response.content).entries
+    feed_cache[url] = {
+        "etag": response.headers.get("ETag", ""),
+        "modified": response.headers.get("Last-Modified", ""),
+        "entries": entries,
+    }
+    return entries
+
+def fetch_all_feeds():
+    """Fetch every headline feed and the Vegas deal feed once, concurrently."""
+    urls = list(rss_feeds.values()) + [vegas_deal_feed]
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        return dict(zip(urls, pool.map(fetch_feed, urls)))
+
+def open_seen_db(path=SEEN_DB_PATH):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS seen (link_hash INTEGER PRIMARY KEY, first_seen REAL NOT NULL)")
+    conn.execute("DELETE FROM seen WHERE first_seen < ?", (time.time() - SEEN_RETENTION_DAYS * 86400,))
+    conn.commit()
+    return conn
+
+def link_hash(link):
+    return int.from_bytes(hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+def seen_links(conn, links):
+    """Return the subset of links that have already been posted."""
+    hashes = {link_hash(link): link for link in links}
+    found = set()
+    keys = list(hashes)
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        rows = conn.execute(f"SELECT link_hash FROM seen WHERE link_hash IN ({','.join('?' * len(chunk))})", chunk)
+        found.update(hashes[row[0]] for row in rows)
+    return found
+
+def mark_seen(conn, links):
+    now = time.time()
+    conn.executemany("INSERT OR IGNORE INTO seen(link_hash, first_seen) VALUES(?, ?)", [(link_hash(link), now) for link in links])
+    conn.commit()
+
+def escape_title(title):
+    return html.unescape(title).replace("]", "\\]").replace("[", "\\[").replace(")", "\\)").replace("(", "\\(")
+
+def collect_headlines(feeds, skip_links=(), max_per_source=3):
+    """Return [(link, line)] with up to max_per_source headlines per source not in skip_links."""
     headlines = []
     for source, url in rss_feeds.items():
-        feed = feedparser.parse(url)
-        for entry in feed.entries[:max_per_source]:
-            title = html.unescape(entry.title).replace("]", "\\]").replace("[", "\\[").replace(")", "\\)").replace("(", "\\(")
-            link = entry.link
-            formatted_link = f"[{title}](<{link}>)"
-            headlines.append(f"**{source}**: {formatted_link}")
+        fresh = [entry for entry in feeds.get(url, []) if entry.link not in skip_links]
+        for entry in fresh[:max_per_source]:
+            headlines.append((entry.link, f"**{source}**: [{escape_title(entry.title)}](<{entry.link}>)"))
     return headlines
 
-def collect_vegas_deals():
-    feed = feedparser.parse(vegas_deal_feed)
+def collect_vegas_deals(feeds, skip_links=()):
     matches = []
-    for entry in feed.entries:
+    for entry in feeds.get(vegas_deal_feed, []):
+        if entry.link in skip_links:
+            continue
         content = f"{entry.title} {entry.get('summary', '')}".lower()
         if any(keyword in content for keyword in vegas_keywords):
-            title = html.unescape(entry.title).replace("]", "\\]").replace("[", "\\[").replace(")", "\\)").replace("(", "\\(")
-            link = entry.link
-            formatted_link = f"[{title}](<{link}>)"
-            matches.append(f"**Vegas Deal**: {formatted_link}")
+            matches.append((entry.link, f"**Vegas Deal**: [{escape_title(entry.title)}](<{entry.link}>)"))
     return matches
 
-def send_to_discord(headlines, label_as_daily=True):
+def send_to_discord(headlines, vegas_deals, label_as_daily=True):
+    """Post headlines and Vegas deals, split over as many messages as needed; returns the links that went out."""
     pst = pytz.timezone("US/Pacific")
     now_pst = datetime.now(pst).strftime("%Y-%m-%d %I:%M %p %Z")
 
-    vegas_deals = collect_vegas_deals()
     label = "**📰 Daily Hardware Headlines (CPUs/GPUs)** — *" + now_pst + "*\n\n" if label_as_daily else "**📰 Hardware Headlines Preview**\n\n"
 
-    max_length = 1900
-    full_message = label
-    total_length = len(full_message)
-    safe_headlines = []
-
-    for line in headlines:
-        projected = total_length + len(line) + 1
-        if projected >= max_length:
-            break
-        safe_headlines.append(line)
-        total_length = projected
-
-    full_message += "\n".join(safe_headlines)
-
-    payload = {"content": full_message}
-    print(f"[{datetime.now()}] Payload length: {len(full_message)} characters")
-    response = requests.post(DISCORD_WEBHOOK_URL, json=payload)
-    print(f"[{datetime.now()}] Sent {len(safe_headlines)} headlines (+ {len(vegas_deals)} vegas): {response.status_code}")
-    if response.status_code != 204:
-        print("Discord response:", response.text)
-
-    # If Vegas deals exist and didn't fit, send them separately
+    lines = label.splitlines() + [line for _, line in headlines]
     if vegas_deals:
-        vegas_block = "**🎬 Sony Vegas Deals Found:**\n" + "\n".join(vegas_deals)
-        if total_length + len(vegas_block) >= 2000:
-            vegas_payload = {"content": vegas_block}
-            vegas_response = requests.post(DISCORD_WEBHOOK_URL, json=vegas_payload)
-            print(f"[{datetime.now()}] Sent Vegas deals as separate message: {vegas_response.status_code}")
-            if vegas_response.status_code != 204:
-                print("Discord response:", vegas_response.text)
+        lines += ["", "**🎬 Sony Vegas Deals Found:**"] + [line for _, line in vegas_deals]
+
+    messages = content_messages(lines)
+    sent, failed = send_sequence(DISCORD_WEBHOOK_URL, [{"content": message} for message in messages])
+    print(f"[{datetime.now()}] Sent {sent}/{len(messages)} message(s): {len(headlines)} headlines (+ {len(vegas_deals)} vegas)")
+    if failed is not None:
+        print(f"Discord response: {failed.status_code} {failed.text}")
+
+    sent_text = "\n".join(messages[:sent])
+    return [link for link, line in headlines + vegas_deals if line in sent_text]
+
+def post_new_headlines(seen_db, label_as_daily=True):
+    """One fetch of every feed, then a post with only the headlines not posted before."""
+    feeds = fetch_all_feeds()
+    all_links = [entry.link for entries in feeds.values() for entry in entries]
+    already_posted = seen_links(seen_db, all_links)
+    headlines = collect_headlines(feeds, already_posted)
+    vegas_deals = collect_vegas_deals(feeds, already_posted)
+    if not headlines and not vegas_deals:
+        print(f"[{datetime.now()}] No new headlines since the last post")
+        return
+    sent_links = send_to_discord(headlines, vegas_deals, label_as_daily=label_as_daily)
+    # The preview doesn't count as posting, so the daily post still gets them
+    if label_as_daily:
+        mark_seen(seen_db, sent_links)
+
+seen_db = open_seen_db()
 
 def daily_task():
-    headlines = collect_headlines()
-    send_to_discord(headlines, label_as_daily=True)
+    post_new_headlines(seen_db, label_as_daily=True)
 
 schedule.every().day.at("12:00").do(daily_task)
 
 print("Performing test headline post...")
-test_headlines = collect_headlines()
-send_to_discord(test_headlines, label_as_daily=False)
+post_new_headlines(seen_db, label_as_daily=False)
 
 print("RSS to Discord bot running. Waiting for scheduled job...")
 